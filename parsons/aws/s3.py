@@ -1,13 +1,20 @@
 import re
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
 from parsons.utilities import files
 import logging
 import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# The most objects transferred at once by ``get_files`` and ``put_files``
+MAX_CONCURRENT_TRANSFERS = 8
+
 
 class AWSConnection(object):
     def __init__(
@@ -60,6 +67,15 @@ class S3(object):
             Controls use of the ``AWS_SESSION_TOKEN`` environment variable. Defaults
             to ``True``. Set to ``False`` in order to ignore the ``AWS_SESSION_TOKEN`` environment
             variable even if the ``aws_session_token`` argument was not passed in.
+        multipart_threshold: int
+            Files of at least this many bytes are uploaded and downloaded in parts, on
+            several threads. Defaults to boto3's default of 8 MB.
+        multipart_chunksize: int
+            The size in bytes of each part of a multipart transfer. Defaults to boto3's
+            default of 8 MB.
+        max_concurrency: int
+            The most threads used to transfer the parts of a single file. Defaults to
+            boto3's default of 10.
 
     `Returns:`
         S3 class.
@@ -71,6 +87,9 @@ class S3(object):
         aws_secret_access_key=None,
         aws_session_token=None,
         use_env_token=True,
+        multipart_threshold=None,
+        multipart_chunksize=None,
+        max_concurrency=None,
     ):
         self.aws = AWSConnection(
             aws_access_key_id=aws_access_key_id,
@@ -85,6 +104,16 @@ class S3(object):
         self.client = self.s3.meta.client
         """Boto3 API Session client object. Use for more advanced boto3 features."""
 
+        transfer_args = {
+            "multipart_threshold": multipart_threshold,
+            "multipart_chunksize": multipart_chunksize,
+            "max_concurrency": max_concurrency,
+        }
+        self.transfer_config = TransferConfig(
+            **{arg: value for arg, value in transfer_args.items() if value is not None}
+        )
+        """Boto3 TransferConfig used for uploads and downloads."""
+
     def list_buckets(self):
         """
         List all buckets to which you have access.
@@ -288,7 +317,53 @@ class S3(object):
                 info.
         """
 
-        self.client.upload_file(local_path, bucket, key, ExtraArgs={"ACL": acl, **kwargs})
+        self.client.upload_file(
+            local_path,
+            bucket,
+            key,
+            ExtraArgs={"ACL": acl, **kwargs},
+            Config=self.transfer_config,
+        )
+
+    def put_files(
+        self,
+        bucket,
+        paths,
+        acl="bucket-owner-full-control",
+        max_workers=MAX_CONCURRENT_TRANSFERS,
+        **kwargs,
+    ):
+        """
+        Uploads several objects to an S3 bucket at once. The completion and throughput of
+        each upload, and of the whole batch, are logged.
+
+        `Args:`
+            bucket: str
+                The bucket name
+            paths: dict
+                A mapping of each object key to the local path of the file to upload
+            acl: str
+                The S3 permissions on the files
+            max_workers: int
+                The most files uploaded at once. Large files are also uploaded in parts on
+                up to ``max_concurrency`` threads each.
+            kwargs:
+                Additional arguments for the S3 API call. See `AWS Put Object documentation
+                <https://docs.aws.amazon.com/AmazonS3/latest/API/RESTObjectPUT.html>`_ for more
+                info.
+        """
+
+        progress = _TransferProgress("Uploaded", len(paths))
+
+        def upload(key):
+            start = time.monotonic()
+            self.put_file(bucket, key, paths[key], acl=acl, **kwargs)
+            progress.transferred(
+                f"s3://{bucket}/{key}", os.path.getsize(paths[key]), time.monotonic() - start
+            )
+
+        self._run_transfers(upload, list(paths), max_workers)
+        progress.finish()
 
     def remove_file(self, bucket, key):
         """
@@ -331,10 +406,61 @@ class S3(object):
         if not local_path:
             local_path = files.create_temp_file_for_path(key)
 
-        self.s3.Object(bucket, key).download_file(local_path, ExtraArgs=kwargs)
+        # Use the client rather than the resource, since get_files calls this from several
+        # threads and only clients are thread-safe
+        self.client.download_file(
+            bucket, key, local_path, ExtraArgs=kwargs, Config=self.transfer_config
+        )
 
         return local_path
 
+    def get_files(self, bucket, keys, max_workers=MAX_CONCURRENT_TRANSFERS, **kwargs):
+        """
+        Download several objects from S3 to temporary files at once. The completion and
+        throughput of each download, and of the whole batch, are logged.
+
+        `Args:`
+            bucket: str
+                The bucket name
+            keys: list
+                The object keys
+            max_workers: int
+                The most objects downloaded at once. Large objects are also downloaded in
+                parts on up to ``max_concurrency`` threads each.
+            kwargs:
+                Additional arguments for the S3 API call. See `AWS download_file documentation
+                <https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.download_file>`_
+                for more info.
+
+        `Returns:`
+            list
+                The paths of the new files, in the same order as ``keys``
+        """
+
+        progress = _TransferProgress("Downloaded", len(keys))
+
+        def download(key):
+            start = time.monotonic()
+            local_path = self.get_file(bucket, key, **kwargs)
+            progress.transferred(
+                f"s3://{bucket}/{key}", os.path.getsize(local_path), time.monotonic() - start
+            )
+            return local_path
+
+        local_paths = self._run_transfers(download, keys, max_workers)
+        progress.finish()
+
+        return local_paths
+
+    def _run_transfers(self, transfer, keys, max_workers):
+        # Run a transfer for each key on a shared pool of threads, returning the results in
+        # order. If any transfer fails, the first error is raised once the rest finish.
+        if not keys:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return list(executor.map(transfer, keys))
+
     def get_url(self, bucket, key, expires_in=3600):
         """
         Generates a presigned url for an s3 object.
@@ -463,3 +589,38 @@ class S3(object):
         buckets = [x for x in all_buckets if bucket_subname in x.split("-")]
 
         return buckets
+
+
+class _TransferProgress:
+    # Logs the completion and throughput of each transfer in a batch, and of the whole
+    # batch. Transfers may complete on several threads.
+
+    def __init__(self, action, num_objects):
+        self.action = action
+        self.num_objects = num_objects
+        self.completed = 0
+        self.total_bytes = 0
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def transferred(self, uri, num_bytes, seconds):
+        with self._lock:
+            self.completed += 1
+            self.total_bytes += num_bytes
+            completed = self.completed
+
+        logger.info(
+            f"{self.action} {uri} ({completed} of {self.num_objects}): "
+            f"{_throughput(num_bytes, seconds)}"
+        )
+
+    def finish(self):
+        seconds = time.monotonic() - self.start
+        logger.info(
+            f"{self.action} {self.completed} objects: {_throughput(self.total_bytes, seconds)}"
+        )
+
+
+def _throughput(num_bytes, seconds):
+    megabytes = num_bytes / 1024 / 1024
+    return f"{megabytes:.1f} MB in {seconds:.1f}s ({megabytes / max(seconds, 0.001):.1f} MB/s)"
@@ -0,0 +1,202 @@
+"""
+Checkpoint stores record how far a ``DBSync`` has got, so that a sync that fails part way
+through can pick up where it left off instead of starting again from the beginning.
+
+A checkpoint is a small dict (e.g. the last primary key written to the destination) saved
+under a key identifying the source and destination tables.
+"""
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value):
+    # JSON can't represent these natively; tag them so they round trip with their type
+    if isinstance(value, datetime.datetime):
+        return {"__type__": "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__type__": "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"__type__": "decimal", "value": str(value)}
+    raise TypeError(f"Can't store a value of type {type(value).__name__} in a checkpoint")
+
+
+def _decode(obj):
+    kind = obj.get("__type__")
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(obj["value"])
+    if kind == "date":
+        return datetime.date.fromisoformat(obj["value"])
+    if kind == "decimal":
+        return Decimal(obj["value"])
+    return obj
+
+
+def _dumps(state):
+    return json.dumps(state, default=_encode, sort_keys=True)
+
+
+def _loads(text):
+    return json.loads(text, object_hook=_decode)
+
+
+class CheckpointStore:
+    """
+    Base class for checkpoint stores. Subclasses implement ``get``, ``save`` and ``clear``,
+    which must be safe to call from several threads.
+    """
+
+    def get(self, key):
+        """
+        Get a checkpoint.
+
+        `Args:`
+            key: str
+                The checkpoint key
+        `Returns:`
+            dict or ``None`` if there is no checkpoint for the key
+        """
+
+        raise NotImplementedError
+
+    def save(self, key, state):
+        """
+        Save a checkpoint, replacing any existing checkpoint for the key.
+
+        `Args:`
+            key: str
+                The checkpoint key
+            state: dict
+                The checkpoint
+        """
+
+        raise NotImplementedError
+
+    def clear(self, key):
+        """
+        Remove a checkpoint. Does nothing if there is no checkpoint for the key.
+
+        `Args:`
+            key: str
+                The checkpoint key
+        """
+
+        raise NotImplementedError
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Store checkpoints in a local JSON file. The file is rewritten atomically on every save.
+
+    `Args:`
+        path: str
+            The path to the JSON file. It is created if it doesn't exist.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, "r") as f:
+            return _loads(f.read() or "{}")
+
+    def _write(self, checkpoints):
+        temp_path = f"{self.path}.tmp"
+
+        with open(temp_path, "w") as f:
+            f.write(_dumps(checkpoints))
+
+        os.replace(temp_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key, state):
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[key] = state
+            self._write(checkpoints)
+
+    def clear(self, key):
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(key, None) is not None:
+                self._write(checkpoints)
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Store checkpoints in a local SQLite database.
+
+    `Args:`
+        path: str
+            The path to the SQLite database. It is created if it doesn't exist.
+        table_name: str
+            The table to store checkpoints in. It is created if it doesn't exist.
+    """
+
+    def __init__(self, path, table_name="parsons_checkpoints"):
+        self.path = path
+        self.table_name = table_name
+        self._lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    key TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connection(self):
+        # SQLite connections can't be shared across threads, so open one per call
+        conn = sqlite3.connect(self.path)
+
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                f"SELECT state FROM {self.table_name} WHERE key = ?", (key,)
+            ).fetchone()
+
+        return _loads(row[0]) if row else None
+
+    def save(self, key, state):
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {self.table_name} (key, state, updated_at)
+                VALUES (?, ?, ?)
+                """,
+                (key, _dumps(state), datetime.datetime.now(datetime.timezone.utc).isoformat()),
+            )
+
+    def clear(self, key):
+        with self._lock, self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table_name} WHERE key = ?", (key,))
@@ -0,0 +1,290 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def ping_connection(connection):
+    """
+    A ``health_check`` for DB-API connections that runs ``SELECT 1``, so that connections
+    the server has dropped are discarded rather than handed out.
+    """
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+    # Don't leave the ping's transaction open
+    connection.rollback()
+    return True
+
+
+def reset_session(connection):
+    """
+    A ``reset`` for DB-API connections that rolls back any open transaction and turns
+    autocommit back off, in case the last borrower switched it on.
+    """
+
+    connection.rollback()
+    if connection.autocommit:
+        connection.autocommit = False
+
+
+class _PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of database connections, used by the database connectors when they
+    are created with a ``pool_size``.
+
+    Idle connections are reused instead of opening a new connection for every query.
+    Before a connection is handed out it is checked with ``health_check``, and connections
+    that have been idle for longer than ``max_idle_time`` or open for longer than
+    ``max_lifetime`` are closed and replaced.
+
+    `Args:`
+        connect: callable
+            A function that returns a new connection
+        max_size: int
+            The maximum number of connections open at once, including those in use
+        max_idle_time: int
+            Seconds a connection may sit unused in the pool before it is closed. ``None``
+            keeps idle connections open indefinitely.
+        max_lifetime: int
+            Seconds after which a connection is closed rather than reused. ``None`` never
+            retires connections for age.
+        health_check: callable
+            A function that takes a connection and returns ``False`` if it should not be
+            reused. Exceptions are treated as a failed check.
+        reset: callable
+            A function that takes a connection being returned to the pool and resets it,
+            e.g. by rolling back any open transaction. If it raises, the connection is closed.
+        timeout: int
+            Seconds to wait for a connection when the pool is exhausted before raising a
+            ``TimeoutError``. ``None`` waits indefinitely.
+    """
+
+    def __init__(
+        self,
+        connect,
+        max_size=5,
+        max_idle_time=300,
+        max_lifetime=3600,
+        health_check=None,
+        reset=None,
+        timeout=None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self._health_check = health_check
+        self._reset = reset
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self):
+        """
+        `Returns:`
+            int
+                The number of open connections, idle or in use
+        """
+
+        with self._condition:
+            return self._size
+
+    @property
+    def idle_count(self):
+        """
+        `Returns:`
+            int
+                The number of open connections waiting in the pool
+        """
+
+        with self._condition:
+            return len(self._idle)
+
+    def _is_expired(self, pooled, now):
+        if self.max_lifetime is not None and now - pooled.created_at > self.max_lifetime:
+            return True
+
+        if self.max_idle_time is not None and now - pooled.last_used > self.max_idle_time:
+            return True
+
+        return False
+
+    def _is_healthy(self, connection):
+        if self._health_check is None:
+            return True
+
+        try:
+            return bool(self._health_check(connection))
+        except Exception:
+            logger.debug("Pooled connection failed its health check.", exc_info=True)
+            return False
+
+    def _discard(self, connection):
+        # Called without the lock held; closing may involve network I/O.
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Error closing pooled connection.", exc_info=True)
+
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def acquire(self):
+        """
+        Take a connection from the pool, opening a new one if none are idle and the pool
+        is not full. Blocks until a connection is available if it is.
+
+        `Returns:`
+            A database connection, which must be passed back to ``release``
+        """
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        while True:
+            pooled = None
+            expired = []
+
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+
+                while True:
+                    now = time.monotonic()
+
+                    while self._idle:
+                        candidate = self._idle.pop()
+                        if self._is_expired(candidate, now):
+                            expired.append(candidate)
+                        else:
+                            pooled = candidate
+                            break
+
+                    if pooled or expired or self._size < self.max_size:
+                        break
+
+                    remaining = None if deadline is None else deadline - now
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(
+                            f"Timed out waiting for a connection from a pool of {self.max_size}"
+                        )
+
+                    self._condition.wait(remaining)
+
+                if pooled is None and not expired:
+                    # Reserve a slot for the new connection before releasing the lock
+                    self._size += 1
+
+            for stale in expired:
+                logger.debug("Closing expired pooled connection.")
+                self._discard(stale.connection)
+
+            if pooled is None:
+                if expired:
+                    # Slots were freed; go back and take one
+                    continue
+
+                try:
+                    pooled = _PooledConnection(self._connect())
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+                logger.debug("Opened new pooled connection.")
+
+            elif not self._is_healthy(pooled.connection):
+                self._discard(pooled.connection)
+                continue
+
+            with self._condition:
+                self._in_use[id(pooled.connection)] = pooled
+
+            return pooled.connection
+
+    def release(self, connection, discard=False):
+        """
+        Return a connection to the pool.
+
+        `Args:`
+            connection: obj
+                A connection obtained from ``acquire``
+            discard: bool
+                Close the connection instead of reusing it, e.g. if it is known to be broken
+        """
+
+        with self._condition:
+            pooled = self._in_use.pop(id(connection))
+            closed = self._closed
+
+        if not discard and not closed and self._reset is not None:
+            try:
+                self._reset(connection)
+            except Exception:
+                logger.debug("Error resetting pooled connection.", exc_info=True)
+                discard = True
+
+        if discard or closed:
+            self._discard(connection)
+            return
+
+        pooled.last_used = time.monotonic()
+
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        `Returns:`
+            A database connection
+        """
+
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """
+        Close all idle connections. Connections that are in use are closed when they are
+        released.
+        """
+
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for pooled in idle:
+            self._discard(pooled.connection)
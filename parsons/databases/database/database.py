@@ -1,8 +1,54 @@
 import parsons.databases.database.constants as consts
+from parsons.etl.profile import value_width
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import itertools
 import logging
+import os
+import random
 
 logger = logging.getLogger(__name__)
 
+# The number of rows each worker process infers types for at a time
+TYPE_INFERENCE_SHARD_SIZE = 100000
+
+# The type constants used by type inference, which are copied into worker processes
+TYPE_INFERENCE_ATTRIBUTES = [
+    "INT_TYPES",
+    "SMALLINT",
+    "SMALLINT_MIN",
+    "SMALLINT_MAX",
+    "MEDIUMINT",
+    "MEDIUMINT_MIN",
+    "MEDIUMINT_MAX",
+    "INT",
+    "INT_MIN",
+    "INT_MAX",
+    "BIGINT",
+    "FLOAT",
+    "BOOL",
+    "VARCHAR",
+]
+
+
+def _infer_shard(inferrer, rows, num_columns, skip_values):
+    # Runs in a worker process. Returns the data type and width of each column in the rows,
+    # and whether the column has a bool in it, which is needed to merge the type with
+    # those of earlier shards.
+
+    columns = [[] for _ in range(num_columns)]
+    for row in rows:
+        for i, value in zip(range(num_columns), row):
+            columns[i].append(value)
+
+    return [
+        (
+            inferrer.detect_column_type(column, skip_values=skip_values),
+            max(map(value_width, column), default=0),
+            any(isinstance(value, bool) for value in column),
+        )
+        for column in columns
+    ]
+
 
 class DatabaseCreateStatement:
     def __init__(self):
@@ -170,6 +216,212 @@ class DatabaseCreateStatement:
 
         return result
 
+    def merge_data_types(self, type1, type2, has_bool=False):
+        """Combine the types detected for two consecutive parts of a column.
+
+        Gives the same result as passing all of the values, in order, through
+        ``detect_data_type``. That is usually the wider of the two types, but a bool resets
+        the detected type, so if the later values include one, the earlier values only
+        matter if they made the column a varchar.
+
+        `Args`:
+            type1: str
+                The type detected for the earlier values, or ``None``.
+            type2: str
+                The type detected for the later values, or ``None``.
+            has_bool: bool
+                Whether the later values include a bool.
+        `Returns`:
+            str
+                The type of the whole column.
+        """
+        if type1 == self.VARCHAR:
+            return type1
+
+        if has_bool:
+            return type2
+
+        weights = {
+            self.BOOL: 1,
+            self.SMALLINT: 2,
+            self.MEDIUMINT: 3,
+            self.INT: 4,
+            self.BIGINT: 5,
+            self.FLOAT: 6,
+            self.VARCHAR: 7,
+        }
+
+        return type1 if weights.get(type1, 0) >= weights.get(type2, 0) else type2
+
+    def detect_column_type(self, values, skip_values=(), current_type=None):
+        """Detect the type of a whole column of values.
+
+        Gives the same result as passing each value through ``detect_data_type``, but
+        columns holding a single Python type are checked with a few whole-column
+        operations (e.g. the ``min`` and ``max`` of an int column) instead of value by value.
+
+        `Args`:
+            values: list
+                The values in the column.
+            skip_values: list
+                Values to ignore, e.g. ``["NA", ""]``.
+            current_type: str
+                The type detected for earlier values of the column, if the column is being
+                checked a block of values at a time.
+        `Returns`:
+            str
+                The string representation of the type, or ``None`` if there are no
+                values to detect a type from.
+        """
+        if current_type == self.VARCHAR:
+            return current_type
+
+        values = [v for v in values if v is not None and not (skip_values and v in skip_values)]
+        types = set(map(type, values))
+
+        return self.merge_data_types(
+            current_type, self._detect_values_type(values, types), has_bool=bool in types
+        )
+
+    def _detect_values_type(self, values, types):
+        if not types:
+            return None
+
+        if types == {bool}:
+            return self.BOOL
+
+        if types == {int}:
+            return self.get_bigger_int(
+                self.detect_data_type(min(values)), self.detect_data_type(max(values))
+            )
+
+        if types == {float} or types == {int, float}:
+            return self.FLOAT
+
+        if types == {str}:
+            # Numeric strings don't change the detected type, so the column is either
+            # varchar or undetermined
+            if any(not self.is_valid_sql_num(v) for v in values):
+                return self.VARCHAR
+            return None
+
+        # Mixed columns depend on the order of their values
+        result = None
+        for value in values:
+            result = self.detect_data_type(value, result)
+
+        return result
+
+    def _type_inferrer(self):
+        # A bare create statement with the same type constants, which unlike a database
+        # connector can be sent to worker processes
+        inferrer = DatabaseCreateStatement()
+        for attr in TYPE_INFERENCE_ATTRIBUTES:
+            setattr(inferrer, attr, getattr(self, attr))
+
+        return inferrer
+
+    def infer_types_parallel(self, tbl, processes=None, skip_values=()):
+        """Detect the type and width of every column, sharding the rows across a pool of
+        worker processes.
+
+        Sending rows to other processes costs more than it saves unless there are several
+        CPUs to spread them across, so with one CPU, or with no more than one shard of rows,
+        the shards are checked in this process instead.
+
+        `Args`:
+            tbl: obj
+                A Parsons Table.
+            processes: int
+                The number of worker processes. Defaults to the number of CPUs.
+            skip_values: list
+                Values to ignore when detecting types, e.g. ``["NA", ""]``.
+        `Returns`:
+            tuple
+                A list of types (``None`` where undetermined) and a list of widths, one
+                of each per column.
+        """
+        inferrer = self._type_inferrer()
+        num_columns = len(tbl.columns)
+        types = [None] * num_columns
+        widths = [0] * num_columns
+
+        def merge(results):
+            for i, (col_type, width, has_bool) in enumerate(results):
+                types[i] = self.merge_data_types(types[i], col_type, has_bool=has_bool)
+                widths[i] = max(widths[i], width)
+
+        rows = iter(tbl.table)
+        next(rows, None)
+        shards = iter(lambda: list(itertools.islice(rows, TYPE_INFERENCE_SHARD_SIZE)), [])
+
+        processes = processes or os.cpu_count() or 1
+        first_shards = list(itertools.islice(shards, 2))
+
+        if processes == 1 or len(first_shards) < 2:
+            for shard in itertools.chain(first_shards, shards):
+                merge(_infer_shard(inferrer, shard, num_columns, skip_values))
+
+            return types, widths
+
+        futures = []
+        pending = set()
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for shard in itertools.chain(first_shards, shards):
+                # Don't read further ahead of the workers than they can use
+                if len(pending) >= processes * 2:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                shard = [tuple(row) for row in shard]
+                future = executor.submit(_infer_shard, inferrer, shard, num_columns, skip_values)
+                futures.append(future)
+                pending.add(future)
+
+        # Shards are merged in order, since a bool resets the detected type
+        for future in futures:
+            merge(future.result())
+
+        return types, widths
+
+    def infer_types_sample(self, tbl, sample_size, skip_values=(), seed=None):
+        """Detect the type and width of every column from a random sample of rows.
+
+        Values outside the sample may not fit the detected types, so callers should widen
+        them or be ready to retry with exact inference.
+
+        `Args`:
+            tbl: obj
+                A Parsons Table.
+            sample_size: int
+                The number of rows to sample.
+            skip_values: list
+                Values to ignore when detecting types, e.g. ``["NA", ""]``.
+            seed: int
+                Optional seed for the random sample.
+        `Returns`:
+            tuple
+                A list of types (``None`` where undetermined) and a list of widths, one
+                of each per column.
+        """
+        rng = random.Random(seed)
+        rows = iter(tbl.table)
+        next(rows, None)
+
+        # Reservoir sample, so that the table is read once without holding it in memory
+        sample = []
+        for i, row in enumerate(rows):
+            if i < sample_size:
+                sample.append(row)
+            else:
+                j = rng.randint(0, i)
+                if j < sample_size:
+                    sample[j] = row
+
+        results = _infer_shard(self, sample, len(tbl.columns), skip_values)
+
+        return [col_type for col_type, _, _ in results], [width for _, width, _ in results]
+
     def format_column(self, col, index="", replace_chars=None, col_prefix="_"):
         """Format the column to meet database contraints.
 
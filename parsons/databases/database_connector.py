@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import logging
+import time
 from parsons.etl.table import Table
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseConnector(ABC):
     """
@@ -188,3 +193,69 @@ class DatabaseConnector(ABC):
                 See :ref:`parsons-table` for output options.
         """
         pass
+
+    def query_many(
+        self,
+        sqls: List[str],
+        parameters: Optional[list] = None,
+        max_workers: int = 4,
+        return_errors: bool = False,
+    ) -> List[Optional[Table]]:
+        """Run independent queries at the same time, each on its own thread and connection.
+
+        Connectors created with a ``pool_size`` borrow connections from their pool, so no
+        more than ``pool_size`` queries run at once. Each query runs in its own transaction,
+        so the queries must not depend on each other.
+
+        .. code-block:: python
+
+            counts = db.query_many(
+                [f"SELECT COUNT(*) FROM {table}" for table in tables], max_workers=8
+            )
+
+        `Args:`
+            sqls: list
+                A list of valid SQL statements
+            parameters: list
+                A list with the ``parameters`` for each query, in the same order as ``sqls``
+            max_workers: int
+                The maximum number of queries to run at once
+            return_errors: bool
+                If ``True``, a query that fails has its exception returned in place of its
+                results. Otherwise, every query is run to completion and then the error from
+                the first failed query is raised.
+
+        `Returns:`
+            list
+                The result of each query, as returned by ``query``, in the same order as
+                ``sqls``
+        """
+
+        if parameters is not None and len(parameters) != len(sqls):
+            raise ValueError("parameters must have one entry for each query")
+
+        parameters = parameters or [None] * len(sqls)
+
+        def run(index):
+            start = time.monotonic()
+            try:
+                return self.query(sqls[index], parameters=parameters[index])
+            except Exception as error:
+                logger.error(f"Query {index} failed: {error}")
+                return error
+            finally:
+                logger.info(f"Query {index} finished in {time.monotonic() - start:.2f} seconds.")
+
+        if not sqls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sqls))) as executor:
+            results = list(executor.map(run, range(len(sqls))))
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        logger.info(f"Ran {len(sqls)} queries; {len(errors)} failed.")
+
+        if errors and not return_errors:
+            raise errors[0]
+
+        return results
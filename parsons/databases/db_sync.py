@@ -1,4 +1,10 @@
 import logging
+import queue
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from decimal import Decimal
+
+import petl
 
 from parsons.etl.table import Table
 
@@ -24,6 +30,21 @@ class DBSync:
         retries: int
             The number of times to retry if there is an error processing a
             chunk of data. The default value is 0.
+        read_ahead_chunks: int
+            The number of chunks to read from the source in a background thread while
+            earlier chunks are being written to the destination. Set to 0 to read and write
+            sequentially. The default value is 1.
+        checkpoint_store: CheckpointStore
+            Where to record progress after each write to the destination, such as a
+            ``FileCheckpointStore`` or ``SQLiteCheckpointStore``. If a sync of the same tables
+            is interrupted, the next sync with the same arguments resumes from the last
+            write rather than starting over. Checkpoints are removed when a sync completes.
+        stream_source: bool
+            Read each table from the source with a single streamed query, rather than a
+            query per ``read_chunk_size`` rows, holding only one chunk in memory at a time.
+            Requires a source database with ``query_batches``, such as ``MySQL``,
+            ``Postgres`` or ``Redshift``. If reading fails part way through, the query is
+            restarted after the last row read. Not used when syncing by ``watermark_column``.
     `Returns:`
         A DBSync object.
     """
@@ -35,6 +56,9 @@ class DBSync:
         read_chunk_size=100_000,
         write_chunk_size=None,
         retries=0,
+        read_ahead_chunks=1,
+        checkpoint_store=None,
+        stream_source=False,
     ):
 
         self.source_db = source_db
@@ -42,6 +66,9 @@ class DBSync:
         self.read_chunk_size = read_chunk_size
         self.write_chunk_size = write_chunk_size or read_chunk_size
         self.retries = retries
+        self.read_ahead_chunks = read_ahead_chunks
+        self.checkpoint_store = checkpoint_store
+        self.stream_source = stream_source
 
     def table_sync_full(
         self,
@@ -50,6 +77,8 @@ class DBSync:
         if_exists="drop",
         order_by=None,
         verify_row_count=True,
+        primary_key=None,
+        parallelism=1,
         **kwargs,
     ):
         """
@@ -72,20 +101,55 @@ class DBSync:
             verify_row_count: bool
                 Whether or not to verify the count of rows in the source and destination table
                 are the same at the end of the sync.
+            primary_key: str
+                Name of a unique column to page through the source table with. Each chunk is
+                read with ``WHERE primary_key > <last value> ORDER BY primary_key`` rather than
+                with an ``OFFSET``, which keeps reads fast on large tables. Rows are copied in
+                ``primary_key`` order, so ``order_by`` does not need to be set.
+            parallelism: int
+                The number of partitions to sync at the same time. The source table is split
+                into ranges of ``primary_key`` between its minimum and maximum values, and each
+                range is copied on its own thread with its own retries. Requires a numeric
+                ``primary_key``. Rows are not copied in order when this is more than 1. If
+                a partition fails, the others stop after their current write.
             **kwargs: args
                 Optional copy arguments for destination database.
         `Returns:`
             ``None``
         """
 
+        if primary_key and order_by and primary_key != order_by:
+            raise ValueError("order_by must match primary_key when primary_key is set.")
+
+        if parallelism > 1 and not primary_key:
+            raise ValueError("A primary_key is required to sync a table in parallel.")
+
         # Create the table objects
         source_tbl = self.source_db.table(source_table)
         destination_tbl = self.dest_db.table(destination_table)
 
         logger.info(f"Syncing full table data from {source_table} to {destination_table}")
 
-        # Drop or truncate if the destination table exists
-        if destination_tbl.exists:
+        checkpoint_key = self._checkpoint_key(source_table, destination_table)
+        checkpoint = self.checkpoint_store.get(checkpoint_key) if self.checkpoint_store else None
+
+        # A checkpoint left by a sync that paged through the source differently can't be
+        # resumed, so start over with a cleared destination instead
+        if checkpoint is not None and not _resumable(checkpoint, primary_key, parallelism):
+            logger.warning(
+                "Discarding checkpoint %s, which was saved by a different kind of sync.",
+                checkpoint_key,
+            )
+            self._clear_checkpoint(checkpoint_key, checkpoint)
+            checkpoint = None
+
+        resuming = checkpoint is not None
+
+        # Drop or truncate if the destination table exists, unless we are picking up
+        # a sync that was interrupted
+        if resuming:
+            logger.info(f"Resuming sync of {source_table} from checkpoint")
+        elif destination_tbl.exists:
             if if_exists == "drop":
                 destination_tbl.drop()
             elif if_exists == "truncate":
@@ -101,11 +165,24 @@ class DBSync:
             else:
                 raise ValueError("Invalid if_exists argument. Must be drop or truncate.")
 
-        # Create the table, if needed.
-        if not destination_tbl.exists:
+        # Create the table, if needed. Partitions are copied at the same time, so they
+        # create it themselves before starting.
+        if parallelism == 1 and not destination_tbl.exists:
             self.create_table(source_table, destination_table)
 
-        copied_rows = self.copy_rows(source_table, destination_table, None, order_by, **kwargs)
+        if parallelism > 1:
+            copied_rows = self.copy_partitions(
+                source_table, destination_table, primary_key, parallelism, **kwargs
+            )
+        else:
+            copied_rows = self.copy_rows(
+                source_table,
+                destination_table,
+                None,
+                primary_key or order_by,
+                primary_key=primary_key,
+                **kwargs,
+            )
 
         if verify_row_count:
             self._row_count_verify(source_tbl, destination_tbl)
@@ -118,13 +195,21 @@ class DBSync:
         destination_table,
         primary_key,
         distinct_check=True,
-        verify_row_count=True,
+        verify_row_count=None,
+        watermark_column=None,
         **kwargs,
     ):
         """
         Incremental sync of table from a source database to a destination database
         using an incremental primary key.
 
+        If a ``watermark_column`` is passed, rows are synced by when they were last changed
+        instead. Rows whose ``watermark_column`` value is at or after the latest value in the
+        destination are read from the source and upserted into the destination on
+        ``primary_key``, so both new and updated rows are picked up. The destination database
+        must support ``upsert``. Deleted rows, and rows with no ``watermark_column`` value,
+        are not synced.
+
         `Args:`
             source_table: str
                 Full table path (e.g. ``my_schema.my_table``)
@@ -138,13 +223,28 @@ class DBSync:
                 sync. If it is not, an error will be raised.
             verify_row_count: bool
                 Whether or not to verify the count of rows in the source and destination table
-                are the same at the end of the sync.
+                are the same at the end of the sync. Defaults to ``True``, unless a
+                ``watermark_column`` is passed, since the counts differ once rows are deleted
+                from the source.
+            watermark_column: str
+                The name of a column holding when each row was last changed (e.g.
+                ``updated_at``). This must be the same for the source and destination table.
             **kwargs: args
-                Optional copy arguments for destination database.
+                Optional copy (or upsert, with ``watermark_column``) arguments for
+                destination database.
         `Returns:`
             ``None``
         """
 
+        if verify_row_count is None:
+            verify_row_count = not watermark_column
+
+        if watermark_column and not hasattr(self.dest_db, "upsert"):
+            raise NotImplementedError(
+                f"{type(self.dest_db).__name__} does not support upserts, which are required "
+                "to sync by watermark_column."
+            )
+
         # Create the table objects
         source_tbl = self.source_db.table(source_table)
         destination_tbl = self.dest_db.table(destination_table)
@@ -156,7 +256,7 @@ class DBSync:
                 "Destination tables %s does not exist, running a full sync",
                 destination_table,
             )
-            self.table_sync_full(source_table, destination_table, order_by=primary_key, **kwargs)
+            self.table_sync_full(source_table, destination_table, primary_key=primary_key, **kwargs)
             return
 
         # Check that the source table primary key is distinct
@@ -168,6 +268,24 @@ class DBSync:
             )
             raise ValueError("{primary_key} is not distinct in source table.")
 
+        if watermark_column:
+            # Everything changed since the most recent change already in the destination.
+            # Rows changed at exactly that time may not all have been synced yet, so they
+            # are included; the upsert makes re-applying them harmless.
+            watermark = destination_tbl.max_watermark(watermark_column)
+            logger.debug("Syncing rows with %s at or after %s", watermark_column, watermark)
+
+            rows_upserted = self.upsert_rows(
+                source_table, destination_table, primary_key, watermark_column, watermark, **kwargs
+            )
+            logger.info("Upserted %s changed rows to %s.", rows_upserted, destination_table)
+
+            if verify_row_count:
+                self._row_count_verify(source_tbl, destination_tbl)
+
+            logger.info(f"{source_table} synced to {destination_table}.")
+            return
+
         # Get the max source table and destination table primary key
         logger.debug(
             "Calculating the maximum value for %s for source table %s",
@@ -194,7 +312,12 @@ class DBSync:
 
         else:
             rows_copied = self.copy_rows(
-                source_table, destination_table, dest_max_pk, primary_key, **kwargs
+                source_table,
+                destination_table,
+                dest_max_pk,
+                primary_key,
+                primary_key=primary_key,
+                **kwargs,
             )
 
             logger.info("Copied %s new rows to %s.", rows_copied, destination_table)
@@ -204,7 +327,18 @@ class DBSync:
 
         logger.info(f"{source_table} synced to {destination_table}.")
 
-    def copy_rows(self, source_table_name, destination_table_name, cutoff, order_by, **kwargs):
+    def copy_rows(
+        self,
+        source_table_name,
+        destination_table_name,
+        cutoff,
+        order_by,
+        primary_key=None,
+        upper_bound=None,
+        checkpoint_key=None,
+        stop_event=None,
+        **kwargs,
+    ):
         """
         Copy the rows from the source to the destination.
 
@@ -217,96 +351,466 @@ class DBSync:
                 Start value to use as a minimum for incremental updates.
             order_by:
                 Column to use to order the data to ensure a stable sort.
+            primary_key: str
+                A unique column to page through the source with, using the last value read
+                rather than an offset. Takes the place of ``order_by``.
+            upper_bound:
+                The largest ``primary_key`` value to copy. Only used with ``primary_key``.
+            checkpoint_key: str
+                The key to record progress under in the ``checkpoint_store``. Defaults to a
+                key made from the table names.
+            stop_event: threading.Event
+                If set while copying, the copy stops before its next write, keeping its
+                checkpoint, and raises a ``RuntimeError``.
             **kwargs: args
                 Optional copy arguments for destination database.
         `Returns:`
-            ``None``
+            int
+                The number of rows copied
         """
 
         # Create the table objects
         source_table = self.source_db.table(source_table_name)
 
-        # Initialize the Parsons table we will use to store rows before writing
-        buffer = Table()
+        # Shared by the reader and writer, which may run on different threads
+        retry = _RetryBudget(self.retries)
+
+        checkpoint_key = checkpoint_key or self._checkpoint_key(
+            source_table_name, destination_table_name
+        )
+        checkpoint = self._load_checkpoint(checkpoint_key, primary_key)
+
+        offset = 0
+        total_rows_written = 0
+
+        if checkpoint:
+            # Pick up after the last rows written to the destination
+            if primary_key:
+                cutoff = checkpoint["position"]
+            else:
+                offset = checkpoint["position"]
+
+            total_rows_written = checkpoint["rows_written"]
+            logger.info(
+                "Resuming copy to %s after %s rows", destination_table_name, total_rows_written
+            )
+
+        if self.stream_source:
+            read_chunks = self._stream_chunks
+        else:
+            read_chunks = self._read_chunks
+
+        chunks = read_chunks(
+            source_table, cutoff, order_by, primary_key, upper_bound, offset, retry
+        )
+
+        def write(buffer):
+            self.dest_db.copy(buffer, destination_table_name, if_exists="append", **kwargs)
+
+        return self._write_chunks(
+            chunks,
+            write,
+            destination_table_name,
+            checkpoint_key,
+            primary_key,
+            total_rows_written,
+            retry,
+            stop_event=stop_event,
+        )
+
+    def upsert_rows(
+        self,
+        source_table_name,
+        destination_table_name,
+        primary_key,
+        watermark_column,
+        watermark,
+        checkpoint_key=None,
+        **kwargs,
+    ):
+        """
+        Upsert the rows from the source that have changed since a watermark into the
+        destination.
 
-        # Track the number of retries we have left before giving up
-        retries_left = self.retries + 1
+        `Args:`
+            source_table_name: str
+                Full table path (e.g. ``my_schema.my_table``)
+            destination_table_name: str
+                Full table path (e.g. ``my_schema.my_table``)
+            primary_key: str
+                The column to match source and destination rows on
+            watermark_column: str
+                The column holding when each row was last changed
+            watermark:
+                Copy rows with a ``watermark_column`` value at or after this. If ``None``,
+                all rows are copied.
+            checkpoint_key: str
+                The key to record progress under in the ``checkpoint_store``. Defaults to a
+                key made from the table names.
+            **kwargs: args
+                Optional upsert arguments for destination database.
+        `Returns:`
+            int
+                The number of rows upserted
+        """
+
+        source_table = self.source_db.table(source_table_name)
+        retry = _RetryBudget(self.retries)
+
+        # Kept apart from checkpoints of full and incremental syncs, which page differently
+        checkpoint_key = (
+            checkpoint_key
+            or f"{self._checkpoint_key(source_table_name, destination_table_name)} "
+            f"[{watermark_column}]"
+        )
+        checkpoint = self._load_checkpoint(checkpoint_key, primary_key)
 
-        total_rows_downloaded = 0
+        last_position = None
         total_rows_written = 0
+
+        if checkpoint:
+            last_position = checkpoint["position"]
+            total_rows_written = checkpoint["rows_written"]
+            logger.info(
+                "Resuming upsert to %s after %s rows", destination_table_name, total_rows_written
+            )
+
+        chunks = self._read_changed_chunks(
+            source_table, primary_key, watermark_column, watermark, last_position, retry
+        )
+
+        def write(buffer):
+            self.dest_db.upsert(buffer, destination_table_name, primary_key, **kwargs)
+
+        return self._write_chunks(
+            chunks,
+            write,
+            destination_table_name,
+            checkpoint_key,
+            primary_key,
+            total_rows_written,
+            retry,
+        )
+
+    def _write_chunks(
+        self,
+        chunks,
+        write,
+        destination_table_name,
+        checkpoint_key,
+        primary_key,
+        total_rows_written,
+        retry,
+        stop_event=None,
+    ):
+        """
+        Buffer chunks of rows and write them to the destination with ``write`` every
+        ``write_chunk_size`` rows, saving a checkpoint after each write. Stops, keeping the
+        checkpoint, if ``stop_event`` is set.
+        """
+
+        if self.read_ahead_chunks > 0:
+            chunks = _read_ahead(chunks, self.read_ahead_chunks)
+
+        # Initialize the Parsons table we will use to store rows before writing
+        buffer = Table()
+
         rows_buffered = 0
+        position = None
+
+        for rows, position in chunks:
+            if stop_event is not None and stop_event.is_set():
+                raise RuntimeError(f"Copy to {destination_table_name} stopped")
+
+            # Add the new rows to our buffer
+            buffer.concat(rows)
+            rows_buffered += rows.num_rows
+
+            # If our buffer reaches our write threshold, write it out
+            if rows_buffered >= self.write_chunk_size:
+                logger.debug("Writing %s rows to %s", rows_buffered, destination_table_name)
+                retry.call(write, buffer)
+                total_rows_written += rows_buffered
+                self._save_checkpoint(checkpoint_key, primary_key, position, total_rows_written)
+
+                # Reset the buffer
+                rows_buffered = 0
+                buffer = Table()
+
+        if stop_event is not None and stop_event.is_set():
+            raise RuntimeError(f"Copy to {destination_table_name} stopped")
+
+        # If we have any rows that are unwritten, flush them to the destination database
+        if rows_buffered > 0:
+            logger.debug("Writing %s rows to %s", rows_buffered, destination_table_name)
+            retry.call(write, buffer)
+            total_rows_written += rows_buffered
+
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.clear(checkpoint_key)
+
+        return total_rows_written
+
+    def _read_chunks(self, source_table, cutoff, order_by, primary_key, upper_bound, offset, retry):
+        """
+        Yield chunks of rows from the source table until it is exhausted, each along with
+        the position to resume reading from after it: the last key read when paging by
+        ``primary_key``, otherwise the offset.
+        """
+
+        last_key = cutoff
 
-        # Keep going until we break out
         while True:
+            if primary_key:
+                # Keyset pagination: pick up after the last key we have seen
+                rows = retry.call(
+                    source_table.get_new_rows,
+                    primary_key=primary_key,
+                    cutoff_value=last_key,
+                    chunk_size=self.read_chunk_size,
+                    upper_bound=upper_bound,
+                )
+            elif cutoff:
+                # If we have a cutoff, we are loading data incrementally -- filter out
+                # any data before our cutoff
+                rows = retry.call(
+                    source_table.get_new_rows,
+                    primary_key=order_by,
+                    cutoff_value=cutoff,
+                    offset=offset,
+                    chunk_size=self.read_chunk_size,
+                )
+            else:
+                # Get a chunk
+                rows = retry.call(
+                    source_table.get_rows,
+                    offset=offset,
+                    chunk_size=self.read_chunk_size,
+                    order_by=order_by,
+                )
+
+            number_of_rows = rows.num_rows
+            logger.debug("Read %s rows", number_of_rows)
+
+            # If we didn't get any data, we're done
+            if number_of_rows == 0:
+                return
+
+            offset += number_of_rows
+            if primary_key:
+                last_key = rows.column_data(primary_key)[-1]
+                yield rows, last_key
+            else:
+                yield rows, offset
+
+    def _stream_chunks(
+        self, source_table, cutoff, order_by, primary_key, upper_bound, offset, retry
+    ):
+        """
+        Like ``_read_chunks``, but read the rows with one streamed query. If the stream
+        fails, it is restarted from the last position read.
+        """
+
+        last_key = cutoff
+        key = primary_key or order_by
+
+        while True:
+            # Without a primary key, rows already read are skipped on the client, since
+            # not every database supports an OFFSET without a LIMIT
+            skip = 0 if primary_key else offset
+
             try:
-                # Get the records to load into the database
-                if cutoff:
-                    # If we have a cutoff, we are loading data incrementally -- filter out
-                    # any data before our cutoff
-                    rows = source_table.get_new_rows(
-                        primary_key=order_by,
-                        cutoff_value=cutoff,
-                        offset=total_rows_downloaded,
-                        chunk_size=self.read_chunk_size,
-                    )
-                else:
-                    # Get a chunk
-                    rows = source_table.get_rows(
-                        offset=total_rows_downloaded,
-                        chunk_size=self.read_chunk_size,
-                        order_by=order_by,
-                    )
-
-                number_of_rows = rows.num_rows
-                total_rows_downloaded += number_of_rows
-
-                # If we didn't get any data, exit the loop -- there's nothing to load
-                if number_of_rows == 0:
-                    # If we have any rows that are unwritten, flush them to the destination database
-                    if rows_buffered > 0:
-                        logger.debug(
-                            "Copying %s rows to %s",
-                            rows_buffered,
-                            destination_table_name,
-                        )
-                        self.dest_db.copy(
-                            buffer, destination_table_name, if_exists="append", **kwargs
-                        )
-                        total_rows_written += rows_buffered
-
-                        # Reset the buffer
-                        rows_buffered = 0
-                        buffer = Table()
-
-                    break
-
-                # Add the new rows to our buffer
-                buffer.concat(rows)
-                rows_buffered += number_of_rows
-
-                # If our buffer reaches our write threshold, write it out
-                if rows_buffered >= self.write_chunk_size:
-                    logger.debug("Copying %s rows to %s", rows_buffered, destination_table_name)
-                    self.dest_db.copy(buffer, destination_table_name, if_exists="append", **kwargs)
-                    total_rows_written += rows_buffered
-
-                    # Reset the buffer
-                    rows_buffered = 0
-                    buffer = Table()
+                for rows in source_table.stream_rows(
+                    order_by=key,
+                    cutoff_value=last_key,
+                    upper_bound=upper_bound,
+                    chunk_size=self.read_chunk_size,
+                ):
+                    if skip >= rows.num_rows:
+                        skip -= rows.num_rows
+                        continue
+                    elif skip:
+                        rows = Table(petl.rowslice(rows.table, skip, None))
+                        skip = 0
+
+                    logger.debug("Read %s rows", rows.num_rows)
+
+                    offset += rows.num_rows
+                    if primary_key:
+                        last_key = rows.column_data(primary_key)[-1]
+                        yield rows, last_key
+                    else:
+                        yield rows, offset
+
+                return
 
             except Exception:
-                # Tick down the number of retries
-                retries_left -= 1
+                retry.failed()
 
-                # If we are out of retries, fail
-                if retries_left == 0:
-                    logger.debug("No retries remaining")
-                    raise
+    def _read_changed_chunks(
+        self, source_table, primary_key, watermark_column, watermark, last_position, retry
+    ):
+        """
+        Yield chunks of rows changed since ``watermark``, in ``(watermark_column,
+        primary_key)`` order, each along with that pair for its last row.
+        """
 
-                # Otherwise, log the exception and try again
-                logger.exception("Unhandled error copying data; retrying")
+        while True:
+            rows = retry.call(
+                source_table.get_changed_rows,
+                watermark_column,
+                primary_key,
+                watermark=watermark,
+                last_position=last_position,
+                chunk_size=self.read_chunk_size,
+            )
 
-        return total_rows_written
+            number_of_rows = rows.num_rows
+            logger.debug("Read %s rows", number_of_rows)
+
+            if number_of_rows == 0:
+                return
+
+            last_row = rows[number_of_rows - 1]
+            last_position = [last_row[watermark_column], last_row[primary_key]]
+
+            yield rows, last_position
+
+    def copy_partitions(
+        self, source_table_name, destination_table_name, primary_key, parallelism, **kwargs
+    ):
+        """
+        Copy all rows from the source to the destination, splitting the source into ranges
+        of a numeric primary key and copying the ranges at the same time. The destination
+        table is created first if it doesn't exist. If copying a range fails, the others stop
+        after their current write and the error is raised.
+
+        `Args:`
+            source_table_name: str
+                Full table path (e.g. ``my_schema.my_table``)
+            destination_table_name: str
+                Full table path (e.g. ``my_schema.my_table``)
+            primary_key: str
+                A unique, numeric column to partition the source table by
+            parallelism: int
+                The number of partitions to copy at once
+            **kwargs: args
+                Optional copy arguments for destination database.
+        `Returns:`
+            int
+                The number of rows copied
+        """
+
+        source_table = self.source_db.table(source_table_name)
+
+        # Create the table up front, rather than leave each partition's copy to race to
+        if not self.dest_db.table(destination_table_name).exists:
+            source_obj = self.source_db.get_table_object(source_table_name)
+            self.dest_db.create_table(source_obj, destination_table_name)
+
+        checkpoint_key = self._checkpoint_key(source_table_name, destination_table_name)
+        plan = self.checkpoint_store.get(checkpoint_key) if self.checkpoint_store else None
+
+        if plan and "partitions" in plan:
+            # Resume with the same partitions, even if the key range has since changed
+            partitions = [tuple(bounds) for bounds in plan["partitions"]]
+        else:
+            partitions = _partition_key_range(
+                source_table.min_primary_key(primary_key),
+                source_table.max_primary_key(primary_key),
+                parallelism,
+            )
+
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.save(
+                    checkpoint_key, {"primary_key": primary_key, "partitions": partitions}
+                )
+
+        if len(partitions) == 1:
+            logger.info(
+                "Unable to partition %s by %s; copying serially.", source_table_name, primary_key
+            )
+
+        stop = threading.Event()
+
+        def copy_partition(index, bounds):
+            lower, upper = bounds
+            rows = self.copy_rows(
+                source_table_name,
+                destination_table_name,
+                lower,
+                primary_key,
+                primary_key=primary_key,
+                upper_bound=upper,
+                checkpoint_key=f"{checkpoint_key} [{index}]",
+                stop_event=stop,
+                **kwargs,
+            )
+            logger.debug("Copied %s rows with %s in (%s, %s]", rows, primary_key, lower, upper)
+            return rows
+
+        with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+            futures = [
+                executor.submit(copy_partition, index, bounds)
+                for index, bounds in enumerate(partitions)
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            errors = [future.exception() for future in done if future.exception()]
+
+            if errors:
+                # Stop the other partitions, which keep their checkpoints to resume from
+                stop.set()
+                for future in futures:
+                    future.cancel()
+
+        if errors:
+            raise errors[0]
+
+        partition_rows = [future.result() for future in futures]
+
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.clear(checkpoint_key)
+
+        logger.info("Copied %s rows across %s partitions.", sum(partition_rows), len(partitions))
+        return sum(partition_rows)
+
+    @staticmethod
+    def _checkpoint_key(source_table_name, destination_table_name):
+        return f"{source_table_name} -> {destination_table_name}"
+
+    def _load_checkpoint(self, checkpoint_key, primary_key):
+        if self.checkpoint_store is None:
+            return None
+
+        checkpoint = self.checkpoint_store.get(checkpoint_key)
+        if checkpoint is None:
+            return None
+
+        # A checkpoint is only meaningful if we are paging through the source the same way
+        if "position" not in checkpoint or checkpoint.get("primary_key") != primary_key:
+            logger.warning(
+                "Ignoring checkpoint %s, which was saved by a different kind of sync.",
+                checkpoint_key,
+            )
+            return None
+
+        return checkpoint
+
+    def _clear_checkpoint(self, checkpoint_key, checkpoint):
+        # A partition plan has a checkpoint of its own for each partition
+        for index in range(len(checkpoint.get("partitions", []))):
+            self.checkpoint_store.clear(f"{checkpoint_key} [{index}]")
+
+        self.checkpoint_store.clear(checkpoint_key)
+
+    def _save_checkpoint(self, checkpoint_key, primary_key, position, rows_written):
+        if self.checkpoint_store is None:
+            return
+
+        self.checkpoint_store.save(
+            checkpoint_key,
+            {"primary_key": primary_key, "position": position, "rows_written": rows_written},
+        )
 
     @staticmethod
     def _check_column_match(source_table_obj, destination_table_obj):
@@ -357,3 +861,141 @@ class DBSync:
                 "Unable to create destination table based on source table; we will "
                 'fallback to using "copy" to create the destination.'
             )
+
+
+class _RetryBudget:
+    """
+    A count of retries shared by everything copying a table. Safe to use from several
+    threads.
+    """
+
+    def __init__(self, retries):
+        # Track the number of attempts we have left before giving up
+        self.retries_left = retries + 1
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                self.failed()
+
+    def failed(self):
+        """
+        Record a failure. Must be called while handling the exception, which is re-raised if
+        there are no retries left.
+        """
+
+        # Tick down the number of retries
+        with self._lock:
+            self.retries_left -= 1
+            exhausted = self.retries_left <= 0
+
+        # If we are out of retries, fail
+        if exhausted:
+            logger.debug("No retries remaining")
+            raise
+
+        # Otherwise, log the exception and try again
+        logger.exception("Unhandled error copying data; retrying")
+
+
+def _resumable(checkpoint, primary_key, parallelism):
+    """
+    Whether a full sync with these arguments can pick up from a checkpoint, which is only
+    the case if it was saved by a sync paging through the source the same way.
+    """
+
+    if checkpoint.get("primary_key") != primary_key:
+        return False
+
+    if parallelism > 1:
+        return "partitions" in checkpoint
+
+    return "position" in checkpoint
+
+
+def _read_ahead(chunks, size):
+    """
+    Consume an iterator of chunks on a background thread, keeping up to ``size`` chunks
+    ready in a queue. Errors raised by the iterator are re-raised to the caller.
+    """
+
+    ready = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up if the consumer has stopped, rather than blocking forever
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(("chunk", chunk)):
+                    return
+
+            put(("done", None))
+        except Exception as error:
+            put(("error", error))
+
+    reader = threading.Thread(target=produce, name="dbsync-reader", daemon=True)
+    reader.start()
+
+    try:
+        while True:
+            kind, value = ready.get()
+
+            if kind == "error":
+                raise value
+            elif kind == "done":
+                return
+
+            yield value
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _partition_key_range(min_key, max_key, parallelism):
+    """
+    Split the range of a numeric key into up to ``parallelism`` ranges, each given as a
+    ``(lower, upper)`` pair where ``lower`` is exclusive and ``upper`` is inclusive. The first
+    and last ranges are unbounded (``None``) so that every row falls in a range.
+    """
+
+    numeric = (int, float, Decimal)
+    if (
+        not isinstance(min_key, numeric)
+        or not isinstance(max_key, numeric)
+        or isinstance(min_key, bool)
+        or isinstance(max_key, bool)
+    ):
+        return [(None, None)]
+
+    # Decimals can't be used in arithmetic with floats
+    if isinstance(min_key, Decimal) or isinstance(max_key, Decimal):
+        min_key, max_key = Decimal(str(min_key)), Decimal(str(max_key))
+
+    if max_key <= min_key:
+        return [(None, None)]
+
+    if isinstance(min_key, int) and isinstance(max_key, int):
+        span = max_key - min_key
+        split_points = [min_key + span * i // parallelism for i in range(1, parallelism)]
+    else:
+        step = (max_key - min_key) / parallelism
+        split_points = [min_key + step * i for i in range(1, parallelism)]
+
+    # Small ranges can produce the same split point more than once
+    split_points = sorted(set(split_points))
+
+    bounds = [None] + split_points + [None]
+    return list(zip(bounds[:-1], bounds[1:]))
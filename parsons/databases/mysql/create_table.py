@@ -1,7 +1,6 @@
 from parsons.databases.database.database import DatabaseCreateStatement
 import parsons.databases.mysql.constants as consts
 
-import petl
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,36 +27,45 @@ class MySQLCreateTable(DatabaseCreateStatement):
     def is_valid_integer(self, val):
         return self.is_valid_sql_num(val)
 
+    def _fold_column(self, row, state):
+        # Fold one value into the MySQL data type and width of its column.
+
+        col_type, col_width = state or (None, 0)
+
+        # Get the MySQL data type
+        col_type = self.data_type(row, col_type)
+
+        # Calculate width if a varchar
+        if col_type == "varchar":
+            row_width = len(str(row.encode("utf-8")))
+
+            # Evaluate width vs. current max width
+            if row_width > col_width:
+                col_width = row_width
+
+        return col_type, col_width
+
     def evaluate_column(self, column_rows):
         # Generate MySQL data types and widths for a column.
 
-        col_width = 0
-        col_type = None
+        state = None
 
         # Iterate through each row in the column
         for row in column_rows:
+            state = self._fold_column(row, state)
 
-            # Get the MySQL data type
-            col_type = self.data_type(row, col_type)
-
-            # Calculate width if a varchar
-            if col_type == "varchar":
-                row_width = len(str(row.encode("utf-8")))
-
-                # Evaluate width vs. current max width
-                if row_width > col_width:
-                    col_width = row_width
-
-        return col_type, col_width
+        return state or (None, 0)
 
     def evaluate_table(self, tbl):
         # Generate a dict of MySQL column types and widths for all columns
-        # in a table.
+        # in a table, from a single read of the table.
+
+        profile = tbl.get_column_profile(folds={"mysql": self._fold_column})
 
         table_map = []
 
-        for col in tbl.columns:
-            col_type, col_width = self.evaluate_column(tbl.column_data(col))
+        for col, state in zip(tbl.columns, profile.folds["mysql"]):
+            col_type, col_width = state or (None, 0)
             col_map = {"name": col, "type": col_type, "width": col_width}
             table_map.append(col_map)
 
@@ -67,7 +75,7 @@ class MySQLCreateTable(DatabaseCreateStatement):
         # Generate create statement SQL for a given Parsons table.
 
         # Validate and rename column names if needed
-        tbl.table = petl.setheader(tbl.table, self.columns_convert(tbl.columns))
+        tbl.set_header(self.columns_convert(tbl.columns))
 
         # Generate the table map
         table_map = self.evaluate_table(tbl)
@@ -1,22 +1,32 @@
 from parsons import Table
-from parsons.utilities import check_env
-import petl
+from parsons.etl.profile import value_width
+from parsons.etl.spill import SpillWriter
+from parsons.utilities import check_env, files
+from parsons.utilities.sql_helpers import fetch_batches
 import mysql.connector as mysql
 from contextlib import contextmanager
-from parsons.utilities import files
-import pickle
 import logging
 import os
 from parsons.databases.database_connector import DatabaseConnector
 from parsons.databases.table import BaseTable
 from parsons.databases.mysql.create_table import MySQLCreateTable
 from parsons.databases.alchemy import Alchemy
+from parsons.databases.connection_pool import ConnectionPool, reset_session
 
 # Max number of rows that we query at a time, so we can avoid loading huge
 # data sets into memory.
 # 100k rows per batch at ~1k bytes each = ~100MB per batch.
 QUERY_BATCH_SIZE = 100000
 
+# The largest INSERT batch sent by copy, kept well under the smallest default
+# max_allowed_packet (4MB in MySQL 5.7).
+MAX_INSERT_BATCH_BYTES = 1000000
+
+# The characters that have to be escaped in a LOAD DATA file, with their escapes
+LOAD_DATA_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,9 +45,32 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
             Required if env variable ``MYSQL_DB`` not populated
         port: int
             Can be set by env variable ``MYSQL_PORT`` or argument.
+        pool_size: int
+            If set, connections are reused from a thread-safe pool holding up to this many
+            connections, rather than opened and closed for every query.
+        pool_max_idle_time: int
+            Seconds a pooled connection may sit unused before it is closed.
+        pool_max_lifetime: int
+            Seconds after which a pooled connection is closed rather than reused.
+        allow_local_infile: bool
+            Allow the client to send local files to the server with
+            ``LOAD DATA LOCAL INFILE``, which ``copy`` can use to load tables. This lets the
+            server request any file the client can read, so only enable it for servers you
+            trust.
     """
 
-    def __init__(self, host=None, username=None, password=None, db=None, port=3306):
+    def __init__(
+        self,
+        host=None,
+        username=None,
+        password=None,
+        db=None,
+        port=3306,
+        pool_size=None,
+        pool_max_idle_time=300,
+        pool_max_lifetime=3600,
+        allow_local_infile=False,
+    ):
         super().__init__()
 
         self.username = check_env.check("MYSQL_USERNAME", username)
@@ -45,6 +78,24 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
         self.host = check_env.check("MYSQL_HOST", host)
         self.db = check_env.check("MYSQL_DB", db)
         self.port = port or os.environ.get("MYSQL_PORT")
+        self.allow_local_infile = allow_local_infile
+
+        # Ids of connections left in an unknown state, which are closed rather than reused
+        self._broken_connections = set()
+
+        self.pool = None
+        if pool_size:
+            self.pool = ConnectionPool(
+                self._create_connection,
+                max_size=pool_size,
+                max_idle_time=pool_max_idle_time,
+                max_lifetime=pool_max_lifetime,
+                # is_connected pings the server
+                health_check=lambda conn: conn.is_connected(),
+                # Discard anything left uncommitted, and any session changes such as
+                # autocommit, before the connection is reused
+                reset=reset_session,
+            )
 
     @contextmanager
     def connection(self):
@@ -57,28 +108,50 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
         any context manager):
         ``with mysql.connection() as conn:``
 
+        If the connector was created with a ``pool_size``, the connection is borrowed from
+        the connection pool and returned to it, rather than closed, at the end of the block.
+
         `Returns:`
             MySQL `connection` object
         """
 
-        # Create a mysql connection and cursor
-        connection = mysql.connect(
-            host=self.host,
-            user=self.username,
-            passwd=self.password,
-            database=self.db,
-            port=self.port,
-        )
+        if self.pool is not None:
+            connection = self.pool.acquire()
+        else:
+            connection = self._create_connection()
 
         try:
             yield connection
         except mysql.Error:
-            connection.rollback()
+            if id(connection) not in self._broken_connections:
+                connection.rollback()
             raise
         else:
             connection.commit()
         finally:
-            connection.close()
+            broken = id(connection) in self._broken_connections
+            self._broken_connections.discard(id(connection))
+
+            if self.pool is not None:
+                self.pool.release(connection, discard=broken)
+            elif broken:
+                try:
+                    connection.close()
+                except Exception:
+                    logger.debug("Error closing broken connection.", exc_info=True)
+            else:
+                connection.close()
+
+    def _create_connection(self):
+        # Create a mysql connection
+        return mysql.connect(
+            host=self.host,
+            user=self.username,
+            passwd=self.password,
+            database=self.db,
+            port=self.port,
+            allow_local_infile=self.allow_local_infile,
+        )
 
     @contextmanager
     def cursor(self, connection):
@@ -89,7 +162,51 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
         finally:
             cur.close()
 
-    def query(self, sql, parameters=None):
+    @contextmanager
+    def unbuffered_cursor(self, connection):
+        """
+        Generate an unbuffered cursor. Rows are read from the server as they are fetched,
+        rather than all at once when the query is executed, so memory use doesn't grow with
+        the size of the results. No other queries can be run on the connection until all of
+        the rows have been fetched.
+
+        If the unread rows can't be read when the cursor is closed, the connection is
+        discarded rather than reused.
+
+        `Args:`
+            connection: obj
+                A connection object obtained from ``mysql.connection()``
+        `Returns:`
+            MySQL ``cursor`` object
+        """
+
+        cur = connection.cursor(buffered=False)
+        failed = False
+
+        try:
+            yield cur
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            try:
+                # The connection can't be used again until any unread rows are consumed
+                if cur.with_rows:
+                    while cur.fetchmany(QUERY_BATCH_SIZE):
+                        pass
+                cur.close()
+            except Exception:
+                self._broken_connections.add(id(connection))
+                # Don't hide the error that stopped the rows from being read
+                if not failed:
+                    raise
+                logger.warning(
+                    "Unable to read the rest of an unbuffered query's results. The "
+                    "connection will be discarded.",
+                    exc_info=True,
+                )
+
+    def query(self, sql, parameters=None, stream=False, itersize=QUERY_BATCH_SIZE):
         """
         Execute a query against the database. Will return ``None`` if the query returns zero rows.
 
@@ -120,6 +237,12 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
                 A valid SQL statement
             parameters: list
                 A list of python variables to be converted into SQL values in your query
+            stream: boolean
+                Fetch the results through an unbuffered cursor, so that only ``itersize``
+                rows are held in memory at a time. Only a single SQL statement can be
+                streamed.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
@@ -128,9 +251,19 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
         """  # noqa: E501
 
         with self.connection() as connection:
-            return self.query_with_connection(sql, connection, parameters=parameters)
+            return self.query_with_connection(
+                sql, connection, parameters=parameters, stream=stream, itersize=itersize
+            )
 
-    def query_with_connection(self, sql, connection, parameters=None, commit=True):
+    def query_with_connection(
+        self,
+        sql,
+        connection,
+        parameters=None,
+        commit=True,
+        stream=False,
+        itersize=QUERY_BATCH_SIZE,
+    ):
         """
         Execute a query against the database, with an existing connection. Useful for batching
         queries together. Will return ``None`` if the query returns zero rows.
@@ -146,51 +279,97 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
                 Whether to commit the transaction immediately. If ``False`` the transaction will
                 be committed when the connection goes out of scope and is closed (or you can
                 commit manually with ``connection.commit()``).
+            stream: boolean
+                Fetch the results through an unbuffered cursor, so that only ``itersize``
+                rows are held in memory at a time. Only a single SQL statement can be
+                streamed.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
                 See :ref:`parsons-table` for output options.
         """
-        with self.cursor(connection) as cursor:
-            # The python connector can only execute a single sql statement, so we will
-            # break up each statement and execute them separately.
-            for s in sql.strip().split(";"):
-                if len(s) != 0:
-                    logger.debug(f"SQL Query: {sql}")
-                    cursor.execute(s, parameters)
-
-            if commit:
+
+        # The python connector can only execute a single sql statement, so we will
+        # break up each statement and execute them separately.
+        statements = [s for s in sql.strip().split(";") if len(s) != 0]
+
+        if stream and len(statements) > 1:
+            # Each statement's rows would have to be read before the next could be sent
+            raise ValueError("Only a single SQL statement can be streamed")
+
+        if stream:
+            cursor_context = self.unbuffered_cursor(connection)
+            batch_size = itersize
+        else:
+            cursor_context = self.cursor(connection)
+            batch_size = QUERY_BATCH_SIZE
+
+        with cursor_context as cursor:
+            for s in statements:
+                logger.debug(f"SQL Query: {sql}")
+                cursor.execute(s, parameters)
+
+            # An unbuffered cursor has to be read to the end before anything else, including
+            # a commit, can be sent on the connection.
+            if commit and not stream:
                 connection.commit()
 
             # If the SQL query provides no response, then return None
             if not cursor.description:
                 logger.debug("Query returned 0 rows")
-                return None
+                final_tbl = None
 
             else:
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches and write them to a spill file in blocks.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
-                temp_file = files.create_temp_file()
-
-                with open(temp_file, "wb") as f:
-                    # Grab the header
-                    pickle.dump(cursor.column_names, f)
-
-                    while True:
-                        batch = cursor.fetchmany(QUERY_BATCH_SIZE)
-                        if len(batch) == 0:
-                            break
-
+                with SpillWriter(cursor.column_names) as writer:
+                    for batch in fetch_batches(cursor, batch_size):
                         logger.debug(f"Fetched {len(batch)} rows.")
-                        for row in batch:
-                            pickle.dump(row, f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(writer.view())
 
                 logger.debug(f"Query returned {final_tbl.num_rows} rows.")
-                return final_tbl
+
+        if commit and stream:
+            connection.commit()
+
+        return final_tbl
+
+    def query_batches(self, sql, parameters=None, itersize=QUERY_BATCH_SIZE):
+        """
+        Execute a query through an unbuffered cursor and yield the results in batches, so
+        that only one batch is held in memory at a time. Only valid for queries that return
+        rows.
+
+        .. code-block:: python
+
+            for batch in mysql.query_batches("SELECT * FROM my_table", itersize=50000):
+                batch.to_csv(...)
+
+        `Args:`
+            sql: str
+                A valid SQL statement
+            parameters: list
+                A list of python variables to be converted into SQL values in your query
+            itersize: int
+                The maximum number of rows in each batch
+        `Returns:`
+            Generator of Parsons Tables
+        """
+
+        with self.connection() as connection:
+            with self.unbuffered_cursor(connection) as cursor:
+                logger.debug(f"SQL Query: {sql}")
+                cursor.execute(sql, parameters)
+
+                for batch in fetch_batches(cursor, itersize):
+                    logger.debug(f"Fetched {len(batch)} rows.")
+                    yield Table([list(cursor.column_names)] + [list(row) for row in batch])
 
     def copy(
         self,
@@ -199,14 +378,16 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
         if_exists: str = "fail",
         chunk_size: int = 1000,
         strict_length: bool = True,
+        engine: str = "auto",
+        max_batch_bytes: int = MAX_INSERT_BATCH_BYTES,
     ):
         """
         Copy a :ref:`parsons-table` to the database.
 
         .. note::
-            This method utilizes extended inserts rather `LOAD DATA INFILE` since
-            many MySQL Database configurations do not allow data files to be
-            loaded. It results in a minor performance hit compared to `LOAD DATA`.
+            ``LOAD DATA LOCAL INFILE`` is much faster than inserts, but many MySQL
+            configurations don't allow it. It must be enabled on the server
+            (``local_infile``) and on the connector with ``allow_local_infile``.
 
         `Args:`
             tbl: parsons.Table
@@ -217,14 +398,25 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
                 If the table already exists, either ``fail``, ``append``, ``drop``
                 or ``truncate`` the table.
             chunk_size: int
-                The number of rows to insert per query.
+                The maximum number of rows to insert per query.
             strict_length: bool
                 If the database table needs to be created, strict_length determines whether
                 the created table's column sizes will be sized to exactly fit the current data,
                 or if their size will be rounded up to account for future values being larger
                 then the current dataset. defaults to ``True``
+            engine: str
+                How to load the rows. ``insert`` sends parameterized multi-row inserts.
+                ``load_data`` streams the table to a temp file and loads it with
+                ``LOAD DATA LOCAL INFILE``. ``auto`` uses ``load_data`` if both the connector
+                and the server allow local files, and ``insert`` otherwise.
+            max_batch_bytes: int
+                The approximate maximum size of each insert, in bytes. Only used by the
+                ``insert`` engine. Must be less than the server's ``max_allowed_packet``.
         """
 
+        if engine not in ("auto", "insert", "load_data"):
+            raise ValueError("engine must be one of auto, insert or load_data")
+
         if tbl.num_rows == 0:
             logger.info("Parsons table is empty. Table will not be created.")
             return None
@@ -236,31 +428,104 @@ class MySQL(DatabaseConnector, MySQLCreateTable, Alchemy):
                 self.query_with_connection(sql, connection, commit=False)
                 logger.info(f"Table {table_name} created.")
 
-            # Chunk tables in batches of 1K rows, though this can be tuned and
-            # optimized further.
-            for t in tbl.chunk(chunk_size):
-                sql = self._insert_statement(t, table_name)
-                self.query_with_connection(sql, connection, commit=False)
+            if engine == "auto":
+                engine = "load_data" if self._local_infile_enabled(connection) else "insert"
+
+            if engine == "load_data":
+                self._load_data(connection, tbl, table_name)
+            else:
+                self._insert_batches(connection, tbl, table_name, chunk_size, max_batch_bytes)
+
+            logger.info(f"{tbl.num_rows} rows copied to {table_name}.")
 
-    def _insert_statement(self, tbl, table_name):
+    def _local_infile_enabled(self, connection):
+        # Whether LOAD DATA LOCAL INFILE is allowed by both the client and the server
+        if not self.allow_local_infile:
+            return False
+
+        with self.cursor(connection) as cursor:
+            cursor.execute("SELECT @@local_infile")
+            return bool(cursor.fetchone()[0])
+
+    def _insert_batches(self, connection, tbl, table_name, chunk_size, max_batch_bytes):
         """
-        Convert the table data into a string for bulk importing.
+        Insert the table with parameterized multi-row inserts, batched by size.
         """
 
-        # Single column tables
-        if len(tbl.columns) == 1:
-            values = [f"({row[0]})" for row in tbl.data]
+        placeholders = ", ".join(["%s"] * len(tbl.columns))
+        sql = f"INSERT INTO {table_name} ({','.join(tbl.columns)}) VALUES ({placeholders})"
 
-        # Multi-column tables
-        else:
-            values = [str(row) for row in tbl.data]
+        with self.cursor(connection) as cursor:
+            for batch in self._batches(tbl, chunk_size, max_batch_bytes):
+                # The connector rewrites executemany inserts as a single multi-row insert
+                cursor.executemany(sql, batch)
+                logger.debug(f"Inserted {len(batch)} rows into {table_name}.")
+
+    def _batches(self, tbl, max_rows, max_bytes):
+        # Group rows into batches of at most max_rows rows and roughly max_bytes bytes
+        batch = []
+        batch_bytes = 0
+
+        for row in tbl.data:
+            # Allow for the quotes and separator around each value
+            row_bytes = sum(value_width(value) + 3 for value in row)
+
+            if batch and (len(batch) >= max_rows or batch_bytes + row_bytes > max_bytes):
+                yield batch
+                batch = []
+                batch_bytes = 0
+
+            batch.append(tuple(row))
+            batch_bytes += row_bytes
+
+        if batch:
+            yield batch
+
+    def _load_data(self, connection, tbl, table_name):
+        """
+        Load the table with ``LOAD DATA LOCAL INFILE``, via a temp file.
+        """
+
+        path = self._write_load_data_file(tbl)
+        # Escape the path for a quoted string literal, e.g. for Windows temp paths
+        quoted_path = path.replace("\\", "\\\\").replace("'", "\\'")
+
+        try:
+            sql = f"""
+                LOAD DATA LOCAL INFILE '{quoted_path}'
+                INTO TABLE {table_name}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                LINES TERMINATED BY '\\n'
+                ({','.join(tbl.columns)})
+            """
+
+            with self.cursor(connection) as cursor:
+                cursor.execute(sql)
+        finally:
+            files.close_temp_file(path)
+
+    def _write_load_data_file(self, tbl):
+        """
+        Write the table to a tab-separated temp file, escaped for ``LOAD DATA``.
+        """
+
+        path = files.create_temp_file(suffix=".tsv")
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for row in tbl.data:
+                f.write("\t".join(self._load_data_value(value) for value in row))
+                f.write("\n")
 
-        # Create full insert statement
-        sql = f"""INSERT INTO {table_name}
-                  ({','.join(tbl.columns)})
-                  VALUES {",".join(values)};"""
+        return path
 
-        return sql
+    @staticmethod
+    def _load_data_value(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "1" if value else "0"
+        return str(value).translate(LOAD_DATA_ESCAPES)
 
     def _create_table_precheck(self, connection, table_name, if_exists):
         """
@@ -1,10 +1,14 @@
 from parsons.databases.postgres.postgres_core import PostgresCore
+from parsons.databases.postgres.copy_stream import binary_copy_stream, csv_copy_stream
 from parsons.databases.table import BaseTable
 from parsons.databases.alchemy import Alchemy
+from parsons.databases.connection_pool import ConnectionPool, ping_connection, reset_session
 from parsons.databases.database_connector import DatabaseConnector
 from parsons.etl.table import Table
 import logging
 import os
+import uuid
+import psycopg2
 
 
 logger = logging.getLogger(__name__)
@@ -28,9 +32,27 @@ class Postgres(PostgresCore, Alchemy, DatabaseConnector):
             Required if env variable ``PGPORT`` not populated.
         timeout: int
             Seconds to timeout if connection not established.
+        pool_size: int
+            If set, connections are reused from a thread-safe pool holding up to this many
+            connections, rather than opened and closed for every query.
+        pool_max_idle_time: int
+            Seconds a pooled connection may sit unused before it is closed.
+        pool_max_lifetime: int
+            Seconds after which a pooled connection is closed rather than reused.
     """
 
-    def __init__(self, username=None, password=None, host=None, db=None, port=5432, timeout=10):
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        host=None,
+        db=None,
+        port=5432,
+        timeout=10,
+        pool_size=None,
+        pool_max_idle_time=300,
+        pool_max_lifetime=3600,
+    ):
         super().__init__()
 
         self.username = username or os.environ.get("PGUSER")
@@ -52,16 +74,34 @@ class Postgres(PostgresCore, Alchemy, DatabaseConnector):
         self.timeout = timeout
         self.dialect = "postgres"
 
+        self.pool = None
+        if pool_size:
+            self.pool = ConnectionPool(
+                self._create_connection,
+                max_size=pool_size,
+                max_idle_time=pool_max_idle_time,
+                max_lifetime=pool_max_lifetime,
+                health_check=ping_connection,
+                # Discard anything left uncommitted, and any session changes such as
+                # autocommit, before the connection is reused
+                reset=reset_session,
+            )
+
     def copy(
         self,
         tbl: Table,
         table_name: str,
         if_exists: str = "fail",
         strict_length: bool = False,
+        type_inference: str = "exact",
+        copy_format: str = "csv",
     ):
         """
         Copy a :ref:`parsons-table` to Postgres.
 
+        The table is streamed to Postgres as it is read, without being written to a file
+        first.
+
         `Args:`
             tbl: parsons.Table
                 A Parsons table object
@@ -75,23 +115,204 @@ class Postgres(PostgresCore, Alchemy, DatabaseConnector):
                 the created table's column sizes will be sized to exactly fit the current data,
                 or if their size will be rounded up to account for future values being larger
                 then the current dataset. Defaults to ``False``.
+            type_inference: str
+                How column types are detected if the table needs to be created. ``exact``
+                checks every value. ``parallel`` also checks every value, spread across a
+                process per CPU if there is more than one, which can be faster for very large
+                tables. ``sample`` only checks a random sample of rows and widens the detected
+                types; if the COPY then fails, it is rolled back and retried once with
+                ``exact`` inference.
+            copy_format: str
+                Either ``csv`` or ``binary``. ``binary`` sends values in Postgres' binary
+                format, which is faster to load, but every column of the table must exist in
+                the destination and hold values that can be converted to its type (e.g. ints
+                or numeric strings for an ``integer`` column).
         """
 
+        if copy_format not in ("csv", "binary"):
+            raise ValueError("copy_format must be either csv or binary")
+
+        sampled_types = False
+        retry_exact = False
+
         with self.connection() as connection:
             # Auto-generate table
             if self._create_table_precheck(connection, table_name, if_exists):
                 # Create the table
                 # To Do: Pass in the advanced configuration parameters.
-                sql = self.create_statement(tbl, table_name, strict_length=strict_length)
+                sql = self.create_statement(
+                    tbl, table_name, strict_length=strict_length, type_inference=type_inference
+                )
+                sampled_types = type_inference == "sample"
 
                 self.query_with_connection(sql, connection, commit=False)
                 logger.info(f"{table_name} created.")
 
-            sql = f"COPY {table_name} FROM STDIN CSV HEADER;"
+            try:
+                with self.cursor(connection) as cursor:
+                    if copy_format == "binary":
+                        names, column_types = self._get_column_types(
+                            cursor, table_name, tbl.columns
+                        )
+                        columns = ", ".join(f'"{name}"' for name in names)
+                        sql = f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT binary);"
+                        cursor.execute("SHOW TimeZone")
+                        time_zone = cursor.fetchone()[0]
+                        stream = binary_copy_stream(tbl, column_types, time_zone)
+                    else:
+                        sql = f"COPY {table_name} FROM STDIN CSV HEADER;"
+                        stream = csv_copy_stream(tbl)
+
+                    cursor.copy_expert(sql, stream)
+                    logger.info(f"{tbl.num_rows} rows copied to {table_name}.")
+
+            except psycopg2.Error:
+                if not sampled_types:
+                    raise
+
+                # The data didn't fit the types detected from a sample. Undo the create and
+                # try again, checking every value.
+                logger.info(
+                    f"Copy to {table_name} failed using column types from a sample. "
+                    "Retrying with exact type inference."
+                )
+                connection.rollback()
+                retry_exact = True
+
+        if retry_exact:
+            self.copy(
+                tbl,
+                table_name,
+                if_exists=if_exists,
+                strict_length=strict_length,
+                copy_format=copy_format,
+            )
+
+    def upsert(self, tbl, target_table, primary_key, batch_size=None, **copy_args):
+        """
+        Upsert a :ref:`parsons-table` into an existing table: rows whose primary key is
+        already in the table are updated, and the rest are inserted.
+
+        Each batch of rows is copied into a temp table and then merged into the target with
+        one ``INSERT ... ON CONFLICT DO UPDATE``. All batches run in a single transaction.
+
+        The primary key column(s) must have a unique constraint or index in the target
+        table, and each primary key may only appear once in the Parsons table.
+
+        `Args:`
+            tbl: parsons.Table
+                A Parsons table object
+            target_table: str
+                The destination schema and table (e.g. ``my_schema.my_table``)
+            primary_key: str or list
+                The primary key column(s) of the target table
+            batch_size: int
+                The number of rows to merge at a time. By default, all rows are merged at
+                once. Smaller batches keep the temp table small for very large tables.
+            \**copy_args: kwargs
+                If the target table doesn't exist, it is created with
+                :func:`~parsons.databases.Postgres.copy`, and these are passed to it.
+        `Returns:`
+            dict
+                The number of rows ``inserted`` and ``updated``
+        """  # noqa: W605
+
+        if isinstance(primary_key, str):
+            primary_keys = [primary_key]
+        else:
+            primary_keys = primary_key
+
+        if not self.table_exists(target_table):
+            logger.info("Target table does not exist. Copying into newly created target table.")
+            self.copy(tbl, target_table, **copy_args)
+            return {"inserted": tbl.num_rows, "updated": 0}
+
+        columns = ", ".join(tbl.columns)
+        update_columns = [c for c in tbl.columns if c not in primary_keys]
+
+        if update_columns:
+            conflict_action = "DO UPDATE SET " + ", ".join(
+                f"{c} = EXCLUDED.{c}" for c in update_columns
+            )
+        else:
+            conflict_action = "DO NOTHING"
+
+        # Temp tables are only visible to this connection, and are dropped with the
+        # transaction. Selecting the columns rather than using LIKE leaves out constraints.
+        temp_table = f"parsons_upsert_{uuid.uuid4().hex}"
+        create_sql = f"""
+            CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS
+            SELECT {columns} FROM {target_table} WITH NO DATA;
+        """
+
+        # Inserted rows are new row versions that have never been locked, so xmax is 0
+        upsert_sql = f"""
+            WITH upserted AS (
+                INSERT INTO {target_table} ({columns})
+                SELECT {columns} FROM {temp_table}
+                ON CONFLICT ({", ".join(primary_keys)}) {conflict_action}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                count(*) FILTER (WHERE inserted) AS inserted,
+                count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM upserted;
+        """
+
+        batches = tbl.iter_chunks(batch_size) if batch_size else [tbl]
+        counts = {"inserted": 0, "updated": 0}
 
+        with self.connection() as connection:
             with self.cursor(connection) as cursor:
-                cursor.copy_expert(sql, open(tbl.to_csv(), "r"))
-                logger.info(f"{tbl.num_rows} rows copied to {table_name}.")
+                cursor.execute(create_sql)
+
+                for batch in batches:
+                    cursor.execute(f"TRUNCATE {temp_table};")
+                    cursor.copy_expert(
+                        f"COPY {temp_table} ({columns}) FROM STDIN CSV HEADER;",
+                        csv_copy_stream(batch),
+                    )
+
+                    cursor.execute(upsert_sql)
+                    inserted, updated = cursor.fetchone()
+                    counts["inserted"] += inserted
+                    counts["updated"] += updated
+
+                    logger.debug(
+                        f"Upserted a batch into {target_table}: {inserted} inserted, "
+                        f"{updated} updated."
+                    )
+
+        logger.info(
+            f"Upserted into {target_table}: {counts['inserted']} rows inserted, "
+            f"{counts['updated']} rows updated."
+        )
+        return counts
+
+    def _get_column_types(self, cursor, table_name, columns):
+        # Get the name and type in the table of each of the columns, in the given order.
+        # Column names are matched case-insensitively if there isn't an exact match, since
+        # created tables have lowercase column names.
+        cursor.execute(
+            """
+            select attname, atttypid::regtype::text
+            from pg_attribute
+            where attrelid = %s::regclass and attnum > 0 and not attisdropped
+            order by attnum
+            """,
+            (table_name,),
+        )
+        table_types = dict(cursor.fetchall())
+        lower_names = {name.lower(): name for name in table_types}
+
+        names = []
+        for column in columns:
+            name = column if column in table_types else lower_names.get(column.lower())
+            if name is None:
+                raise ValueError(f"Column {column} is not in {table_name}")
+            names.append(name)
+
+        return names, [table_types[name] for name in names]
 
     def table(self, table_name):
         # Return a Postgres table object
@@ -1,11 +1,12 @@
 from contextlib import contextmanager
+import itertools
+import uuid
 from typing import Optional
 import psycopg2
 import psycopg2.extras
 from parsons.etl.table import Table
-from parsons.utilities import files
-import pickle
-import petl
+from parsons.etl.spill import SpillWriter
+from parsons.utilities.sql_helpers import fetch_batches
 import logging
 from parsons.databases.postgres.postgres_create_statement import PostgresCreateStatement
 
@@ -29,19 +30,17 @@ class PostgresCore(PostgresCreateStatement):
         any context manager):
         ``with pg.connection() as conn:``
 
+        If the connector was created with a ``pool_size``, the connection is borrowed from
+        the connection pool and returned to it, rather than closed, at the end of the block.
+
         `Returns:`
             Psycopg2 `connection` object
         """
 
-        # Create a psycopg2 connection and cursor
-        conn = psycopg2.connect(
-            user=self.username,
-            password=self.password,
-            host=self.host,
-            dbname=self.db,
-            port=self.port,
-            connect_timeout=self.timeout,
-        )
+        if self.pool is not None:
+            conn = self.pool.acquire()
+        else:
+            conn = self._create_connection()
 
         try:
             yield conn
@@ -51,7 +50,21 @@ class PostgresCore(PostgresCreateStatement):
         else:
             conn.commit()
         finally:
-            conn.close()
+            if self.pool is not None:
+                self.pool.release(conn)
+            else:
+                conn.close()
+
+    def _create_connection(self):
+        # Create a psycopg2 connection
+        return psycopg2.connect(
+            user=self.username,
+            password=self.password,
+            host=self.host,
+            dbname=self.db,
+            port=self.port,
+            connect_timeout=self.timeout,
+        )
 
     @contextmanager
     def cursor(self, connection):
@@ -62,7 +75,39 @@ class PostgresCore(PostgresCreateStatement):
         finally:
             cur.close()
 
-    def query(self, sql: str, parameters: Optional[list] = None) -> Optional[Table]:
+    @contextmanager
+    def server_cursor(self, connection, itersize=QUERY_BATCH_SIZE):
+        """
+        Generate a named, server-side cursor. Rows are only sent to the client as they are
+        fetched, rather than all at once when the query is executed. Server-side cursors can
+        only be used for queries that return rows (e.g. ``SELECT``).
+
+        `Args:`
+            connection: obj
+                A connection object obtained from ``connection()``
+            itersize: int
+                The number of rows to fetch from the server at a time
+        `Returns:`
+            Psycopg2 ``cursor`` object
+        """
+
+        cur = connection.cursor(
+            name=f"parsons_{uuid.uuid4().hex}", cursor_factory=psycopg2.extras.DictCursor
+        )
+        cur.itersize = itersize
+
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def query(
+        self,
+        sql: str,
+        parameters: Optional[list] = None,
+        stream: bool = False,
+        itersize: int = QUERY_BATCH_SIZE,
+    ) -> Optional[Table]:
         """
         Execute a query against the database. Will return ``None`` if the query returns zero rows.
 
@@ -93,6 +138,11 @@ class PostgresCore(PostgresCreateStatement):
                 A valid SQL statement
             parameters: list
                 A list of python variables to be converted into SQL values in your query
+            stream: boolean
+                Fetch the results through a server-side cursor, so that only ``itersize``
+                rows are held in memory at a time. Only valid for queries that return rows.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
@@ -101,9 +151,19 @@ class PostgresCore(PostgresCreateStatement):
         """  # noqa: E501
 
         with self.connection() as connection:
-            return self.query_with_connection(sql, connection, parameters=parameters)
-
-    def query_with_connection(self, sql, connection, parameters=None, commit=True):
+            return self.query_with_connection(
+                sql, connection, parameters=parameters, stream=stream, itersize=itersize
+            )
+
+    def query_with_connection(
+        self,
+        sql,
+        connection,
+        parameters=None,
+        commit=True,
+        stream=False,
+        itersize=QUERY_BATCH_SIZE,
+    ):
         """
         Execute a query against the database, with an existing connection. Useful for batching
         queries together. Will return ``None`` if the query returns zero rows.
@@ -119,52 +179,96 @@ class PostgresCore(PostgresCreateStatement):
                 Whether to commit the transaction immediately. If ``False`` the transaction will
                 be committed when the connection goes out of scope and is closed (or you can
                 commit manually with ``connection.commit()``).
+            stream: boolean
+                Fetch the results through a server-side cursor, so that only ``itersize``
+                rows are held in memory at a time. Only valid for queries that return rows.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
                 See :ref:`parsons-table` for output options.
         """
 
-        with self.cursor(connection) as cursor:
+        if stream:
+            cursor_context = self.server_cursor(connection, itersize=itersize)
+            batch_size = itersize
+        else:
+            cursor_context = self.cursor(connection)
+            batch_size = QUERY_BATCH_SIZE
+
+        with cursor_context as cursor:
 
             logger.debug(f"SQL Query: {sql}")
             cursor.execute(sql, parameters)
 
-            if commit:
+            # A server-side cursor only describes its results once rows have been fetched,
+            # and is closed by a commit, so with one we commit after reading the results.
+            batches = fetch_batches(cursor, batch_size)
+            first_batch = next(batches, [])
+
+            if commit and not stream:
                 connection.commit()
 
             # If the cursor is empty, don't cause an error
             if not cursor.description:
                 logger.debug("Query returned 0 rows")
-                return None
+                final_tbl = None
 
             else:
 
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches and write them to a spill file in blocks.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
 
-                temp_file = files.create_temp_file()
-
-                with open(temp_file, "wb") as f:
-                    # Grab the header
-                    header = [i[0] for i in cursor.description]
-                    pickle.dump(header, f)
-
-                    while True:
-                        batch = cursor.fetchmany(QUERY_BATCH_SIZE)
-                        if not batch:
-                            break
+                header = [i[0] for i in cursor.description]
 
+                with SpillWriter(header) as writer:
+                    for batch in itertools.chain([first_batch], batches):
                         logger.debug(f"Fetched {len(batch)} rows.")
-                        for row in batch:
-                            pickle.dump(list(row), f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(writer.view())
 
                 logger.debug(f"Query returned {final_tbl.num_rows} rows.")
-                return final_tbl
+
+        if commit and stream:
+            connection.commit()
+
+        return final_tbl
+
+    def query_batches(self, sql, parameters=None, itersize=QUERY_BATCH_SIZE):
+        """
+        Execute a query through a server-side cursor and yield the results in batches, so
+        that only one batch is held in memory at a time. Only valid for queries that return
+        rows.
+
+        .. code-block:: python
+
+            for batch in pg.query_batches("SELECT * FROM my_table", itersize=50000):
+                batch.to_csv(...)
+
+        `Args:`
+            sql: str
+                A valid SQL statement
+            parameters: list
+                A list of python variables to be converted into SQL values in your query
+            itersize: int
+                The maximum number of rows in each batch
+        `Returns:`
+            Generator of Parsons Tables
+        """
+
+        with self.connection() as connection:
+            with self.server_cursor(connection, itersize=itersize) as cursor:
+                logger.debug(f"SQL Query: {sql}")
+                cursor.execute(sql, parameters)
+
+                for batch in fetch_batches(cursor, itersize):
+                    header = [i[0] for i in cursor.description]
+                    logger.debug(f"Fetched {len(batch)} rows.")
+                    yield Table([header] + [list(row) for row in batch])
 
     def _create_table_precheck(self, connection, table_name, if_exists):
         """
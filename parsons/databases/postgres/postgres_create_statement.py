@@ -1,11 +1,13 @@
 from parsons.databases.database.database import DatabaseCreateStatement
 import parsons.databases.postgres.constants as consts
 
-import petl
 import logging
 
 logger = logging.getLogger(__name__)
 
+# The number of rows to look at when inferring column types from a sample
+TYPE_INFERENCE_SAMPLE_SIZE = 10000
+
 
 class PostgresCreateStatement(DatabaseCreateStatement):
     def __init__(self):
@@ -53,6 +55,8 @@ class PostgresCreateStatement(DatabaseCreateStatement):
         varchar_truncate=True,
         columntypes=None,
         strict_length=True,
+        type_inference="exact",
+        sample_size=TYPE_INFERENCE_SAMPLE_SIZE,
     ):
         # Generate a table create statement. Distkeys and sortkeys are only used by
         # Redshift and should not be passed when generating a create statement for
@@ -62,13 +66,16 @@ class PostgresCreateStatement(DatabaseCreateStatement):
             raise ValueError("Table is empty. Must have 1 or more rows.")
 
         # Validate and rename column names if needed
-        tbl.table = petl.setheader(tbl.table, self.column_name_validate(tbl.columns))
+        tbl.set_header(self.column_name_validate(tbl.columns))
 
-        mapping = self.generate_data_types(tbl)
+        mapping = self.generate_data_types(
+            tbl, type_inference=type_inference, sample_size=sample_size
+        )
 
         if padding:
             mapping["longest"] = self.vc_padding(mapping, padding)
-        elif not strict_length:
+        elif not strict_length or type_inference == "sample":
+            # Widths from a sample may understate the widest value, so always leave room
             mapping["longest"] = self.vc_step(mapping)
 
         if varchar_max:
@@ -99,33 +106,37 @@ class PostgresCreateStatement(DatabaseCreateStatement):
     def is_valid_integer(self, val):
         return self.is_valid_sql_num(val)
 
-    def generate_data_types(self, table):
-        # Generate column data types
-
-        longest, type_list = [], []
-
-        cont = petl.records(table.table)
-
-        # Populate empty values for the columns
-        for col in table.columns:
-            longest.append(0)
-            type_list.append("")
+    def _fold_column_type(self, values, current_type):
+        # NA is the csv null value
+        return self.detect_column_type(values, skip_values=["NA", ""], current_type=current_type)
 
-        for row in cont:
-            for i in range(len(row)):
-                # NA is the csv null value
-                if type_list[i] == "varchar" or row[i] in ["NA", ""]:
-                    pass
-                else:
-                    var_type = self.data_type(row[i], type_list[i])
-                    type_list[i] = var_type
-
-                # Calculate width
-                width = len(str(row[i]).encode("utf-8"))
-                if width > longest[i]:
-                    longest[i] = width
-
-        # In L140 'NA' and '' will be skipped
+    def generate_data_types(
+        self, table, type_inference="exact", sample_size=TYPE_INFERENCE_SAMPLE_SIZE
+    ):
+        # Generate column data types and widths.
+        #
+        # ``exact`` inference uses the table's column profile, which reads the table once
+        # for all columns, checking each column a block of values at a time, and is reused by
+        # later calls. ``parallel`` is also exact, but
+        # shards the rows across worker processes. ``sample`` only looks at a random sample
+        # of rows, and widens integer types to allow for values outside of the sample.
+
+        if type_inference == "exact":
+            profile = table.get_column_profile(block_folds={"postgres": self._fold_column_type})
+            type_list = profile.folds["postgres"]
+            longest = list(profile.max_widths)
+        elif type_inference == "parallel":
+            type_list, longest = self.infer_types_parallel(table, skip_values=["NA", ""])
+        elif type_inference == "sample":
+            type_list, longest = self.infer_types_sample(table, sample_size, skip_values=["NA", ""])
+            type_list = [self.BIGINT if typ in self.INT_TYPES else typ for typ in type_list]
+        else:
+            raise ValueError(
+                f"Invalid type_inference: {type_inference}. "
+                "Must be one of exact, parallel or sample."
+            )
+
+        # 'NA' and '' are skipped when detecting types.
         # If the entire column is either one of those (or a mix of the two)
         # the type will be empty.
         # Fill with a default varchar
@@ -1,32 +1,80 @@
 from typing import List, Optional
 from parsons.etl.table import Table
-from parsons.databases.redshift.rs_copy_table import RedshiftCopyTable
+from parsons.etl.spill import SpillWriter
+from parsons.databases.redshift.rs_copy_table import RedshiftCopyTable, S3_TEMP_KEY_PREFIX
 from parsons.databases.redshift.rs_create_table import RedshiftCreateTable
 from parsons.databases.redshift.rs_table_utilities import RedshiftTableUtilities
 from parsons.databases.redshift.rs_schema import RedshiftSchema
 from parsons.databases.table import BaseTable
 from parsons.databases.alchemy import Alchemy
+from parsons.databases.connection_pool import ConnectionPool, ping_connection, reset_session
 from parsons.utilities import files, sql_helpers
 from parsons.databases.database_connector import DatabaseConnector
+from parsons.aws.s3 import S3
+import csv
+import gzip
+import petl
 import psycopg2
 import psycopg2.extras
 import os
 import logging
 import json
-import pickle
-import petl
 from contextlib import contextmanager
 import datetime
+import itertools
 import random
+import uuid
 
 # Max number of rows that we query at a time, so we can avoid loading huge
 # data sets into memory.
 # 100k rows per batch at ~1k bytes each = ~100MB per batch.
 QUERY_BATCH_SIZE = 100000
 
+# The most UNLOAD part files downloaded at once by ``query_to_table``
+MAX_CONCURRENT_DOWNLOADS = 8
+
 logger = logging.getLogger(__name__)
 
 
+class UnloadView(petl.Table):
+    """
+    A lazy petl table that reads the gzipped part files written by ``Redshift.unload``
+    with its default options, one after another, decompressing them as they are read.
+
+    `Args:`
+        paths: list
+            Local paths of the part files. Each starts with a header row.
+        delimiter: str
+            The field delimiter used by the unload
+    """
+
+    def __init__(self, paths, delimiter="|"):
+        self.paths = paths
+        self.delimiter = delimiter
+
+    def __iter__(self):
+        header = None
+
+        for path in self.paths:
+            with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+                # Matches the ADDQUOTES and ESCAPE unload options
+                reader = csv.reader(f, delimiter=self.delimiter, escapechar="\\", doublequote=False)
+
+                part_header = next(reader, None)
+                if part_header is None:
+                    continue
+
+                if header is None:
+                    header = tuple(part_header)
+                    yield header
+
+                for row in reader:
+                    yield tuple(row)
+
+        if header is None:
+            yield ()
+
+
 class Redshift(
     RedshiftCreateTable,
     RedshiftCopyTable,
@@ -70,6 +118,13 @@ class Redshift(
             Controls use of the ``AWS_SESSION_TOKEN`` environment variable for S3. Defaults
             to ``True``. Set to ``False`` in order to ignore the ``AWS_SESSION_TOKEN`` environment
             variable even if the ``aws_session_token`` argument was not passed in.
+        pool_size: int
+            If set, connections are reused from a thread-safe pool holding up to this many
+            connections, rather than opened and closed for every query.
+        pool_max_idle_time: int
+            Seconds a pooled connection may sit unused before it is closed.
+        pool_max_lifetime: int
+            Seconds after which a pooled connection is closed rather than reused.
     """
 
     def __init__(
@@ -85,6 +140,9 @@ class Redshift(
         aws_secret_access_key=None,
         iam_role=None,
         use_env_token=True,
+        pool_size=None,
+        pool_max_idle_time=300,
+        pool_max_lifetime=3600,
     ):
         super().__init__()
 
@@ -114,6 +172,19 @@ class Redshift(
         self.aws_secret_access_key = aws_secret_access_key
         self.iam_role = iam_role
 
+        self.pool = None
+        if pool_size:
+            self.pool = ConnectionPool(
+                self._create_connection,
+                max_size=pool_size,
+                max_idle_time=pool_max_idle_time,
+                max_lifetime=pool_max_lifetime,
+                health_check=ping_connection,
+                # Discard anything left uncommitted, and any session changes such as
+                # autocommit, before the connection is reused
+                reset=reset_session,
+            )
+
     @contextmanager
     def connection(self):
         """
@@ -125,12 +196,31 @@ class Redshift(
         any context manager):
         ``with rs.connection() as conn:``
 
+        If the connector was created with a ``pool_size``, the connection is borrowed from
+        the connection pool and returned to it, rather than closed, at the end of the block.
+
         `Returns:`
             Psycopg2 ``connection`` object
         """
 
-        # Create a psycopg2 connection and cursor
-        conn = psycopg2.connect(
+        if self.pool is not None:
+            conn = self.pool.acquire()
+        else:
+            conn = self._create_connection()
+
+        try:
+            yield conn
+
+            conn.commit()
+        finally:
+            if self.pool is not None:
+                self.pool.release(conn)
+            else:
+                conn.close()
+
+    def _create_connection(self):
+        # Create a psycopg2 connection
+        return psycopg2.connect(
             user=self.username,
             password=self.password,
             host=self.host,
@@ -138,12 +228,6 @@ class Redshift(
             port=self.port,
             connect_timeout=self.timeout,
         )
-        try:
-            yield conn
-
-            conn.commit()
-        finally:
-            conn.close()
 
     @contextmanager
     def cursor(self, connection):
@@ -153,7 +237,38 @@ class Redshift(
         finally:
             cur.close()
 
-    def query(self, sql: str, parameters: Optional[list] = None) -> Optional[Table]:
+    @contextmanager
+    def server_cursor(self, connection, itersize=QUERY_BATCH_SIZE):
+        """
+        Generate a named, server-side cursor. Rows are only sent to the client as they are
+        fetched, rather than all at once when the query is executed. Server-side cursors can
+        only be used for queries that return rows (e.g. ``SELECT``).
+
+        `Args:`
+            connection: obj
+                A connection object obtained from ``redshift.connection()``
+            itersize: int
+                The number of rows to fetch from the server at a time
+        `Returns:`
+            Psycopg2 ``cursor`` object
+        """
+
+        cur = connection.cursor(
+            name=f"parsons_{uuid.uuid4().hex}", cursor_factory=psycopg2.extras.DictCursor
+        )
+        cur.itersize = itersize
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def query(
+        self,
+        sql: str,
+        parameters: Optional[list] = None,
+        stream: bool = False,
+        itersize: int = QUERY_BATCH_SIZE,
+    ) -> Optional[Table]:
         """
         Execute a query against the Redshift database. Will return ``None``
         if the query returns zero rows.
@@ -185,6 +300,11 @@ class Redshift(
                 A valid SQL statement
             parameters: list
                 A list of python variables to be converted into SQL values in your query
+            stream: boolean
+                Fetch the results through a server-side cursor, so that only ``itersize``
+                rows are held in memory at a time. Only valid for queries that return rows.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
@@ -193,9 +313,19 @@ class Redshift(
         """  # noqa: E501
 
         with self.connection() as connection:
-            return self.query_with_connection(sql, connection, parameters=parameters)
+            return self.query_with_connection(
+                sql, connection, parameters=parameters, stream=stream, itersize=itersize
+            )
 
-    def query_with_connection(self, sql, connection, parameters=None, commit=True):
+    def query_with_connection(
+        self,
+        sql,
+        connection,
+        parameters=None,
+        commit=True,
+        stream=False,
+        itersize=QUERY_BATCH_SIZE,
+    ):
         """
         Execute a query against the Redshift database, with an existing connection.
         Useful for batching queries together. Will return ``None`` if the query
@@ -212,6 +342,11 @@ class Redshift(
                 Whether to commit the transaction immediately. If ``False`` the transaction will
                 be committed when the connection goes out of scope and is closed (or you can
                 commit manually with ``connection.commit()``).
+            stream: boolean
+                Fetch the results through a server-side cursor, so that only ``itersize``
+                rows are held in memory at a time. Only valid for queries that return rows.
+            itersize: int
+                The number of rows to fetch at a time when ``stream`` is ``True``
 
         `Returns:`
             Parsons Table
@@ -221,45 +356,85 @@ class Redshift(
         # To Do: Have it return an ordered dict to return the
         #        rows in the correct order
 
-        with self.cursor(connection) as cursor:
+        if stream:
+            cursor_context = self.server_cursor(connection, itersize=itersize)
+            batch_size = itersize
+        else:
+            cursor_context = self.cursor(connection)
+            batch_size = QUERY_BATCH_SIZE
+
+        with cursor_context as cursor:
             if "credentials" not in sql:
                 logger.debug(f"SQL Query: {sql}")
             cursor.execute(sql, parameters)
 
-            if commit:
+            # A server-side cursor only describes its results once rows have been fetched,
+            # and is closed by a commit, so with one we commit after reading the results.
+            batches = sql_helpers.fetch_batches(cursor, batch_size)
+            first_batch = next(batches, [])
+
+            if commit and not stream:
                 connection.commit()
 
             # If the cursor is empty, don't cause an error
             if not cursor.description:
                 logger.debug("Query returned 0 rows")
-                return None
+                final_tbl = None
 
             else:
-                # Fetch the data in batches, and "pickle" the rows to a temp file.
+                # Fetch the data in batches and write them to a spill file in blocks.
                 # (We pickle rather than writing to, say, a CSV, so that we maintain
                 # all the type information for each field.)
 
-                temp_file = files.create_temp_file()
-
-                with open(temp_file, "wb") as f:
-                    # Grab the header
-                    header = [i[0] for i in cursor.description]
-                    pickle.dump(header, f)
-
-                    while True:
-                        batch = cursor.fetchmany(QUERY_BATCH_SIZE)
-                        if not batch:
-                            break
+                header = [i[0] for i in cursor.description]
 
+                with SpillWriter(header) as writer:
+                    for batch in itertools.chain([first_batch], batches):
                         logger.debug(f"Fetched {len(batch)} rows.")
-                        for row in batch:
-                            pickle.dump(list(row), f)
+                        writer.write_rows(batch)
 
                 # Load a Table from the file
-                final_tbl = Table(petl.frompickle(temp_file))
+                final_tbl = Table(writer.view())
 
                 logger.debug(f"Query returned {final_tbl.num_rows} rows.")
-                return final_tbl
+
+        if commit and stream:
+            connection.commit()
+
+        return final_tbl
+
+    def query_batches(self, sql, parameters=None, itersize=QUERY_BATCH_SIZE):
+        """
+        Execute a query through a server-side cursor and yield the results in batches, so
+        that only one batch is held in memory at a time. Only valid for queries that return
+        rows.
+
+        .. code-block:: python
+
+            for batch in rs.query_batches("SELECT * FROM my_table", itersize=50000):
+                batch.to_csv(...)
+
+        `Args:`
+            sql: str
+                A valid SQL statement
+            parameters: list
+                A list of python variables to be converted into SQL values in your query
+            itersize: int
+                The maximum number of rows in each batch
+        `Returns:`
+            Generator of Parsons Tables
+        """
+
+        with self.connection() as connection:
+            with self.server_cursor(connection, itersize=itersize) as cursor:
+                if "credentials" not in sql:
+                    logger.debug(f"SQL Query: {sql}")
+                cursor.execute(sql, parameters)
+
+                for batch in sql_helpers.fetch_batches(cursor, itersize):
+                    header = [i[0] for i in cursor.description]
+                    logger.debug(f"Fetched {len(batch)} rows.")
+                    yield Table([header] + [list(row) for row in batch])
 
     def copy_s3(
         self,
@@ -497,6 +672,8 @@ class Redshift(
         temp_bucket_region: Optional[str] = None,
         strict_length: bool = True,
         csv_encoding: str = "utf-8",
+        num_files=1,
+        type_inference: str = "exact",
     ):
         """
         Copy a :ref:`parsons-table` to Redshift.
@@ -610,6 +787,20 @@ class Redshift(
             csv_ecoding: str
                 String encoding to use when writing the temporary CSV file that is uploaded to S3.
                 Defaults to 'utf-8'.
+            num_files: int or str
+                The number of compressed files to split the table into before uploading it to
+                S3. Redshift loads each compressed file on a single slice, so splitting a large
+                table into one or more files per slice lets the whole cluster share the load.
+                The files are compressed and uploaded concurrently and loaded through a
+                manifest. ``auto`` uses one file per slice in the cluster. Defaults to ``1``,
+                which uploads a single file; small tables don't benefit from being split.
+            type_inference: str
+                How column types are detected when the table is created. ``exact`` checks
+                every value. ``parallel`` also checks every value, spread across a process
+                per CPU if there is more than one, which can be faster for very large
+                tables. ``sample`` only checks a random
+                sample of rows and widens the detected types; if the COPY then fails, the
+                load is rolled back and retried once with ``exact`` inference.
 
         `Returns`
             Parsons Table or ``None``
@@ -622,6 +813,9 @@ class Redshift(
         else:
             cols = None
 
+        sampled_types = False
+        retry_exact = False
+
         with self.connection() as connection:
             # Check to see if the table exists. If it does not or if_exists = drop, then
             # create the new table.
@@ -639,7 +833,9 @@ class Redshift(
                         varchar_max=varchar_max,
                         columntypes=columntypes,
                         strict_length=strict_length,
+                        type_inference=type_inference,
                     )
+                    sampled_types = type_inference == "sample"
                 self.query_with_connection(sql, connection, commit=False)
                 logger.info(f"{table_name} created.")
 
@@ -650,13 +846,28 @@ class Redshift(
                     tbl, table_name, drop_dependencies=alter_table_cascade
                 )
 
+            if num_files == "auto":
+                num_files = self.get_slice_count(connection)
+
             # Upload the table to S3
-            key = self.temp_s3_copy(
-                tbl,
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                csv_encoding=csv_encoding,
-            )
+            if num_files > 1 and tbl.num_rows > 1:
+                key, cleanup_keys = self.temp_s3_copy_sliced(
+                    tbl,
+                    num_files,
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    csv_encoding=csv_encoding,
+                )
+                manifest = True
+            else:
+                key = self.temp_s3_copy(
+                    tbl,
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    csv_encoding=csv_encoding,
+                )
+                cleanup_keys = key
+                manifest = False
 
             try:
                 # Copy to Redshift database.
@@ -678,6 +889,7 @@ class Redshift(
                     "aws_secret_access_key": aws_secret_access_key,
                     "compression": "gzip",
                     "bucket_region": temp_bucket_region,
+                    "manifest": manifest,
                 }
 
                 # Copy from S3 to Redshift
@@ -689,10 +901,59 @@ class Redshift(
 
                 logger.info(f"Data copied to {table_name}.")
 
+            except psycopg2.Error:
+                if not sampled_types:
+                    raise
+
+                # The data didn't fit the types detected from a sample. Undo the create and
+                # try again, checking every value.
+                logger.info(
+                    f"Copy to {table_name} failed using column types from a sample. "
+                    "Retrying with exact type inference."
+                )
+                connection.rollback()
+                retry_exact = True
+
             # Clean up the S3 bucket.
             finally:
                 if key and cleanup_s3_file:
-                    self.temp_s3_delete(key)
+                    self.temp_s3_delete(cleanup_keys)
+
+        if retry_exact:
+            return self.copy(
+                tbl,
+                table_name,
+                if_exists=if_exists,
+                max_errors=max_errors,
+                distkey=distkey,
+                sortkey=sortkey,
+                padding=padding,
+                statupdate=statupdate,
+                compupdate=compupdate,
+                acceptanydate=acceptanydate,
+                emptyasnull=emptyasnull,
+                blanksasnull=blanksasnull,
+                nullas=nullas,
+                acceptinvchars=acceptinvchars,
+                dateformat=dateformat,
+                timeformat=timeformat,
+                varchar_max=varchar_max,
+                truncatecolumns=truncatecolumns,
+                columntypes=columntypes,
+                specifycols=specifycols,
+                alter_table=alter_table,
+                alter_table_cascade=alter_table_cascade,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                iam_role=iam_role,
+                cleanup_s3_file=cleanup_s3_file,
+                template_table=template_table,
+                temp_bucket_region=temp_bucket_region,
+                strict_length=strict_length,
+                csv_encoding=csv_encoding,
+                num_files=num_files,
+                type_inference="exact",
+            )
 
     def unload(
         self,
@@ -808,6 +1069,101 @@ class Redshift(
 
         return self.query(statement)
 
+    def query_to_table(
+        self,
+        sql,
+        via="query",
+        aws_access_key_id=None,
+        aws_secret_access_key=None,
+        cleanup_s3_file=True,
+    ):
+        """
+        Run a query and return its results as a Parsons Table.
+
+        With ``via="unload"``, the results are unloaded in parallel to the temp S3 bucket
+        rather than being pulled through the leader node. The part files are downloaded
+        concurrently and read lazily, so this is much faster for large results. All values
+        are returned as strings, and nulls as empty strings.
+
+        `Args:`
+            sql: str
+                A valid SQL statement that returns rows
+            via: str
+                ``query`` to run the query with :meth:`query`, or ``unload`` to export it
+                through S3
+            aws_access_key_id: str
+                An AWS access key granted to the temp bucket. Not required if keys are
+                stored as environmental variables.
+            aws_secret_access_key: str
+                An AWS secret access key granted to the temp bucket. Not required if keys
+                are stored as environmental variables.
+            cleanup_s3_file: boolean
+                The unloaded files are removed from S3 once downloaded. You can set to
+                False for debugging.
+        `Returns:`
+            Parsons Table
+                See :ref:`parsons-table` for output options.
+        """
+
+        if via == "query":
+            return self.query(sql)
+
+        if via != "unload":
+            raise ValueError(f"Invalid via: {via}. Must be query or unload.")
+
+        if not self.s3_temp_bucket:
+            raise KeyError(
+                (
+                    "Missing S3_TEMP_BUCKET, needed for transferring data from Redshift. "
+                    "Must be specified as env vars or kwargs"
+                )
+            )
+
+        aws_access_key_id = aws_access_key_id or self.aws_access_key_id
+        aws_secret_access_key = aws_secret_access_key or self.aws_secret_access_key
+
+        s3 = S3(
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            use_env_token=self.use_env_token,
+        )
+
+        key_prefix = f"{S3_TEMP_KEY_PREFIX}/unload_{uuid.uuid4().hex}/"
+        if self.s3_temp_bucket_prefix:
+            key_prefix = self.s3_temp_bucket_prefix + "/" + key_prefix
+
+        try:
+            self.unload(
+                sql,
+                self.s3_temp_bucket,
+                key_prefix,
+                manifest=True,
+                header=True,
+                delimiter="|",
+                compression="gzip",
+                add_quotes=True,
+                escape=True,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+            )
+
+            with open(s3.get_file(self.s3_temp_bucket, f"{key_prefix}manifest")) as f:
+                manifest = json.load(f)
+
+            part_keys = [entry["url"].split("/", 3)[3] for entry in manifest["entries"]]
+            logger.info(f"Downloading {len(part_keys)} unloaded files.")
+
+            paths = s3.get_files(
+                self.s3_temp_bucket, part_keys, max_workers=MAX_CONCURRENT_DOWNLOADS
+            )
+
+        finally:
+            if cleanup_s3_file:
+                for key in s3.list_keys(self.s3_temp_bucket, prefix=key_prefix):
+                    s3.remove_file(self.s3_temp_bucket, key)
+
+        return Table(UnloadView(paths))
+
     def drop_and_unload(
         self,
         rs_table,
@@ -868,6 +1224,27 @@ class Redshift(
 
         return None
 
+    def get_slice_count(self, connection=None):
+        """
+        Get the number of slices in the cluster. Loads are fastest when the number of files
+        being copied is a multiple of this.
+
+        `Args:`
+            connection: obj
+                An open connection to use. If not specified, a new connection is opened.
+        `Returns:`
+            int
+        """
+
+        sql = "select count(*) as slices from stv_slices"
+
+        if connection:
+            tbl = self.query_with_connection(sql, connection, commit=False)
+        else:
+            tbl = self.query(sql)
+
+        return tbl.first
+
     def generate_manifest(
         self,
         buckets,
@@ -960,6 +1337,7 @@ class Redshift(
         from_s3=False,
         distkey=None,
         sortkey=None,
+        strategy="delete_insert",
         **copy_args,
     ):
         """
@@ -977,8 +1355,11 @@ class Redshift(
                 Re-sorts rows and reclaims space in the specified table. You must be a table owner
                 or super user to effectively vacuum a table, however the method will not fail
                 if you lack these priviledges.
-            distinct_check: boolean
-                Check if the primary key column is distinct. Raise error if not.
+            distinct_check: boolean or str
+                Check if the primary key column is distinct. Raise error if not. ``True``
+                checks the whole target table, which means counting every row of it. Use
+                ``staged`` to only check the rows being upserted: the staging table's keys,
+                and the target rows that share them. This is much cheaper for large tables.
             cleanup_temp_table: boolean
                 A temp table is dropped by default on cleanup. You can set to False for debugging.
             alter_table: boolean
@@ -994,10 +1375,19 @@ class Redshift(
                 The column name of the distkey. If not provided, will default to ``primary_key``.
             sortkey: str or list
                 The column name(s) of the sortkey. If not provided, will default to ``primary_key``.
+            strategy: str
+                How rows are upserted from the staging table. ``delete_insert`` deletes the
+                target rows that match staged rows and inserts every staged row.
+                ``merge`` runs a single Redshift ``MERGE``, which updates matching rows in
+                place and inserts the rest. The staging table must not contain duplicate
+                keys when using ``merge``.
             \**copy_args: kwargs
                 See :func:`~parsons.databases.Redshift.copy` for options.
         """  # noqa: W605
 
+        if strategy not in ("delete_insert", "merge"):
+            raise ValueError(f"Invalid strategy: {strategy}. Must be delete_insert or merge.")
+
         if isinstance(primary_key, str):
             primary_keys = [primary_key]
         else:
@@ -1027,7 +1417,7 @@ class Redshift(
         # Generate a temp table like "table_tmp_20200210_1230_14212"
         staging_tbl = "{}_stg_{}_{}".format(target_table, date_stamp, noise)
 
-        if distinct_check:
+        if distinct_check and distinct_check != "staged":
             primary_keys_statement = ", ".join(primary_keys)
             diff = self.query(
                 f"""
@@ -1078,32 +1468,59 @@ class Redshift(
                 staging_table_name = staging_tbl.split(".")[1]
                 target_table_name = target_table.split(".")[1]
 
-                # Delete rows
                 comparisons = [
                     f"{staging_table_name}.{primary_key} = {target_table_name}.{primary_key}"
                     for primary_key in primary_keys
                 ]
                 where_clause = " and ".join(comparisons)
 
-                sql = f"""
-                       DELETE FROM {target_table}
-                       USING {staging_tbl}
-                       WHERE {where_clause}
-                       """
-                self.query_with_connection(sql, connection, commit=False)
-                logger.debug(f"Target rows deleted from {target_table}.")
+                if distinct_check == "staged":
+                    self._staged_distinct_check(connection, target_table, staging_tbl, primary_keys)
 
-                # Insert rows
-                # ALTER TABLE APPEND would be more efficient, but you can't run it in a
-                # transaction block. It's worth the performance hit to not commit until the
-                # end.
-                sql = f"""
-                       INSERT INTO {target_table}
-                       SELECT * FROM {staging_tbl};
-                       """
+                if strategy == "merge":
+                    schema, table_name = self.split_full_table_name(target_table)
+                    columns = self.get_columns_list(schema, table_name)
 
-                self.query_with_connection(sql, connection, commit=False)
-                logger.info(f"Target rows inserted to {target_table}")
+                    # Key columns already match, so only the other columns are updated
+                    update_columns = [c for c in columns if c not in primary_keys] or columns
+                    update_clause = ", ".join(
+                        f"{c} = {staging_table_name}.{c}" for c in update_columns
+                    )
+                    insert_columns = ", ".join(columns)
+                    insert_values = ", ".join(f"{staging_table_name}.{c}" for c in columns)
+
+                    sql = f"""
+                           MERGE INTO {target_table}
+                           USING {staging_tbl}
+                           ON {where_clause}
+                           WHEN MATCHED THEN UPDATE SET {update_clause}
+                           WHEN NOT MATCHED THEN INSERT ({insert_columns})
+                           VALUES ({insert_values});
+                           """
+                    self.query_with_connection(sql, connection, commit=False)
+                    logger.info(f"Target rows merged into {target_table}")
+
+                else:
+                    # Delete rows
+                    sql = f"""
+                           DELETE FROM {target_table}
+                           USING {staging_tbl}
+                           WHERE {where_clause}
+                           """
+                    self.query_with_connection(sql, connection, commit=False)
+                    logger.debug(f"Target rows deleted from {target_table}.")
+
+                    # Insert rows
+                    # ALTER TABLE APPEND would be more efficient, but you can't run it in a
+                    # transaction block. It's worth the performance hit to not commit until
+                    # the end.
+                    sql = f"""
+                           INSERT INTO {target_table}
+                           SELECT * FROM {staging_tbl};
+                           """
+
+                    self.query_with_connection(sql, connection, commit=False)
+                    logger.info(f"Target rows inserted to {target_table}")
 
             finally:
                 if cleanup_temp_table:
@@ -1120,6 +1537,38 @@ class Redshift(
                 self.query_with_connection(f"VACUUM {target_table};", connection)
                 logger.info(f"{target_table} vacuumed.")
 
+    def _staged_distinct_check(self, connection, target_table, staging_tbl, primary_keys):
+        # Check for duplicate keys among the rows being upserted, without counting the
+        # whole target table: keys repeated in the staging table, and keys that appear in
+        # the staging table and more than once in the target table.
+
+        primary_keys_statement = ", ".join(primary_keys)
+        join_clause = " and ".join(f"t.{pk} = s.{pk}" for pk in primary_keys)
+        target_keys = ", ".join(f"t.{pk}" for pk in primary_keys)
+
+        sql = f"""
+            select (
+                select count(*) from (
+                    select {primary_keys_statement}
+                    from {staging_tbl}
+                    group by {primary_keys_statement}
+                    having count(*) > 1
+                )
+            ) + (
+                select count(*) from (
+                    select {target_keys}
+                    from {target_table} t
+                    join (select distinct {primary_keys_statement} from {staging_tbl}) s
+                    on {join_clause}
+                    group by {target_keys}
+                    having count(*) > 1
+                )
+            ) as total_count
+        """
+
+        if self.query_with_connection(sql, connection, commit=False).first > 0:
+            raise ValueError("Primary key column contains duplicate values.")
+
     def drop_dependencies_for_cols(self, schema, table, cols):
         fmt_cols = ", ".join([f"'{c}'" for c in cols])
         sql_depend = f"""
@@ -1172,10 +1621,12 @@ class Redshift(
         """
 
         # Make the Parsons table column names match valid Redshift names
-        tbl.table = petl.setheader(tbl.table, self.column_name_validate(tbl.columns))
+        tbl.set_header(self.column_name_validate(tbl.columns))
 
-        # Create a list of column names and max width for string values.
-        pc = {c: tbl.get_column_max_width(c) for c in tbl.columns}
+        # Create a list of column names and max width for string values, reading the
+        # table once for all columns.
+        profile = tbl.get_column_profile()
+        pc = dict(zip(profile.columns, profile.max_widths))
 
         # Determine the max width of the varchar columns in the Redshift table
         s, t = self.split_full_table_name(table_name)
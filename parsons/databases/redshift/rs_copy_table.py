@@ -1,12 +1,20 @@
+import csv
+import gzip
 import os
 from parsons.aws.s3 import S3
+from parsons.utilities import files
 import time
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
 
 logger = logging.getLogger(__name__)
 
 S3_TEMP_KEY_PREFIX = "Parsons_RedshiftCopyTable"
 
+# The most parts compressed and uploaded at once when staging a table as several files
+MAX_CONCURRENT_UPLOADS = 8
+
 
 class RedshiftCopyTable(object):
     aws_access_key_id = None
@@ -176,6 +184,144 @@ class RedshiftCopyTable(object):
 
         return key
 
+    def temp_s3_copy_sliced(
+        self,
+        tbl,
+        num_files,
+        aws_access_key_id=None,
+        aws_secret_access_key=None,
+        csv_encoding="utf-8",
+    ):
+        """
+        Stage a table in the temp bucket as ``num_files`` compressed CSV parts plus a manifest
+        listing them, so that a COPY can load the parts in parallel across the cluster slices.
+        The table is read once, straight into compressed part files on disk, and each part
+        is uploaded while the next ones are written.
+
+        `Args:`
+            tbl: obj
+                A Parsons Table
+            num_files: int
+                The number of parts to split the table into. Tables with fewer rows than
+                ``num_files`` are split into one part per row.
+            aws_access_key_id: str
+                An AWS access key granted to the temp bucket
+            aws_secret_access_key: str
+                An AWS secret access key granted to the temp bucket
+            csv_encoding: str
+                String encoding to use when writing the parts
+        `Returns:`
+            tuple
+                The manifest key and a list of every key written, including the manifest
+        """
+
+        if not self.s3_temp_bucket:
+            raise KeyError(
+                (
+                    "Missing S3_TEMP_BUCKET, needed for transferring data to Redshift. "
+                    "Must be specified as env vars or kwargs"
+                )
+            )
+
+        aws_access_key_id = aws_access_key_id or self.aws_access_key_id
+        aws_secret_access_key = aws_secret_access_key or self.aws_secret_access_key
+
+        self.s3 = S3(
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            use_env_token=self.use_env_token,
+        )
+
+        hashed_name = hash(time.time())
+        key_prefix = f"{S3_TEMP_KEY_PREFIX}/{hashed_name}"
+        if self.s3_temp_bucket_prefix:
+            key_prefix = self.s3_temp_bucket_prefix + "/" + key_prefix
+
+        rows_per_file = max(1, math.ceil(tbl.num_rows / num_files))
+
+        def upload_part(local_path, key):
+            self.s3.put_file(self.s3_temp_bucket, key, local_path)
+            os.remove(local_path)
+
+        keys = []
+        pending = set()
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(num_files, MAX_CONCURRENT_UPLOADS)) as executor:
+                # Each part is uploaded as soon as it has been written, while the next is
+                # being written
+                parts = _write_csv_parts(tbl, rows_per_file, csv_encoding)
+                for i, local_path in enumerate(parts):
+                    for future in [future for future in pending if future.done()]:
+                        pending.remove(future)
+                        future.result()
+
+                    key = f"{key_prefix}/part_{i:04d}.csv.gz"
+                    keys.append(key)
+                    pending.add(executor.submit(upload_part, local_path, key))
+
+                for future in wait(pending).done:
+                    future.result()
+
+            logger.info(f"Uploaded {len(keys)} parts to s3://{self.s3_temp_bucket}/{key_prefix}/")
+
+            manifest_key = f"{key_prefix}.manifest"
+            self.generate_manifest(
+                self.s3_temp_bucket,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                prefix=f"{key_prefix}/",
+                manifest_bucket=self.s3_temp_bucket,
+                manifest_key=manifest_key,
+            )
+            keys.append(manifest_key)
+
+        except Exception:
+            # Don't leave partial uploads behind
+            self.temp_s3_delete(keys)
+            raise
+
+        return manifest_key, keys
+
     def temp_s3_delete(self, key):
-        if key:
-            self.s3.remove_file(self.s3_temp_bucket, key)
+        if not key:
+            return
+
+        # Accept a single key, or all of the keys written by ``temp_s3_copy_sliced``
+        keys = [key] if isinstance(key, str) else key
+        for k in keys:
+            self.s3.remove_file(self.s3_temp_bucket, k)
+
+
+def _write_csv_parts(tbl, rows_per_file, encoding):
+    """
+    Write a table to gzipped CSV parts of ``rows_per_file`` rows each, in a single pass over
+    the table, yielding the path of each part once it is complete.
+    """
+
+    rows = iter(tbl.table)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    part = local_path = writer = None
+    try:
+        for i, row in enumerate(rows):
+            if i % rows_per_file == 0:
+                if part:
+                    part.close()
+                    yield local_path
+
+                local_path = files.create_temp_file(suffix=".csv.gz")
+                part = gzip.open(local_path, "wt", encoding=encoding, newline="")
+                writer = csv.writer(part)
+                writer.writerow(header)
+
+            writer.writerow(row)
+
+        if part:
+            part.close()
+            yield local_path
+    finally:
+        if part:
+            part.close()
@@ -41,6 +41,27 @@ class BaseTable:
         """
         ).first
 
+    def max_watermark(self, watermark_column):
+        """
+        Get the latest non-null value of a watermark column in the table.
+        """
+
+        return self.db.query(f"SELECT MAX({watermark_column}) FROM {self.table}").first
+
+    def min_primary_key(self, primary_key):
+        """
+        Get the minimum primary key in the table.
+        """
+
+        return self.db.query(
+            f"""
+            SELECT {primary_key}
+            FROM {self.table}
+            ORDER BY {primary_key} ASC
+            LIMIT 1
+        """
+        ).first
+
     def distinct_primary_key(self, primary_key):
         """
         Check if the passed primary key column is distinct.
@@ -115,20 +136,27 @@ class BaseTable:
 
         return self.db.query(sql, params).first
 
-    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None):
+    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None, upper_bound=None):
         """
         Get rows that have a greater primary key value than the one
         provided.
 
-        It will select every value greater than the provided value.
+        It will select every value greater than the provided value, up to and including
+        ``upper_bound`` if it is provided.
         """
 
+        conditions = []
+        parameters = []
+
         if cutoff_value is not None:
-            where_clause = f"WHERE {primary_key} > %s"
-            parameters = [cutoff_value]
-        else:
-            where_clause = ""
-            parameters = []
+            conditions.append(f"{primary_key} > %s")
+            parameters.append(cutoff_value)
+
+        if upper_bound is not None:
+            conditions.append(f"{primary_key} <= %s")
+            parameters.append(upper_bound)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         sql = f"""
                SELECT
@@ -145,6 +173,81 @@ class BaseTable:
 
         return self.db.query(sql, parameters)
 
+    def get_changed_rows(
+        self, watermark_column, primary_key, watermark=None, last_position=None, chunk_size=None
+    ):
+        """
+        Get rows that were changed at or after the ``watermark`` value, ordered by
+        ``watermark_column`` and then ``primary_key``. Rows without a ``watermark_column``
+        value are never returned.
+
+        To get the next chunk, pass the ``watermark_column`` and ``primary_key`` values of the
+        last row returned as ``last_position``. Rows are then selected by comparing against
+        that pair rather than with an ``OFFSET``.
+        """
+
+        conditions = [f"{watermark_column} IS NOT NULL"]
+        parameters = []
+
+        if last_position is not None:
+            last_watermark, last_key = last_position
+            conditions.append(
+                f"({watermark_column} > %s OR ({watermark_column} = %s AND {primary_key} > %s))"
+            )
+            parameters.extend([last_watermark, last_watermark, last_key])
+        elif watermark is not None:
+            conditions.append(f"{watermark_column} >= %s")
+            parameters.append(watermark)
+
+        sql = f"""
+               SELECT
+               *
+               FROM {self.table}
+               WHERE {' AND '.join(conditions)}
+               ORDER BY {watermark_column}, {primary_key}
+               """
+
+        if chunk_size:
+            sql += f" LIMIT {chunk_size}"
+
+        return self.db.query(sql, parameters)
+
+    def stream_rows(self, order_by=None, cutoff_value=None, upper_bound=None, chunk_size=100000):
+        """
+        Read rows with a single streamed query, yielding them in Parsons Tables of up to
+        ``chunk_size`` rows. Only one chunk is held in memory at a time. Requires a database
+        with ``query_batches``.
+
+        If ``order_by`` is provided, rows are sorted by it, and only rows with an ``order_by``
+        value greater than ``cutoff_value``, up to and including ``upper_bound``, are read.
+        """
+
+        if not hasattr(self.db, "query_batches"):
+            raise NotImplementedError(
+                f"{type(self.db).__name__} does not support streaming query results."
+            )
+
+        conditions = []
+        parameters = []
+
+        if cutoff_value is not None:
+            conditions.append(f"{order_by} > %s")
+            parameters.append(cutoff_value)
+
+        if upper_bound is not None:
+            conditions.append(f"{order_by} <= %s")
+            parameters.append(upper_bound)
+
+        sql = f"SELECT * FROM {self.table}"
+
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+
+        return self.db.query_batches(sql, parameters, itersize=chunk_size)
+
     def drop(self, cascade=False):
         """
         Drop the table.
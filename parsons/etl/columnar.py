@@ -0,0 +1,227 @@
+"""
+Column-oriented storage for Parsons Tables.
+
+By default a Parsons Table wraps a lazy petl pipeline, so every transformation is
+re-applied row by row each time the table is iterated. A ``ColumnarView`` instead holds
+fully materialized columns in memory. It is still a valid petl table, so any method that
+doesn't have a columnar fast path keeps working, but the ``ETL`` methods that do have one
+operate on whole columns at once and the row count, header and column values are available
+without re-running the pipeline.
+"""
+
+import petl
+from petl.transform.conversions import dictconverter
+from petl.util.base import Record
+
+
+class ColumnarView(petl.Table):
+    """
+    A petl table backed by in-memory columns.
+
+    Columns are treated as immutable: transformations create new column lists and share the
+    columns that they did not change, so deriving one view from another is cheap.
+
+    `Args:`
+        header: list
+            The column names
+        columns: list
+            A list of lists, one per column, all of the same length
+    """
+
+    def __init__(self, header, columns):
+        if len(header) != len(columns):
+            raise ValueError("Header and columns must be the same length")
+
+        self._header = tuple(header)
+        self._columns = list(columns)
+
+    @classmethod
+    def from_petl(cls, table):
+        """
+        Build a ``ColumnarView`` from any petl table, reading it exactly once.
+
+        `Args:`
+            table: petl table
+                The table to read
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        if isinstance(table, cls):
+            return table
+
+        it = iter(table)
+        try:
+            header = tuple(next(it))
+        except StopIteration:
+            return cls([], [])
+
+        columns = [[] for _ in header]
+        appenders = [column.append for column in columns]
+        width = len(header)
+
+        for row in it:
+            # Pad short rows and trim long ones, the same way petl does when reading
+            # rows by field name.
+            if len(row) != width:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+
+            for append, value in zip(appenders, row):
+                append(value)
+
+        return cls(header, columns)
+
+    def __iter__(self):
+        yield self._header
+
+        if self._columns:
+            yield from zip(*self._columns)
+
+    def nrows(self):
+        """
+        `Returns:`
+            int
+                Number of rows in the view, without iterating it
+        """
+
+        return len(self._columns[0]) if self._columns else 0
+
+    def column(self, name):
+        """
+        Return the stored list for a column. The list is shared with the view, so callers
+        must copy it before modifying it.
+
+        `Args:`
+            name: str
+                The column name
+        `Returns:`
+            list
+        """
+
+        return self._columns[self._header.index(name)]
+
+    def slice_rows(self, start=None, stop=None):
+        """
+        Return a new view containing a slice of the rows.
+
+        `Args:`
+            start: int
+                Index of the first row to include
+            stop: int
+                Index of the row to stop at
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        return ColumnarView(self._header, [col[start:stop] for col in self._columns])
+
+    def rename_columns(self, column_map):
+        """
+        Return a new view with columns renamed. Column data is shared.
+
+        `Args:`
+            column_map: dict
+                Mapping of current column names to new column names
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        header = [column_map.get(name, name) for name in self._header]
+        return ColumnarView(header, self._columns)
+
+    def select_columns(self, names):
+        """
+        Return a new view with only the given columns, in the given order. Column data
+        is shared.
+
+        `Args:`
+            names: list
+                The column names to keep
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        return ColumnarView(names, [self.column(name) for name in names])
+
+    def replace_column(self, name, values):
+        """
+        Return a new view with the values of one column replaced.
+
+        `Args:`
+            name: str
+                The column name
+            values: list
+                The new values for the column
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        columns = list(self._columns)
+        columns[self._header.index(name)] = values
+        return ColumnarView(self._header, columns)
+
+    def insert_column(self, name, values, index=None):
+        """
+        Return a new view with an additional column.
+
+        `Args:`
+            name: str
+                The new column name
+            values: list
+                The values for the column
+            index: int
+                The position of the new column. Defaults to the end of the table.
+        `Returns:`
+            ``ColumnarView``
+        """
+
+        header = list(self._header)
+        columns = list(self._columns)
+
+        if index is None:
+            index = len(header)
+
+        header.insert(index, name)
+        columns.insert(index, values)
+        return ColumnarView(header, columns)
+
+    def iter_records(self):
+        """
+        Iterate the rows as petl records, which is what row-level callables passed to petl
+        (e.g. ``add_column`` functions) expect.
+        """
+
+        header = self._header
+        for row in zip(*self._columns):
+            yield Record(row, header)
+
+
+def convert_values(values, converter):
+    """
+    Apply a ``convert_column`` style converter (a function or a dict translation) to a list of
+    values. Errors are handled the same way as ``petl.convert``: unless
+    ``petl.config.failonerror`` is set, a value that can't be converted becomes ``None``.
+
+    `Args:`
+        values: list
+            The values to convert
+        converter: callable or dict
+            The converter
+    `Returns:`
+        list
+    """
+
+    if isinstance(converter, dict):
+        converter = dictconverter(converter)
+
+    if petl.config.failonerror:
+        return [converter(v) for v in values]
+
+    converted = []
+    for v in values:
+        try:
+            converted.append(converter(v))
+        except Exception:
+            converted.append(None)
+
+    return converted
@@ -1,6 +1,12 @@
+import itertools
 import logging
 
 import petl
+from petl.util.base import asindices
+
+from parsons.etl.columnar import ColumnarView, convert_values
+from parsons.etl.profile import ColumnProfile
+from parsons.etl.spill import SpillWriter
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +15,14 @@ class ETL(object):
     def __init__(self):
         pass
 
+    def _columnar_view(self):
+        # Returns the underlying ColumnarView if this table is using columnar storage, so that
+        # methods can take a column-at-a-time fast path instead of adding a petl step.
+        if isinstance(self.table, ColumnarView):
+            return self.table
+
+        return None
+
     def head(self, n=5):
         """
         Return the first n rows of the table
@@ -20,6 +34,11 @@ class ETL(object):
             `Parsons Table`
         """
 
+        view = self._columnar_view()
+        if view is not None:
+            self.table = view.slice_rows(0, n)
+            return self
+
         self.table = petl.head(self.table, n)
 
         return self
@@ -36,6 +55,11 @@ class ETL(object):
             `Parsons Table`
         """
 
+        view = self._columnar_view()
+        if view is not None:
+            self.table = view.slice_rows(max(view.nrows() - n, 0))
+            return self
+
         self.table = petl.tail(self.table, n)
 
         return self
@@ -65,6 +89,15 @@ class ETL(object):
             else:
                 raise ValueError(f"Column {column} already exists")
 
+        view = self._columnar_view()
+        if view is not None:
+            if callable(value):
+                values = [value(row) for row in view.iter_records()]
+            else:
+                values = [value] * view.nrows()
+            self.table = view.insert_column(column, values, index)
+            return self
+
         self.table = self.table.addfield(column, value, index)
 
         return self
@@ -80,6 +113,16 @@ class ETL(object):
             `Parsons Table` and also updates self
         """  # noqa: W605
 
+        view = self._columnar_view()
+        if view is not None:
+            # Resolve names and indexes the way petl does, so missing fields raise the same
+            # FieldSelectionError.
+            removed = set(asindices(self.columns, columns))
+            self.table = view.select_columns(
+                [c for i, c in enumerate(self.columns) if i not in removed]
+            )
+            return self
+
         self.table = petl.cutout(self.table, *columns)
 
         return self
@@ -100,6 +143,13 @@ class ETL(object):
         if new_column_name in self.columns:
             raise ValueError(f"Column {new_column_name} already exists")
 
+        view = self._columnar_view()
+        if view is not None:
+            if column_name not in self.columns:
+                raise petl.errors.FieldSelectionError(column_name)
+            self.table = view.rename_columns({column_name: new_column_name})
+            return self
+
         self.table = petl.rename(self.table, column_name, new_column_name)
 
         return self
@@ -128,6 +178,11 @@ class ETL(object):
             if new_name in self.table.columns():
                 raise ValueError(f"Column name {new_name} already exists")
 
+        view = self._columnar_view()
+        if view is not None:
+            self.table = view.rename_columns(column_map)
+            return self
+
         # Uses the underlying petl method
         self.table = petl.rename(self.table, column_map)
 
@@ -146,6 +201,15 @@ class ETL(object):
             `Parsons Table` and also updates self
         """
 
+        view = self._columnar_view()
+        if view is not None:
+            if callable(fill_value):
+                values = [fill_value(row) for row in view.iter_records()]
+            else:
+                values = [fill_value] * view.nrows()
+            self.table = view.replace_column(column_name, values)
+            return self
+
         if callable(fill_value):
             self.table = petl.convert(
                 self.table, column_name, lambda _, r: fill_value(r), pass_row=True
@@ -199,6 +263,13 @@ class ETL(object):
             `Parsons Table` and also updates existing object.
         """
 
+        view = self._columnar_view()
+        if view is not None:
+            values = view.column(column)
+            self.table = view.select_columns([c for c in self.columns if c != column])
+            self.table = self.table.insert_column(column, values, index)
+            return self
+
         self.table = petl.movefield(self.table, column, index)
 
         return self
@@ -218,6 +289,20 @@ class ETL(object):
             `Parsons Table` and also updates self
         """  # noqa: E501,E261
 
+        view = self._columnar_view()
+        if view is not None and len(column) == 2 and not kwargs:
+            # A single converter (function or dict) applied to one or more columns can be run
+            # over each column as a whole. Anything more elaborate falls through to petl.
+            fields, converter = column
+
+            if callable(converter) or isinstance(converter, dict):
+                # Fields may be names or indexes, resolved the same way as petl.
+                for index in asindices(self.columns, fields):
+                    field = self.columns[index]
+                    view = view.replace_column(field, convert_values(view.column(field), converter))
+                self.table = view
+                return self
+
         self.table = petl.convert(self.table, *column, **kwargs)
 
         return self
@@ -233,13 +318,44 @@ class ETL(object):
             int
         """
 
-        max_width = 0
+        profile = self.get_column_profile()
+
+        if column not in profile.columns:
+            raise petl.errors.FieldSelectionError(column)
+
+        return profile.column(column)["max_width"]
+
+    def get_column_profile(self, folds=None, block_folds=None):
+        """
+        Return a :class:`~parsons.etl.profile.ColumnProfile` of the table, holding the
+        maximum width, ``None`` count and Python types of every column, gathered in a single
+        pass over the data.
+
+        The profile is cached until the table is next transformed, so the table is only read
+        once however many columns are inspected.
+
+        `Args:`
+            folds: dict
+                Optional functions to fold over the values of each column, keyed by name.
+                Each is called with a value and the result of the previous call (``None`` for
+                the first value). If the cached profile doesn't include all of the folds, the
+                table is profiled again.
+            block_folds: dict
+                Like ``folds``, but each function is called with a list of consecutive values
+                of a column at a time, rather than a single value.
+        `Returns:`
+            ``ColumnProfile``
+        """
+
+        folds = folds or {}
+        block_folds = block_folds or {}
+        profile = self._column_profile
 
-        for v in petl.values(self.table, column):
-            if len(str(v).encode("utf-8")) > max_width:
-                max_width = len(str(v).encode("utf-8"))
+        if profile is None or not profile.has_folds(folds) or not profile.has_folds(block_folds):
+            profile = ColumnProfile.from_petl(self.table, folds=folds, block_folds=block_folds)
+            self._column_profile = profile
 
-        return max_width
+        return profile
 
     def convert_columns_to_str(self):
         """
@@ -777,6 +893,10 @@ class ETL(object):
 
         from parsons.etl.table import Table
 
+        view = self._columnar_view()
+        if view is not None and all(isinstance(c, str) for c in columns):
+            return Table(view.select_columns(columns))
+
         return Table(petl.cut(self.table, *columns))
 
     def select_rows(self, *filters):
@@ -897,6 +1017,9 @@ class ETL(object):
         Divides a Parsons table into smaller tables of a specified row count. If the table
         cannot be divided evenly, then the final table will only include the remainder.
 
+        The table is read once, with ``iter_chunks``, and each chunk is written to a temp
+        file as it is read, so the chunks don't all need to fit in memory.
+
         `Args:`
             rows: int
                 The number of rows of each new Parsons table
@@ -906,9 +1029,47 @@ class ETL(object):
 
         from parsons.etl import Table
 
-        return [
-            Table(petl.rowslice(self.table, i, i + rows)) for i in range(0, self.num_rows, rows)
-        ]
+        chunks = []
+        for chunk in self.iter_chunks(rows):
+            with SpillWriter(chunk.columns) as writer:
+                writer.write_rows(petl.data(chunk.table))
+            chunks.append(Table(writer.view()))
+
+        return chunks
+
+    def iter_chunks(self, rows):
+        """
+        Iterates over a Parsons table in smaller tables of a specified row count. If the
+        table cannot be divided evenly, then the final table will only include the remainder.
+
+        The source table is only read once, and only one chunk is held in memory at a time.
+        Unlike ``chunk``, nothing is written to disk, so this is the better choice for large
+        or lazily loaded tables that are processed in order.
+
+        `Args:`
+            rows: int
+                The number of rows of each new Parsons table
+        `Returns:`
+            Generator of Parsons tables
+        """
+
+        from parsons.etl import Table
+
+        if rows < 1:
+            raise ValueError("Chunk size must be at least 1 row")
+
+        it = iter(self.table)
+        try:
+            header = list(next(it))
+        except StopIteration:
+            return
+
+        while True:
+            batch = list(itertools.islice(it, rows))
+            if not batch:
+                break
+
+            yield Table([header] + batch)
 
     @staticmethod
     def get_normalized_column_name(column_name):
@@ -1137,7 +1298,13 @@ class ETL(object):
         `Returns:`
             `Parsons Table` and also updates self
         """
+        profile = self._column_profile
         self.table = petl.setheader(self.table, new_header)
+
+        # Renaming columns doesn't change the data, so a cached profile still applies
+        if profile is not None and len(new_header) == len(profile.columns):
+            self._column_profile = profile.with_columns(new_header)
+
         return self
 
     def use_petl(self, petl_method, *args, **kwargs):
@@ -0,0 +1,203 @@
+"""
+Column profiles for Parsons Tables.
+
+Creating or altering a database table needs a few facts about every column: the width of the
+widest value, the Python types present and the SQL type each database would use. Gathering
+these column by column re-runs the whole petl pipeline once per column, so a
+``ColumnProfile`` gathers them all in a single pass over the rows.
+
+Database-specific type inference is done through "folds": functions called with each value
+in a column and the result of the previous call (``None`` for the first value), whose final
+result is kept per column. "Block folds" work the same way, but are called with a list of
+consecutive values at a time, so that they can check a whole block of a column at once.
+"""
+
+import itertools
+
+# The number of rows passed to block folds at a time
+PROFILE_BLOCK_SIZE = 10000
+
+
+def value_width(value):
+    """
+    The width of a value in bytes, once written out as a UTF-8 string.
+
+    `Args:`
+        value: any
+            The value to measure
+    `Returns:`
+        int
+    """
+
+    # Most values are ASCII strings, which don't need to be encoded to be measured
+    if isinstance(value, str) and value.isascii():
+        return len(value)
+
+    return len(str(value).encode("utf-8"))
+
+
+class ColumnProfile:
+    """
+    Statistics for every column of a table, gathered in one pass.
+
+    Usually created with ``Table.get_column_profile``, which caches the profile on the table
+    until the table is transformed.
+
+    `Args:`
+        columns: list
+            The column names
+        num_rows: int
+            The number of rows
+        max_widths: list
+            The byte width of the widest value in each column
+        null_counts: list
+            The number of ``None`` values in each column
+        python_types: list
+            A list of the Python type names in each column, in the order first seen
+        folds: dict
+            The result of each fold and block fold for each column, keyed by fold name
+    """
+
+    def __init__(self, columns, num_rows, max_widths, null_counts, python_types, folds=None):
+        self.columns = list(columns)
+        self.num_rows = num_rows
+        self.max_widths = max_widths
+        self.null_counts = null_counts
+        self.python_types = python_types
+        self.folds = folds or {}
+
+    @classmethod
+    def from_petl(cls, table, folds=None, block_folds=None):
+        """
+        Profile a petl table, reading it exactly once.
+
+        `Args:`
+            table: petl table
+                The table to profile
+            folds: dict
+                Functions to fold over the values of each column, keyed by a name used to
+                look up their results
+            block_folds: dict
+                Functions to fold over blocks of up to ``PROFILE_BLOCK_SIZE`` values of each
+                column, keyed by a name used to look up their results
+        `Returns:`
+            ``ColumnProfile``
+        """
+
+        folds = folds or {}
+        block_folds = block_folds or {}
+
+        it = iter(table)
+        try:
+            columns = list(next(it))
+        except StopIteration:
+            columns = []
+
+        ncols = len(columns)
+        num_rows = 0
+        max_widths = [0] * ncols
+        null_counts = [0] * ncols
+        python_types = [[] for _ in range(ncols)]
+        seen_types = [set() for _ in range(ncols)]
+        fold_funcs = list(folds.items())
+        fold_states = {name: [None] * ncols for name in itertools.chain(folds, block_folds)}
+
+        while True:
+            block = list(itertools.islice(it, PROFILE_BLOCK_SIZE))
+            if not block:
+                break
+
+            num_rows += len(block)
+            block_columns = [[] for _ in range(ncols)]
+
+            for row in block:
+                # Short rows are missing their last values, which are skipped; extra values
+                # in long rows have no column and are ignored.
+                for i, value in zip(range(ncols), row):
+                    width = value_width(value)
+                    if width > max_widths[i]:
+                        max_widths[i] = width
+
+                    if value is None:
+                        null_counts[i] += 1
+
+                    value_type = type(value)
+                    if value_type not in seen_types[i]:
+                        seen_types[i].add(value_type)
+                        python_types[i].append(value_type.__name__)
+
+                    for name, fold in fold_funcs:
+                        states = fold_states[name]
+                        states[i] = fold(value, states[i])
+
+                    if block_folds:
+                        block_columns[i].append(value)
+
+            for name, fold in block_folds.items():
+                states = fold_states[name]
+                for i, values in enumerate(block_columns):
+                    states[i] = fold(values, states[i])
+
+        return cls(columns, num_rows, max_widths, null_counts, python_types, fold_states)
+
+    def has_folds(self, names):
+        """
+        `Args:`
+            names: iterable
+                Fold names
+        `Returns:`
+            bool
+                Whether the profile includes the results of all of the folds
+        """
+
+        return all(name in self.folds for name in names)
+
+    def with_columns(self, columns):
+        """
+        Return a copy of the profile with the columns renamed. The data is unchanged, so the
+        statistics still apply.
+
+        `Args:`
+            columns: list
+                The new column names, one for each existing column
+        `Returns:`
+            ``ColumnProfile``
+        """
+
+        if len(columns) != len(self.columns):
+            raise ValueError("Must provide a name for each column")
+
+        return ColumnProfile(
+            columns,
+            self.num_rows,
+            self.max_widths,
+            self.null_counts,
+            self.python_types,
+            self.folds,
+        )
+
+    def column(self, name):
+        """
+        Get the statistics for one column.
+
+        `Args:`
+            name: str
+                The column name
+        `Returns:`
+            dict
+                With the ``name``, ``max_width``, ``null_count`` and ``python_types`` of the
+                column, and a ``folds`` dict of fold results.
+        """
+
+        if name not in self.columns:
+            raise KeyError(f"Column {name} is not in the profile")
+
+        i = self.columns.index(name)
+
+        return {
+            "name": name,
+            "max_width": self.max_widths[i],
+            "null_count": self.null_counts[i],
+            "python_types": self.python_types[i],
+            "folds": {fold: states[i] for fold, states in self.folds.items()},
+        }
@@ -0,0 +1,187 @@
+"""
+On-disk spill files for Parsons Tables.
+
+Query results and materialized tables are written to a local file so that they don't all
+live in memory. A spill file is a sequence of pickle frames: a metadata frame holding the
+header, followed by one frame per block of rows. Writing whole blocks rather than one frame
+per row keeps the type information for each field while making both writing and reading
+much cheaper. Files can optionally be gzip compressed, and uncompressed files are read
+through a memory map.
+"""
+
+import contextlib
+import gzip
+import mmap
+import pickle
+
+import petl
+
+from parsons.utilities import files
+
+SPILL_FORMAT_VERSION = 1
+SPILL_BLOCK_SIZE = 10000
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SpillWriter:
+    """
+    Write rows to a spill file in blocks.
+
+    Can be used as a context manager, in which case the file is closed on exit.
+
+    .. code-block:: python
+
+        with SpillWriter(header) as writer:
+            writer.write_rows(rows)
+
+        tbl = Table(writer.view())
+
+    `Args:`
+        header: list
+            The column names
+        file_path: str
+            The path to write to. If not specified, a temp file is created.
+        compression: str
+            ``None`` or ``gzip``
+        block_size: int
+            The number of rows to buffer before writing a block
+    """
+
+    def __init__(self, header, file_path=None, compression=None, block_size=SPILL_BLOCK_SIZE):
+        if compression not in (None, "gzip"):
+            raise ValueError(f"Unsupported spill compression: {compression}")
+
+        self.file_path = file_path or files.create_temp_file()
+        self.compression = compression
+        self.block_size = block_size
+        self.num_rows = 0
+        self._buffer = []
+
+        if compression == "gzip":
+            # Favor speed over size; spill files are short-lived
+            self._handle = gzip.open(self.file_path, "wb", compresslevel=1)
+        else:
+            self._handle = open(self.file_path, "wb")
+
+        self.header = list(header)
+        self._dump({"version": SPILL_FORMAT_VERSION, "header": self.header})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _dump(self, obj):
+        pickle.dump(obj, self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _flush(self):
+        if self._buffer:
+            self._dump(self._buffer)
+            self._buffer = []
+
+    def write_rows(self, rows):
+        """
+        Add rows to the file. Rows are buffered and written in blocks of ``block_size``.
+
+        `Args:`
+            rows: iterable
+                An iterable of row sequences
+        """
+
+        for row in rows:
+            self._buffer.append(tuple(row))
+            self.num_rows += 1
+
+            if len(self._buffer) >= self.block_size:
+                self._flush()
+
+    def close(self):
+        """
+        Write any buffered rows and close the file.
+        """
+
+        if self._handle.closed:
+            return
+
+        self._flush()
+        self._handle.close()
+
+    def view(self):
+        """
+        Close the writer and return a lazy reader for the file.
+
+        `Returns:`
+            ``SpillView``
+        """
+
+        self.close()
+        return SpillView(self.file_path, num_rows=self.num_rows)
+
+
+class SpillView(petl.Table):
+    """
+    A lazy petl table that reads a spill file written by ``SpillWriter``.
+
+    `Args:`
+        file_path: str
+            The path to the spill file
+        num_rows: int
+            The number of rows in the file, if known. This lets the row count be reported
+            without reading the file.
+        memory_map: bool
+            Whether to memory map uncompressed files when reading them
+    """
+
+    def __init__(self, file_path, num_rows=None, memory_map=True):
+        self.file_path = file_path
+        self._num_rows = num_rows
+        self.memory_map = memory_map
+
+    def _iter_frames(self):
+        with open(self.file_path, "rb") as handle:
+            is_gzip = handle.read(2) == GZIP_MAGIC
+            handle.seek(0)
+
+            if is_gzip:
+                source = gzip.GzipFile(fileobj=handle, mode="rb")
+            elif self.memory_map:
+                source = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = handle
+
+            try:
+                while True:
+                    try:
+                        yield pickle.load(source)
+                    except EOFError:
+                        break
+            finally:
+                if source is not handle:
+                    source.close()
+
+    def __iter__(self):
+        frames = self._iter_frames()
+
+        try:
+            metadata = next(frames)
+            yield tuple(metadata["header"])
+
+            for block in frames:
+                yield from block
+        finally:
+            frames.close()
+
+    def nrows(self):
+        """
+        `Returns:`
+            int
+                Number of rows in the file
+        """
+
+        if self._num_rows is None:
+            with contextlib.closing(self._iter_frames()) as frames:
+                next(frames)
+                self._num_rows = sum(len(block) for block in frames)
+
+        return self._num_rows
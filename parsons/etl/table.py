@@ -5,9 +5,10 @@ from typing import Union
 
 import petl
 
+from parsons.etl.columnar import ColumnarView
 from parsons.etl.etl import ETL
+from parsons.etl.spill import SpillWriter, SpillView
 from parsons.etl.tofrom import ToFrom
-from parsons.utilities import files
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +89,24 @@ class Table(ETL, ToFrom):
         # against inefficient usage.
         self._index_count = 0
 
+    @property
+    def table(self):
+        """
+        The underlying petl table.
+        """
+        return self._table
+
+    @table.setter
+    def table(self, table):
+        # Every transformation replaces the underlying petl table, so this is where we drop
+        # the cached row count, header and column profile. Until the table is replaced they
+        # can be reused rather than re-running the whole petl pipeline.
+        self._table = table
+        self._num_rows = None
+        self._columns = None
+        self._has_rows = None
+        self._column_profile = None
+
     def __repr__(self):
         return repr(petl.dicts(self.table))
 
@@ -109,11 +128,21 @@ class Table(ETL, ToFrom):
             raise TypeError("You must pass a string or an index as a value.")
 
     def __bool__(self):
-        # Try to get a single row from our table
-        head_one = petl.head(self.table)
+        if self._has_rows is None:
+            if self._num_rows is not None:
+                self._has_rows = self._num_rows > 0
+
+            elif isinstance(self.table, (ColumnarView, SpillView)):
+                self._has_rows = self.table.nrows() > 0
+
+            else:
+                # Try to get a single row from our table
+                head_one = petl.head(self.table)
+
+                # See if our single row is empty
+                self._has_rows = petl.nrows(head_one) > 0
 
-        # See if our single row is empty
-        return petl.nrows(head_one) > 0
+        return self._has_rows
 
     def _repr_html_(self):
         """
@@ -129,7 +158,15 @@ class Table(ETL, ToFrom):
             int
                 Number of rows in the table
         """
-        return petl.nrows(self.table)
+        # Counting a lazy table means running the whole pipeline, so the count is cached
+        # until the underlying petl table is replaced.
+        if self._num_rows is None:
+            if isinstance(self.table, (ColumnarView, SpillView)):
+                self._num_rows = self.table.nrows()
+            else:
+                self._num_rows = petl.nrows(self.table)
+
+        return self._num_rows
 
     def __len__(self):
         return self.num_rows
@@ -149,7 +186,10 @@ class Table(ETL, ToFrom):
             list
                 List of the table's column names
         """
-        return list(petl.header(self.table))
+        if self._columns is None:
+            self._columns = list(petl.header(self.table))
+
+        return list(self._columns)
 
     @property
     def first(self):
@@ -189,6 +229,9 @@ class Table(ETL, ToFrom):
                 """
             )
 
+        if isinstance(self.table, ColumnarView):
+            return {col: self.table.column(col)[row_index] for col in self.columns}
+
         return petl.dicts(self.table)[row_index]
 
     def column_data(self, column_name):
@@ -204,6 +247,9 @@ class Table(ETL, ToFrom):
         """
 
         if column_name in self.columns:
+            if isinstance(self.table, ColumnarView):
+                return list(self.table.column(column_name))
+
             return list(self.table[column_name])
 
         else:
@@ -220,6 +266,37 @@ class Table(ETL, ToFrom):
 
         self.table = petl.wrap(petl.tupleoftuples(self.table))
 
+    def to_columnar(self):
+        """
+        Switches the Table to columnar storage, meaning all data is loaded into memory and
+        stored column by column, and all pending transformations are applied.
+
+        While a Table is columnar, ``num_rows``, ``columns`` and ``column_data`` don't need to
+        re-read the data, and the common transformations (e.g. ``add_column``,
+        ``convert_column``, ``rename_column``, ``cut``) are applied to whole columns at once
+        instead of being added to the lazy row pipeline. Transformations without a columnar
+        implementation still work, but return the Table to lazy evaluation; call
+        ``to_columnar`` again to re-materialize it.
+
+        This method updates the current table in place.
+
+        `Returns:`
+            `Parsons Table` and also updates self
+        """
+
+        self.table = ColumnarView.from_petl(self.table)
+
+        return self
+
+    @property
+    def is_columnar(self):
+        """
+        `Returns:`
+            bool
+                Whether the Table is currently using columnar storage
+        """
+        return isinstance(self.table, ColumnarView)
+
     def materialize_to_file(self, file_path=None):
         """
         "Materializes" a Table, meaning all pending transformations are applied.
@@ -232,26 +309,37 @@ class Table(ETL, ToFrom):
         `Args:`
             file_path: str
                 The path to the file to materialize the table to; if not specified, a temp file
-                will be created.
+                will be created. A file written to a given path has one pickled row per record,
+                so it can be read back with ``petl.frompickle``.
         `Returns:`
             str
                 Path to the temp file that now contains the table
         """
 
-        # Load the data in batches, and "pickle" the rows to a temp file.
-        # (We pickle rather than writing to, say, a CSV, so that we maintain
-        # all the type information for each field.)
+        if file_path:
+            # Keep the row-per-pickle format for files at a caller's path, since callers may
+            # read them back with petl.frompickle.
+            with open(file_path, "wb") as handle:
+                for row in self.table:
+                    pickle.dump(list(row), handle)
+
+            self.table = petl.frompickle(file_path)
+
+            return file_path
+
+        # Write the rows to a spill file, which pickles them in blocks so that the type of
+        # each field is kept (see parsons.etl.spill)
 
-        file_path = file_path or files.create_temp_file()
+        rows = iter(self.table)
+        header = next(rows, [])
 
-        with open(file_path, "wb") as handle:
-            for row in self.table:
-                pickle.dump(list(row), handle)
+        with SpillWriter(header) as writer:
+            writer.write_rows(rows)
 
         # Load a Table from the file
-        self.table = petl.frompickle(file_path)
+        self.table = writer.view()
 
-        return file_path
+        return writer.file_path
 
     def is_valid_table(self):
         """
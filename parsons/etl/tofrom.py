@@ -907,11 +907,22 @@ class ToFrom(object):
         else:
             s3_keys = [f"s3://{bucket}/{key}"]
 
+        # Download the files of each bucket concurrently
+        # TODO handle urls that end with '/', i.e. urls that point to "folders"
+        bucket_keys = {}
+        for key in s3_keys:
+            _, _, bucket_, key_ = key.split("/", 3)
+            bucket_keys.setdefault(bucket_, []).append(key_)
+
+        local_paths = {}
+        for bucket_, keys in bucket_keys.items():
+            for key_, file_ in zip(keys, s3.get_files(bucket_, keys)):
+                local_paths[(bucket_, key_)] = file_
+
         tbls = []
         for key in s3_keys:
-            # TODO handle urls that end with '/', i.e. urls that point to "folders"
             _, _, bucket_, key_ = key.split("/", 3)
-            file_ = s3.get_file(bucket_, key_)
+            file_ = local_paths[(bucket_, key_)]
             if files.compression_type_for_path(key_) == "zip":
                 file_ = zip_archive.unzip_archive(file_)
 
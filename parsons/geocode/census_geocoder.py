@@ -112,7 +112,8 @@ class CensusGeocoder(object):
             )
             raise ValueError(msg)
 
-        chunked_tables = table.chunk(BATCH_SIZE)
+        # Only one batch of the table is held in memory at a time
+        chunked_tables = table.iter_chunks(BATCH_SIZE)
         batch_count = 1
         records_processed = 0
 
@@ -1,13 +1,14 @@
 import datetime
+import itertools
 import logging
-import pickle
+import os
 import random
 import uuid
 from contextlib import contextmanager
 from typing import List, Optional, Union
 
 import google
-import petl
+from google.api_core.exceptions import Forbidden, PermissionDenied
 from google.cloud import bigquery, exceptions
 from google.cloud.bigquery import dbapi
 from google.cloud.bigquery.job import LoadJobConfig
@@ -16,13 +17,25 @@ from google.oauth2.credentials import Credentials
 from parsons.databases.database_connector import DatabaseConnector
 from parsons.databases.table import BaseTable
 from parsons.etl import Table
-from parsons.google.google_cloud_storage import GoogleCloudStorage
+from parsons.etl.columnar import ColumnarView
+from parsons.etl.spill import SpillWriter
+from parsons.google.google_cloud_storage import SPLIT_PART_SIZE_BYTES, GoogleCloudStorage
 from parsons.google.utilities import (
     load_google_application_credentials,
     setup_google_application_credentials,
 )
-from parsons.utilities import check_env
-from parsons.utilities.files import create_temp_file
+from parsons.utilities import check_env, files
+
+# Optional libraries for fetching query results as Arrow record batches
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    bigquery_storage = None
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +58,14 @@ BIGQUERY_TYPE_MAP = {
 # 100k rows per batch at ~1k bytes each = ~100MB per batch.
 QUERY_BATCH_SIZE = 100000
 
+# Tables whose gzipped CSV is up to this size are uploaded straight to a load job by copy,
+# rather than staged in Google Cloud Storage
+DIRECT_LOAD_MAX_BYTES = 20 * 1024 * 1024
+
+# Without a temp bucket, larger tables are still loaded directly up to this size, which is
+# the most BigQuery will load from a single compressed CSV
+DIRECT_LOAD_NO_BUCKET_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
 
 def parse_table_name(table_name):
     # Helper function to parse out the different components of a table ID
@@ -176,6 +197,7 @@ class GoogleBigQuery(DatabaseConnector):
         # without valid GOOGLE_APPLICATION_CREDENTIALS raises an exception.
         # This attribute will be used to hold the client once we have created it.
         self._client = None
+        self._bqstorage = None
 
         self._dbapi = dbapi
 
@@ -239,6 +261,8 @@ class GoogleBigQuery(DatabaseConnector):
         sql: str,
         parameters: Optional[Union[list, dict]] = None,
         return_values: bool = True,
+        fast_fetch: bool = False,
+        columnar: bool = False,
     ) -> Optional[Table]:
         """
         Run a BigQuery query and return the results as a Parsons table.
@@ -267,6 +291,15 @@ class GoogleBigQuery(DatabaseConnector):
                 A valid BigTable statement
             parameters: dict
                 A dictionary of query parameters for BigQuery.
+            fast_fetch: bool
+                Download the results as Arrow record batches instead of row by row, which is
+                much faster for large results. Requires ``pyarrow``; if it is not installed,
+                the results are fetched row by row. If ``google-cloud-bigquery-storage`` is
+                also installed, the results are read from the BigQuery Storage Read API in
+                parallel streams.
+            columnar: bool
+                With ``fast_fetch``, hold the results in memory column by column, rather than
+                writing them to a temp file. Faster for results that fit in memory.
 
         `Returns:`
             Parsons Table
@@ -275,11 +308,23 @@ class GoogleBigQuery(DatabaseConnector):
 
         with self.connection() as connection:
             return self.query_with_connection(
-                sql, connection, parameters=parameters, return_values=return_values
+                sql,
+                connection,
+                parameters=parameters,
+                return_values=return_values,
+                fast_fetch=fast_fetch,
+                columnar=columnar,
             )
 
     def query_with_connection(
-        self, sql, connection, parameters=None, commit=True, return_values: bool = True
+        self,
+        sql,
+        connection,
+        parameters=None,
+        commit=True,
+        return_values: bool = True,
+        fast_fetch: bool = False,
+        columnar: bool = False,
     ):
         """
         Execute a query against the BigQuery database, with an existing connection.
@@ -295,6 +340,11 @@ class GoogleBigQuery(DatabaseConnector):
                 A list of python variables to be converted into SQL values in your query
             commit: boolean
                 Must be true. BigQuery
+            fast_fetch: bool
+                Download the results as Arrow record batches. See ``query``.
+            columnar: bool
+                With ``fast_fetch``, hold the results in memory column by column. See
+                ``query``.
 
         `Returns:`
             Parsons Table
@@ -326,7 +376,14 @@ class GoogleBigQuery(DatabaseConnector):
             if not cursor.description:
                 return None
 
-            final_table = self._fetch_query_results(cursor=cursor)
+            if fast_fetch and pyarrow is None:
+                logger.warning("pyarrow is not installed; fetching query results row by row.")
+                fast_fetch = False
+
+            if fast_fetch:
+                final_table = self._fetch_query_results_arrow(cursor.query_job, columnar)
+            else:
+                final_table = self._fetch_query_results(cursor=cursor)
 
             return final_table
 
@@ -361,6 +418,8 @@ class GoogleBigQuery(DatabaseConnector):
         compression_type: str = "gzip",
         new_file_extension: str = "csv",
         template_table: Optional[str] = None,
+        split_parts: bool = False,
+        part_size_bytes: int = SPLIT_PART_SIZE_BYTES,
         **load_kwargs,
     ):
         """
@@ -421,6 +480,12 @@ class GoogleBigQuery(DatabaseConnector):
             template_table: str
                 Table name to be used as the load schema. Load operation wil use the same
                 columns and data types as the template table.
+            split_parts: bool
+                If True, blobs that are unzipped are split into uncompressed parts of about
+                ``part_size_bytes`` each, which BigQuery loads in parallel. See
+                :meth:`copy_large_compressed_file_from_gcs`.
+            part_size_bytes: int
+                The approximate size of each part if ``split_parts`` is True.
             **load_kwargs: kwargs
                 Other arguments to pass to the underlying load_table_from_uri
                 call on the BigQuery client.
@@ -463,6 +528,8 @@ class GoogleBigQuery(DatabaseConnector):
                     job_config=job_config,
                     compression_type=compression_type,
                     new_file_extension=new_file_extension,
+                    split_parts=split_parts,
+                    part_size_bytes=part_size_bytes,
                 )
             else:
                 return self._load_table_from_uri(
@@ -493,6 +560,8 @@ class GoogleBigQuery(DatabaseConnector):
                     job_config=job_config,
                     compression_type=compression_type,
                     new_file_extension=new_file_extension,
+                    split_parts=split_parts,
+                    part_size_bytes=part_size_bytes,
                 )
             elif "Schema has no field" in str(e):
                 logger.debug(f"{gcs_blob_uri.split('/')[-1]} is empty, skipping file")
@@ -519,6 +588,8 @@ class GoogleBigQuery(DatabaseConnector):
         compression_type: str = "gzip",
         new_file_extension: str = "csv",
         template_table: Optional[str] = None,
+        split_parts: bool = False,
+        part_size_bytes: int = SPLIT_PART_SIZE_BYTES,
         **load_kwargs,
     ):
         """
@@ -577,6 +648,14 @@ class GoogleBigQuery(DatabaseConnector):
             template_table: str
                 Table name to be used as the load schema. Load operation wil use the same
                 columns and data types as the template table.
+            split_parts: bool
+                If True, the blob is decompressed into many uncompressed parts of about
+                ``part_size_bytes`` each, which are uploaded by a pool of worker threads as
+                they are written. The parts are then loaded with a single wildcard load job,
+                which BigQuery reads in parallel. Parts are only cut between records, and
+                every part repeats the file's header rows. Recommended for large files.
+            part_size_bytes: int
+                The approximate size of each part if ``split_parts`` is True.
             **load_kwargs: kwargs
                 Other arguments to pass to the underlying load_table_from_uri call on the BigQuery
                 client.
@@ -604,6 +683,19 @@ class GoogleBigQuery(DatabaseConnector):
         gcs = GoogleCloudStorage(app_creds=self.app_creds, project=self.project)
         old_bucket_name, old_blob_name = gcs.split_uri(gcs_uri=gcs_blob_uri)
 
+        if split_parts:
+            return self._load_table_from_split_blob(
+                gcs,
+                old_bucket_name,
+                old_blob_name,
+                table_name=table_name,
+                job_config=job_config,
+                compression_type=compression_type,
+                new_file_extension=new_file_extension,
+                part_size_bytes=part_size_bytes,
+                **load_kwargs,
+            )
+
         uncompressed_gcs_uri = None
 
         try:
@@ -630,6 +722,68 @@ class GoogleBigQuery(DatabaseConnector):
                 gcs.delete_blob(new_bucket_name, new_blob_name)
                 logger.debug("Successfully dropped uncompressed blob")
 
+    def _load_table_from_split_blob(
+        self,
+        gcs,
+        bucket_name,
+        blob_name,
+        table_name,
+        job_config,
+        compression_type,
+        new_file_extension,
+        part_size_bytes,
+        **load_kwargs,
+    ):
+        # Split a compressed blob into uncompressed parts, and load them all with one job
+        if job_config.source_format == bigquery.SourceFormat.CSV:
+            header_lines = job_config.skip_leading_rows or 0
+            quote = job_config.quote_character
+            if quote is None:
+                quote = '"'
+            if not job_config.allow_quoted_newlines:
+                quote = None
+        else:
+            header_lines = 0
+            quote = None
+
+        part_prefix = f"{blob_name.rsplit('.', 1)[0]}_parts_{uuid.uuid4().hex}"
+        part_names = []
+
+        try:
+            logger.debug("Splitting large file into parts")
+            part_names = gcs.split_blob(
+                bucket_name=bucket_name,
+                blob_name=blob_name,
+                part_prefix=part_prefix,
+                compression_type=compression_type,
+                header_lines=header_lines,
+                quote=quote,
+                part_size_bytes=part_size_bytes,
+                new_file_extension=new_file_extension,
+            )
+
+            if not part_names:
+                logger.debug(f"{blob_name} is empty, skipping file")
+                return "Empty file"
+
+            parts_uri = gcs.format_uri(
+                bucket=bucket_name, name=f"{part_prefix}/part_*.{new_file_extension}"
+            )
+            logger.debug(f"Loading {len(part_names)} parts into BigQuery {parts_uri}...")
+            table_ref = self.get_table_ref(table_name=table_name)
+            return self._load_table_from_uri(
+                source_uris=parts_uri,
+                destination=table_ref,
+                job_config=job_config,
+                **load_kwargs,
+            )
+
+        finally:
+            for part_name in part_names:
+                gcs.delete_blob(bucket_name, part_name)
+            if part_names:
+                logger.debug(f"Successfully dropped {len(part_names)} parts")
+
     def copy_s3(
         self,
         table_name,
@@ -745,10 +899,17 @@ class GoogleBigQuery(DatabaseConnector):
         allow_jagged_rows: bool = True,
         quote: Optional[str] = None,
         schema: Optional[List[dict]] = None,
+        load_method: str = "auto",
+        direct_load_max_bytes: int = DIRECT_LOAD_MAX_BYTES,
         **load_kwargs,
     ):
         """
-        Copy a :ref:`parsons-table` into Google BigQuery via Google Cloud Storage.
+        Copy a :ref:`parsons-table` into Google BigQuery.
+
+        The table is written to a compressed CSV, which is uploaded straight to the load
+        job if it is small. This saves the round trips to Cloud Storage and doesn't need a
+        temp bucket. Larger tables are staged in Cloud Storage as an uncompressed CSV, which
+        BigQuery can read in parallel.
 
         `Args:`
             tbl: obj
@@ -774,16 +935,31 @@ class GoogleBigQuery(DatabaseConnector):
             template_table: str
                 Table name to be used as the load schema. Load operation wil use the same
                 columns and data types as the template table.
+            load_method: str
+                ``gcs`` stages the data in Google Cloud Storage as an uncompressed CSV.
+                ``direct`` uploads a compressed CSV straight to the load job. ``auto`` writes
+                the compressed CSV, uploads it straight to the load job if it is no larger
+                than ``direct_load_max_bytes``, and otherwise loads it as ``gcs`` does.
+                Without a temp bucket, ``auto`` loads compressed CSVs of up to 4GB directly,
+                the most BigQuery accepts.
+            direct_load_max_bytes: int
+                The largest compressed CSV, in bytes, that ``auto`` loads directly.
             **load_kwargs: kwargs
-                Arguments to pass to the underlying load_table_from_uri call on the BigQuery
-                client.
+                Arguments to pass to the underlying load_table_from_uri (or
+                load_table_from_file) call on the BigQuery client.
         """
         data_type = "csv"
-        tmp_gcs_bucket = check_env.check("GCS_TEMP_BUCKET", tmp_gcs_bucket)
-        if not tmp_gcs_bucket:
-            raise ValueError(
-                "Must set GCS_TEMP_BUCKET environment variable or pass in tmp_gcs_bucket parameter"
-            )
+
+        if load_method not in ("auto", "gcs", "direct"):
+            raise ValueError("load_method must be one of auto, gcs or direct")
+
+        if load_method == "gcs":
+            tmp_gcs_bucket = check_env.check("GCS_TEMP_BUCKET", tmp_gcs_bucket)
+            if not tmp_gcs_bucket:
+                raise ValueError(
+                    "Must set GCS_TEMP_BUCKET environment variable or pass in tmp_gcs_bucket "
+                    "parameter"
+                )
 
         self._validate_copy_inputs(if_exists=if_exists, data_type=data_type)
 
@@ -813,6 +989,40 @@ class GoogleBigQuery(DatabaseConnector):
             schema.append(schema_row)
         job_config.schema = schema
 
+        destination = self.get_table_ref(table_name=table_name)
+
+        if load_method != "gcs":
+            # Write the table once, and pick how to load it from the size of the file
+            local_path = tbl.to_csv(temp_file_compression="gzip")
+
+            try:
+                file_bytes = os.path.getsize(local_path)
+                load_directly = load_method == "direct" or file_bytes <= direct_load_max_bytes
+                if not load_directly:
+                    tmp_gcs_bucket = check_env.check(
+                        "GCS_TEMP_BUCKET", tmp_gcs_bucket, optional=True
+                    )
+                    load_directly = (
+                        not tmp_gcs_bucket and file_bytes <= DIRECT_LOAD_NO_BUCKET_MAX_BYTES
+                    )
+
+                if load_directly:
+                    logger.debug(f"Compressed table is {file_bytes} bytes; loading it directly.")
+                    self._load_table_from_file(
+                        local_path, destination=destination, job_config=job_config, **load_kwargs
+                    )
+                    return
+            finally:
+                files.close_temp_file(local_path)
+
+            if not tmp_gcs_bucket:
+                raise ValueError(
+                    f"Compressed table is {file_bytes} bytes, too large to load directly. Must "
+                    "set GCS_TEMP_BUCKET environment variable or pass in tmp_gcs_bucket parameter"
+                )
+
+            logger.debug(f"Compressed table is {file_bytes} bytes; staging it in GCS.")
+
         gcs_client = gcs_client or GoogleCloudStorage(app_creds=self.app_creds)
         temp_blob_name = f"{uuid.uuid4()}.{data_type}"
         temp_blob_uri = gcs_client.upload_table(tbl, tmp_gcs_bucket, temp_blob_name)
@@ -821,7 +1031,7 @@ class GoogleBigQuery(DatabaseConnector):
         try:
             self._load_table_from_uri(
                 source_uris=temp_blob_uri,
-                destination=self.get_table_ref(table_name=table_name),
+                destination=destination,
                 job_config=job_config,
                 **load_kwargs,
             )
@@ -875,6 +1085,8 @@ class GoogleBigQuery(DatabaseConnector):
         distinct_check=True,
         cleanup_temp_table=True,
         from_s3=False,
+        strategy="delete_insert",
+        partition_column=None,
         **copy_args,
     ):
         """
@@ -896,9 +1108,30 @@ class GoogleBigQuery(DatabaseConnector):
                 Instead of specifying a table_obj (set the first argument to None),
                 set this to True and include :func:`~parsons.databases.bigquery.Bigquery.copy_s3`
                 arguments to upsert a pre-existing s3 file into the target_table
+            strategy: str
+                How rows are upserted from the staging table. ``delete_insert`` deletes the
+                target rows that match staged rows and inserts every staged row, in a
+                transaction. ``merge`` runs a single ``MERGE``, which updates matching rows
+                in place and inserts the rest, and returns the bytes it processed. The
+                staging table must not contain duplicate keys when using ``merge``.
+            partition_column: str
+                With ``merge``, only look for matching rows in the partitions of the target
+                table between the smallest and largest value of this column in the staged
+                rows, so that BigQuery only scans (and bills for) those partitions. Only use
+                this if a row's value in this column never changes; otherwise a staged row
+                whose existing row is in another partition is inserted a second time.
             \**copy_args: kwargs
                 See :func:`~parsons.databases.bigquery.BigQuery.copy` for options.
+        `Returns:`
+            With ``merge``, a dict with the ``bytes_processed`` and ``rows_affected`` by the
+            ``MERGE``. Otherwise ``None``.
         """  # noqa: W605
+        if strategy not in ("delete_insert", "merge"):
+            raise ValueError(f"Invalid strategy: {strategy}. Must be delete_insert or merge.")
+
+        if partition_column and strategy != "merge":
+            raise ValueError("partition_column can only be used with the merge strategy.")
+
         if not self.table_exists(target_table):
             logger.info(
                 "Target table does not exist. Copying into newly \
@@ -955,33 +1188,101 @@ class GoogleBigQuery(DatabaseConnector):
                 **copy_args,
             )
 
-        # Delete rows
-        comparisons = [
-            f"`{staging_tbl}`.{primary_key} = `{target_table}`.{primary_key}"
-            for primary_key in primary_keys
-        ]
-        where_clause = " and ".join(comparisons)
-
-        queries = [
-            f"""
-                DELETE FROM `{target_table}`
-                WHERE EXISTS
-                (SELECT * FROM `{staging_tbl}`
-                WHERE {where_clause})
-                """,
-            f"""
-                INSERT INTO `{target_table}`
-                SELECT * FROM `{staging_tbl}`
-                """,
-        ]
-
         try:
+            if strategy == "merge":
+                return self._merge_staging_table(
+                    staging_tbl, target_table, primary_keys, partition_column
+                )
+
+            # Delete rows
+            comparisons = [
+                f"`{staging_tbl}`.{primary_key} = `{target_table}`.{primary_key}"
+                for primary_key in primary_keys
+            ]
+            where_clause = " and ".join(comparisons)
+
+            queries = [
+                f"""
+                    DELETE FROM `{target_table}`
+                    WHERE EXISTS
+                    (SELECT * FROM `{staging_tbl}`
+                    WHERE {where_clause})
+                    """,
+                f"""
+                    INSERT INTO `{target_table}`
+                    SELECT * FROM `{staging_tbl}`
+                    """,
+            ]
+
             return self.query_with_transaction(queries=queries)
         finally:
             if cleanup_temp_table:
                 logger.info(f"Deleting staging table: {staging_tbl}")
                 self.query(f"DROP TABLE IF EXISTS {staging_tbl}", return_values=False)
 
+    def _merge_staging_table(self, staging_tbl, target_table, primary_keys, partition_column):
+        """
+        Merge a staging table into the target with a single ``MERGE`` statement.
+        """
+
+        columns = [field.name for field in self.client.get_table(target_table).schema]
+
+        conditions = [f"target.{key} = staging.{key}" for key in primary_keys]
+        parameters = None
+
+        if partition_column:
+            bounds = self.query(
+                f"""
+                SELECT
+                    MIN({partition_column}) AS min_value,
+                    MAX({partition_column}) AS max_value,
+                    COUNTIF({partition_column} IS NULL) AS null_count
+                FROM `{staging_tbl}`
+                """
+            )[0]
+
+            # Constant bounds let BigQuery prune the target's partitions
+            partition_conditions = []
+            if bounds["min_value"] is not None:
+                partition_conditions.append(
+                    f"target.{partition_column} BETWEEN %(min_value)s AND %(max_value)s"
+                )
+                parameters = {"min_value": bounds["min_value"], "max_value": bounds["max_value"]}
+            if bounds["null_count"]:
+                partition_conditions.append(f"target.{partition_column} IS NULL")
+
+            # An empty staging table has no bounds, and nothing to merge
+            if partition_conditions:
+                conditions.append(f"({' OR '.join(partition_conditions)})")
+
+        # Key columns already match, so only the other columns are updated
+        update_columns = [c for c in columns if c not in primary_keys] or columns
+        update_clause = ", ".join(f"{c} = staging.{c}" for c in update_columns)
+
+        sql = f"""
+            MERGE `{target_table}` AS target
+            USING `{staging_tbl}` AS staging
+            ON {" AND ".join(conditions)}
+            WHEN MATCHED THEN UPDATE SET {update_clause}
+            WHEN NOT MATCHED THEN INSERT ({", ".join(columns)})
+            VALUES ({", ".join(f"staging.{c}" for c in columns)})
+        """
+
+        with self.connection() as connection:
+            with self.cursor(connection) as cursor:
+                cursor.execute(sql, parameters)
+                query_job = cursor.query_job
+
+        stats = {
+            "bytes_processed": query_job.total_bytes_processed,
+            "rows_affected": query_job.num_dml_affected_rows,
+        }
+        logger.info(
+            f"Merged into {target_table}: {stats['rows_affected']} rows affected, "
+            f"{stats['bytes_processed']} bytes processed."
+        )
+        return stats
+
     def delete_table(self, table_name):
         """
         Delete a BigQuery table.
@@ -1177,16 +1478,22 @@ class GoogleBigQuery(DatabaseConnector):
 
         return None
 
+    @staticmethod
+    def _fold_has_timezone(value, has_tz):
+        return bool(has_tz or (isinstance(value, datetime.datetime) and value.tzinfo))
+
     def _generate_schema_from_parsons_table(self, tbl):
         """BigQuery schema generation based on contents of Parsons table.
 
         Not usually necessary to use this. BigQuery is able to
         natively autodetect schema formats."""
-        stats = tbl.get_columns_type_stats()
+        # Read the table once for the types of every column, noting whether any datetimes
+        # carry a timezone along the way.
+        profile = tbl.get_column_profile(folds={"bigquery_tz": self._fold_has_timezone})
         fields = []
-        for stat in stats:
-            petl_types = stat["type"]
-
+        for name, petl_types, has_tz in zip(
+            profile.columns, profile.python_types, profile.folds["bigquery_tz"]
+        ):
             # Prefer 'str' if included
             # Otherwise choose first type that isn't "NoneType"
             # Otherwise choose NoneType
@@ -1200,10 +1507,8 @@ class GoogleBigQuery(DatabaseConnector):
 
             # Python datetimes may be datetime or timestamp in BigQuery
             # BigQuery datetimes have no timezone, timestamps do
-            if best_type == "datetime":
-                for value in petl.util.base.values(tbl.table, stat["name"]):
-                    if isinstance(value, datetime.datetime) and value.tzinfo:
-                        best_type = "timestamp"
+            if best_type == "datetime" and has_tz:
+                best_type = "timestamp"
 
             try:
                 field_type = self._bigquery_type(best_type)
@@ -1213,7 +1518,7 @@ class GoogleBigQuery(DatabaseConnector):
                     "Consider converting to another type. "
                     f"[type={best_type}]"
                 ) from e
-            field = bigquery.schema.SchemaField(stat["name"], field_type)
+            field = bigquery.schema.SchemaField(name, field_type)
             fields.append(field)
         return fields
 
@@ -1310,25 +1615,73 @@ class GoogleBigQuery(DatabaseConnector):
 
     def _fetch_query_results(self, cursor) -> Table:
         # We will use a temp file to cache the results so that they are not all living
-        # in memory. We'll use pickle to serialize the results to file in order to maintain
-        # the proper data types (e.g. integer).
-        temp_filename = create_temp_file()
-
-        with open(temp_filename, "wb") as temp_file:
-            header = [i[0] for i in cursor.description]
-            pickle.dump(header, temp_file)
+        # in memory. Rows are pickled to the file in blocks in order to maintain the proper
+        # data types (e.g. integer).
+        header = [i[0] for i in cursor.description]
 
+        with SpillWriter(header) as writer:
             while True:
                 batch = cursor.fetchmany(QUERY_BATCH_SIZE)
                 if len(batch) == 0:
                     break
 
-                for row in batch:
-                    row_data = list(row.values())
-                    pickle.dump(row_data, temp_file)
+                writer.write_rows(row.values() for row in batch)
+
+        return Table(writer.view())
+
+    def _fetch_query_results_arrow(self, query_job, columnar=False) -> Table:
+        # Read the results as Arrow record batches, which BigQuery sends column by column,
+        # and only convert them to Python values one column at a time.
+        rows = query_job.result()
+        header = [field.name for field in rows.schema]
+        batches = self._arrow_batches(query_job, rows)
+
+        if columnar:
+            columns = [[] for _ in header]
+            for batch in batches:
+                for values, column in zip(columns, batch.columns):
+                    values.extend(column.to_pylist())
+
+            return Table(ColumnarView(header, columns))
+
+        with SpillWriter(header) as writer:
+            for batch in batches:
+                writer.write_rows(zip(*(column.to_pylist() for column in batch.columns)))
+
+        return Table(writer.view())
 
-        ptable = petl.frompickle(temp_filename)
-        return Table(ptable)
+    def _arrow_batches(self, query_job, rows):
+        # Without a storage client, the batches are downloaded page by page over REST
+        bqstorage_client = self._bqstorage_client()
+        if bqstorage_client is None:
+            return iter(rows.to_arrow_iterable(bqstorage_client=None))
+
+        # The read session is created when the first batch is requested, which fails if
+        # the credentials can't use the Storage Read API
+        try:
+            batches = iter(rows.to_arrow_iterable(bqstorage_client=bqstorage_client))
+            first = next(batches, None)
+        except (Forbidden, PermissionDenied) as e:
+            logger.warning(
+                f"Unable to read query results with the BigQuery Storage API ({e}). "
+                "Downloading them over REST instead."
+            )
+            return iter(query_job.result().to_arrow_iterable(bqstorage_client=None))
+
+        if first is None:
+            return batches
+        return itertools.chain([first], batches)
+
+    def _bqstorage_client(self):
+        # A client for the BigQuery Storage Read API, if it is installed. The client holds
+        # a gRPC channel, so one is shared by every query made through this connector.
+        if bigquery_storage is None:
+            return None
+
+        if self._bqstorage is None:
+            self._bqstorage = bigquery_storage.BigQueryReadClient(credentials=self.credentials)
+
+        return self._bqstorage
 
     def _validate_copy_inputs(self, if_exists: str, data_type: str):
         if if_exists not in ["fail", "truncate", "append", "drop"]:
@@ -1347,6 +1700,22 @@ class GoogleBigQuery(DatabaseConnector):
             **load_kwargs,
         )
 
+        return self._wait_for_load_job(load_job)
+
+    def _load_table_from_file(self, local_path, destination, job_config, **load_kwargs):
+        # Upload a local file straight to a load job. The client sends large files with a
+        # resumable, chunked upload.
+        with open(local_path, "rb") as f:
+            load_job = self.client.load_table_from_file(
+                f,
+                destination=destination,
+                job_config=job_config,
+                **load_kwargs,
+            )
+
+        return self._wait_for_load_job(load_job)
+
+    def _wait_for_load_job(self, load_job):
         try:
             load_job.result()
             return load_job
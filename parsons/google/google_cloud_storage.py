@@ -1,10 +1,12 @@
 import datetime
 import gzip
+import itertools
 import petl
 import logging
 import time
 import uuid
 import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Optional
 
 import google
@@ -18,6 +20,12 @@ from parsons.utilities import files
 
 logger = logging.getLogger(__name__)
 
+# The approximate size of each uncompressed part written by ``split_blob``
+SPLIT_PART_SIZE_BYTES = 256 * 1024 * 1024
+
+# The most parts uploaded at once by ``split_blob``
+MAX_CONCURRENT_UPLOADS = 8
+
 
 class GoogleCloudStorage(object):
     """
@@ -623,6 +631,111 @@ class GoogleCloudStorage(object):
 
         return self.format_uri(bucket=bucket_name, name=decompressed_blob_name)
 
+    def split_blob(
+        self,
+        bucket_name: str,
+        blob_name: str,
+        part_prefix: str,
+        compression_type: str = "gzip",
+        header_lines: int = 1,
+        quote: Optional[str] = '"',
+        part_size_bytes: int = SPLIT_PART_SIZE_BYTES,
+        new_file_extension: str = "csv",
+    ) -> list:
+        """
+        Downloads and decompresses a blob, and re-uploads it to the same bucket as
+        uncompressed parts of about ``part_size_bytes`` each, named
+        ``{part_prefix}/part_00000.{new_file_extension}`` and so on. Parts are uploaded by
+        a pool of worker threads while the rest of the blob is decompressed. Every file in
+        a zip archive is split.
+
+        Parts are only cut between records, and each part starts with the header lines of
+        the file it was split from, so the parts can be loaded with the same settings as
+        the original file.
+
+        `Args`:
+            bucket_name: str
+                GCS bucket name
+
+            blob_name: str
+                Blob name in GCS bucket
+
+            part_prefix: str
+                Prefix of the blob names of the parts
+
+            compression_type: str
+                Either `zip` or `gzip`
+
+            header_lines: int
+                The number of header lines at the start of each file, which are
+                repeated at the start of every part
+
+            quote: str
+                The character used to quote values, so that line breaks inside
+                quoted values don't end a record. If ``None``, every line break
+                ends a record.
+
+            part_size_bytes: int
+                The approximate size of each part
+
+            new_file_extension: str
+                The file extension of the parts
+
+        `Returns`:
+            List of the blob names of the parts
+        """
+
+        if compression_type not in ("zip", "gzip"):
+            raise ValueError("compression_type must be either zip or gzip")
+
+        compressed_filepath = self.download_blob(
+            bucket_name=bucket_name, blob_name=blob_name
+        )
+        bucket = self.get_bucket(bucket_name=bucket_name)
+
+        part_names = []
+        uploaded = []
+        pending = set()
+
+        def upload_part(part_path, part_name):
+            blob = storage.Blob(name=part_name, bucket=bucket)
+            blob.upload_from_filename(part_path, timeout=3600)
+            uploaded.append(part_name)
+            files.close_temp_file(part_path)
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPLOADS) as executor:
+                for f_in in _decompressed_files(compressed_filepath, compression_type):
+                    parts = _write_parts(f_in, header_lines, quote, part_size_bytes)
+                    for part_path in parts:
+                        # Parts are written to disk faster than they are uploaded, so
+                        # wait for an upload to finish rather than fill up the disk.
+                        if len(pending) >= MAX_CONCURRENT_UPLOADS:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                future.result()
+
+                        part_name = (
+                            f"{part_prefix}/part_{len(part_names):05d}.{new_file_extension}"
+                        )
+                        part_names.append(part_name)
+                        pending.add(executor.submit(upload_part, part_path, part_name))
+
+                for future in wait(pending).done:
+                    future.result()
+
+        except Exception:
+            # Don't leave partial uploads behind
+            for part_name in uploaded:
+                storage.Blob(name=part_name, bucket=bucket).delete()
+            raise
+
+        logger.info(
+            f"Split {blob_name} into {len(part_names)} parts in "
+            f"{self.format_uri(bucket=bucket_name, name=part_prefix)}/"
+        )
+        return part_names
+
     def __gzip_decompress_and_write_to_gcs(self, **kwargs):
         """
         Handles `.gzip` decompression and streams blob contents
@@ -662,3 +775,66 @@ class GoogleCloudStorage(object):
                 bucket = self.get_bucket(bucket_name=bucket_name)
                 blob = storage.Blob(name=decompressed_blob_name, bucket=bucket)
                 blob.upload_from_file(file_obj=f_in, rewind=True, timeout=3600)
+
+
+def _decompressed_files(compressed_filepath, compression_type):
+    # Yield a binary file object for each file in a gzip or zip archive
+    if compression_type == "gzip":
+        with gzip.open(compressed_filepath, "rb") as f_in:
+            yield f_in
+    else:
+        with zipfile.ZipFile(compressed_filepath) as archive:
+            for member in archive.infolist():
+                if not member.is_dir():
+                    with archive.open(member) as f_in:
+                        yield f_in
+
+
+def _records(lines, quote):
+    # Join lines that end inside a quoted value, so that each item is a whole record.
+    # Escaped quotes are doubled, so a record is complete once it holds an even number.
+    if not quote:
+        yield from lines
+        return
+
+    quote = quote.encode("utf-8")
+    record = []
+    quote_count = 0
+
+    for line in lines:
+        record.append(line)
+        quote_count += line.count(quote)
+        if quote_count % 2 == 0:
+            yield b"".join(record)
+            record = []
+            quote_count = 0
+
+    if record:
+        yield b"".join(record)
+
+
+def _write_parts(f_in, header_lines, quote, part_size_bytes):
+    # Split a decompressed file into local part files, each starting with the header,
+    # and yield the path of each part once it is written
+    lines = iter(f_in)
+    header = b"".join(itertools.islice(lines, header_lines))
+
+    part = None
+    for record in _records(lines, quote):
+        if part is None:
+            part_path = files.create_temp_file()
+            part = open(part_path, "wb")
+            part.write(header)
+            part_size = len(header)
+
+        part.write(record)
+        part_size += len(record)
+
+        if part_size >= part_size_bytes:
+            part.close()
+            part = None
+            yield part_path
+
+    if part is not None:
+        part.close()
+        yield part_path
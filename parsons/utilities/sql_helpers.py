@@ -1,6 +1,6 @@
 import re
 
-__all__ = ["redact_credentials"]
+__all__ = ["redact_credentials", "fetch_batches"]
 
 
 def redact_credentials(sql):
@@ -12,3 +12,23 @@ def redact_credentials(sql):
     sql_censored = re.sub(pattern, "CREDENTIALS REDACTED", sql, flags=re.IGNORECASE)
 
     return sql_censored
+
+
+def fetch_batches(cursor, batch_size):
+    """
+    Yield non-empty batches of rows from a DB-API cursor until it is exhausted.
+
+    A cursor without a description (e.g. after a ``CREATE``) yields nothing. Named,
+    server-side cursors are always fetched from, since they only describe their results
+    once rows have been fetched.
+    """
+
+    if not cursor.description and not getattr(cursor, "name", None):
+        return
+
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+
+        yield batch
@@ -1,5 +1,6 @@
 from parsons.etl.table import Table
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +9,7 @@ class FakeDatabase:
     def __init__(self):
         self.table_map = {}
         self.copy_call_args = []
+        self.lock = threading.Lock()
 
     def setup_table(self, table_name, data, failures=0):
         self.table_map[table_name] = {
@@ -23,6 +25,10 @@ class FakeDatabase:
         return self.table_map[table_name]["table"]
 
     def copy(self, data, table_name, **kwargs):
+        with self.lock:
+            self._copy(data, table_name, **kwargs)
+
+    def _copy(self, data, table_name, **kwargs):
         logger.info("Copying %s rows", data.num_rows)
         if table_name not in self.table_map:
             self.setup_table(table_name, Table())
@@ -55,10 +61,33 @@ class FakeDatabase:
         pass
 
 
+class FakeUpsertDatabase(FakeDatabase):
+    def __init__(self):
+        super().__init__()
+        self.upsert_call_args = []
+
+    def upsert(self, table_obj, target_table, primary_key, **kwargs):
+        with self.lock:
+            self.upsert_call_args.append(
+                {"data": table_obj, "table_name": target_table, "kwargs": kwargs}
+            )
+
+            tbl = self.table_map[target_table]["table"]
+            new_keys = set(table_obj[primary_key])
+
+            tbl.data = tbl.data.select_rows(lambda row: row[primary_key] not in new_keys)
+            tbl.data.concat(table_obj)
+
+
 class FakeTable:
     def __init__(self, table_name, data):
         self.table_name = table_name
         self.data = data
+        self.get_new_rows_call_args = []
+        self.get_changed_rows_call_args = []
+        self.stream_rows_call_args = []
+        # Fail each stream after this many chunks, once for each entry
+        self.stream_failures = []
 
     def drop(self, cascade=False):
         self.data = None
@@ -84,6 +113,19 @@ class FakeTable:
 
         return max(self.data[primary_key])
 
+    def max_watermark(self, watermark_column):
+        if watermark_column not in self.data.columns:
+            return None
+
+        values = [value for value in self.data[watermark_column] if value is not None]
+        return max(values) if values else None
+
+    def min_primary_key(self, primary_key):
+        if primary_key not in self.data.columns:
+            return None
+
+        return min(self.data[primary_key])
+
     @property
     def num_rows(self):
         return self.data.num_rows
@@ -104,8 +146,61 @@ class FakeTable:
         data = self.data.select_rows(lambda row: row[primary_key_col] > start_value)
         return data.num_rows
 
-    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None):
-        data = self.data.select_rows(lambda row: row[primary_key] > cutoff_value)
+    def get_new_rows(self, primary_key, cutoff_value, offset=0, chunk_size=None, upper_bound=None):
+        self.get_new_rows_call_args.append(
+            {
+                "cutoff_value": cutoff_value,
+                "offset": offset,
+                "chunk_size": chunk_size,
+                "upper_bound": upper_bound,
+            }
+        )
+
+        data = self.data.select_rows(
+            lambda row: (cutoff_value is None or row[primary_key] > cutoff_value)
+            and (upper_bound is None or row[primary_key] <= upper_bound)
+        )
+
         data.sort(primary_key)
 
         return Table(data[offset : chunk_size + offset])
+
+    def stream_rows(self, order_by=None, cutoff_value=None, upper_bound=None, chunk_size=None):
+        self.stream_rows_call_args.append(
+            {"cutoff_value": cutoff_value, "upper_bound": upper_bound, "chunk_size": chunk_size}
+        )
+
+        data = self.data.select_rows(
+            lambda row: (cutoff_value is None or row[order_by] > cutoff_value)
+            and (upper_bound is None or row[order_by] <= upper_bound)
+        )
+
+        if order_by:
+            data.sort(order_by)
+
+        fail_after = self.stream_failures.pop(0) if self.stream_failures else None
+
+        for i, start in enumerate(range(0, data.num_rows, chunk_size)):
+            if i == fail_after:
+                raise ValueError("Canned stream error")
+            yield Table(data[start : start + chunk_size])
+
+    def get_changed_rows(
+        self, watermark_column, primary_key, watermark=None, last_position=None, chunk_size=None
+    ):
+        self.get_changed_rows_call_args.append(
+            {"watermark": watermark, "last_position": last_position}
+        )
+
+        def changed(row):
+            position = [row[watermark_column], row[primary_key]]
+            if row[watermark_column] is None:
+                return False
+            if last_position is not None:
+                return position > list(last_position)
+            return watermark is None or row[watermark_column] >= watermark
+
+        data = self.data.select_rows(changed)
+        data.sort([watermark_column, primary_key])
+
+        return Table(data[0:chunk_size])
@@ -1,9 +1,12 @@
+import datetime
+import gzip
 import json
 import os
 import unittest.mock as mock
 from test.test_google.test_utilities import FakeCredentialTest
 from typing import Union
 
+from google.api_core.exceptions import PermissionDenied
 from google.cloud import bigquery, exceptions
 
 from parsons import GoogleBigQuery
@@ -81,6 +84,88 @@ class TestGoogleBigQuery(FakeCredentialTest):
         assert not len(result)
         assert tuple(result.columns) == tuple([])
 
+    def _build_mock_arrow_results(self, bq):
+        # Fake Arrow record batches, one list of values per column
+        def batch(*columns):
+            return mock.MagicMock(
+                columns=[mock.MagicMock(to_pylist=mock.MagicMock(return_value=c)) for c in columns]
+            )
+
+        rows = mock.MagicMock()
+        rows.schema = [
+            bigquery.SchemaField("one", "INTEGER"),
+            bigquery.SchemaField("two", "STRING"),
+        ]
+        rows.to_arrow_iterable.return_value = [batch([1, 2], ["a", "b"]), batch([3], ["c"])]
+
+        cursor = bq._dbapi.connect.return_value.cursor.return_value
+        cursor.query_job.result.return_value = rows
+        return rows
+
+    @mock.patch("parsons.google.google_bigquery.bigquery_storage", None)
+    @mock.patch("parsons.google.google_bigquery.pyarrow", mock.MagicMock())
+    def test_query__fast_fetch(self):
+        bq = self._build_mock_client_for_querying([{"one": 1, "two": "a"}])
+        rows = self._build_mock_arrow_results(bq)
+
+        expected = [
+            {"one": 1, "two": "a"},
+            {"one": 2, "two": "b"},
+            {"one": 3, "two": "c"},
+        ]
+
+        result = bq.query("select * from table", fast_fetch=True)
+        self.assertEqual(list(result), expected)
+        rows.to_arrow_iterable.assert_called_once_with(bqstorage_client=None)
+
+        result = bq.query("select * from table", fast_fetch=True, columnar=True)
+        self.assertEqual(list(result), expected)
+        self.assertEqual(result.get_column_types("one"), ["int"])
+
+    @mock.patch("parsons.google.google_bigquery.bigquery_storage")
+    @mock.patch("parsons.google.google_bigquery.pyarrow", mock.MagicMock())
+    def test_query__fast_fetch_storage_client(self, bigquery_storage_mock):
+        bq = self._build_mock_client_for_querying([{"one": 1, "two": "a"}])
+        rows = self._build_mock_arrow_results(bq)
+        storage_client = bigquery_storage_mock.BigQueryReadClient.return_value
+
+        bq.query("select * from table", fast_fetch=True)
+        result = bq.query("select * from table", fast_fetch=True)
+
+        self.assertEqual(result.num_rows, 3)
+        rows.to_arrow_iterable.assert_called_with(bqstorage_client=storage_client)
+        # One storage client is shared by every query
+        bigquery_storage_mock.BigQueryReadClient.assert_called_once()
+
+    @mock.patch("parsons.google.google_bigquery.bigquery_storage")
+    @mock.patch("parsons.google.google_bigquery.pyarrow", mock.MagicMock())
+    def test_query__fast_fetch_storage_permission_denied(self, bigquery_storage_mock):
+        bq = self._build_mock_client_for_querying([{"one": 1, "two": "a"}])
+        rows = self._build_mock_arrow_results(bq)
+        batches = rows.to_arrow_iterable.return_value
+
+        def to_arrow_iterable(bqstorage_client):
+            if bqstorage_client is not None:
+                raise PermissionDenied("bigquery.readsessions.create")
+            return batches
+
+        rows.to_arrow_iterable.side_effect = to_arrow_iterable
+
+        # Falls back to downloading the results over REST
+        result = bq.query("select * from table", fast_fetch=True)
+        self.assertEqual(result.num_rows, 3)
+        rows.to_arrow_iterable.assert_called_with(bqstorage_client=None)
+
+    @mock.patch("parsons.google.google_bigquery.pyarrow", None)
+    def test_query__fast_fetch_fallback(self):
+        bq = self._build_mock_client_for_querying([{"one": 1, "two": "a"}])
+        rows = self._build_mock_arrow_results(bq)
+
+        # Without pyarrow, results are fetched from the cursor
+        result = bq.query("select * from table", fast_fetch=True)
+        self.assertEqual(list(result), [{"one": 1, "two": "a"}])
+        rows.to_arrow_iterable.assert_not_called()
+
     @mock.patch("parsons.utilities.files.create_temp_file")
     def test_query__no_return(self, create_temp_file_mock):
         query_string = "select * from table"
@@ -286,6 +371,51 @@ class TestGoogleBigQuery(FakeCredentialTest):
         job_config = load_call_args[1]["job_config"]
         self.assertEqual(job_config.write_disposition, bigquery.WriteDisposition.WRITE_EMPTY)
 
+    @mock.patch("google.cloud.storage.Client")
+    @mock.patch("parsons.google.google_cloud_storage.load_google_application_credentials")
+    @mock.patch.object(GoogleCloudStorage, "delete_blob")
+    @mock.patch.object(
+        GoogleCloudStorage,
+        "split_blob",
+        return_value=["file_parts_x/part_00000.csv", "file_parts_x/part_00001.csv"],
+    )
+    def test_copy_large_compressed_file_from_gcs__split_parts(
+        self, split_mock: mock.MagicMock, delete_mock: mock.MagicMock, *_
+    ):
+        bq = self._build_mock_client_for_copying(table_exists=False)
+
+        bq.copy_large_compressed_file_from_gcs(
+            gcs_blob_uri="gs://tmp/file.gz",
+            table_name="dataset.table",
+            split_parts=True,
+            part_size_bytes=1000,
+        )
+
+        split_mock.assert_called_once()
+        part_prefix = split_mock.call_args[1]["part_prefix"]
+        self.assertRegex(part_prefix, r"^file_parts_[0-9a-f]{32}$")
+        split_mock.assert_called_once_with(
+            bucket_name="tmp",
+            blob_name="file.gz",
+            part_prefix=part_prefix,
+            compression_type="gzip",
+            header_lines=1,
+            quote='"',
+            part_size_bytes=1000,
+            new_file_extension="csv",
+        )
+
+        # All of the parts are loaded with one wildcard job, and then deleted
+        self.assertEqual(bq.client.load_table_from_uri.call_count, 1)
+        load_call_args = bq.client.load_table_from_uri.call_args
+        self.assertEqual(load_call_args[1]["source_uris"], f"gs://tmp/{part_prefix}/part_*.csv")
+        delete_mock.assert_has_calls(
+            [
+                mock.call("tmp", "file_parts_x/part_00000.csv"),
+                mock.call("tmp", "file_parts_x/part_00001.csv"),
+            ]
+        )
+
     def test_copy_s3(self):
         # setup dependencies / inputs
         table_name = "table_name"
@@ -340,6 +470,7 @@ class TestGoogleBigQuery(FakeCredentialTest):
             table_name,
             tmp_gcs_bucket=self.tmp_gcs_bucket,
             gcs_client=gcs_client,
+            load_method="gcs",
         )
 
         # check that the method did the right things
@@ -366,6 +497,74 @@ class TestGoogleBigQuery(FakeCredentialTest):
         self.assertEqual(delete_call_args[0][0], self.tmp_gcs_bucket)
         self.assertEqual(delete_call_args[0][1], tmp_blob_name)
 
+    def test_copy__direct(self):
+        gcs_client = self._build_mock_cloud_storage_client()
+        tbl = self.default_table
+        bq = self._build_mock_client_for_copying(table_exists=False)
+        uploaded = []
+
+        def load_table_from_file(f, destination, job_config):
+            with gzip.open(f, "rt") as csv_file:
+                uploaded.append(csv_file.read())
+            return mock.MagicMock()
+
+        bq.client.load_table_from_file.side_effect = load_table_from_file
+
+        # Small tables are loaded directly, without a temp bucket
+        with mock.patch.dict(os.environ, {"GCS_TEMP_BUCKET": ""}):
+            bq.copy(tbl, "dataset.table", gcs_client=gcs_client)
+
+        gcs_client.upload_table.assert_not_called()
+        self.assertEqual(uploaded[0].splitlines()[0], ",".join(tbl.columns))
+
+        job_config = bq.client.load_table_from_file.call_args[1]["job_config"]
+        column_types = [schema_field.field_type for schema_field in job_config.schema]
+        self.assertEqual(column_types, ["INTEGER", "STRING", "BOOLEAN"])
+
+    def test_copy__auto_load_method(self):
+        tmp_blob_uri = "gs://tmp/file"
+        gcs_client = self._build_mock_cloud_storage_client(tmp_blob_uri)
+        tbl = self.default_table
+        bq = self._build_mock_client_for_copying(table_exists=False)
+        bq._load_table_from_uri = mock.MagicMock()
+
+        # Compressed tables larger than the limit are staged in Cloud Storage uncompressed,
+        # so that BigQuery can read them in parallel
+        bq.copy(
+            tbl,
+            "dataset.table",
+            tmp_gcs_bucket=self.tmp_gcs_bucket,
+            gcs_client=gcs_client,
+            direct_load_max_bytes=10,
+        )
+
+        self.assertEqual(gcs_client.upload_table.call_count, 1)
+        blob_name = gcs_client.upload_table.call_args[0][2]
+        self.assertTrue(blob_name.endswith(".csv"))
+        self.assertEqual(bq._load_table_from_uri.call_args[1]["source_uris"], tmp_blob_uri)
+        gcs_client.delete_blob.assert_called_once_with(self.tmp_gcs_bucket, blob_name)
+        bq.client.load_table_from_file.assert_not_called()
+
+        # Without a temp bucket, large tables are loaded directly, up to the most BigQuery
+        # accepts in one compressed file
+        with mock.patch.dict(os.environ, {"GCS_TEMP_BUCKET": ""}):
+            bq.copy(tbl, "dataset.table", gcs_client=gcs_client, direct_load_max_bytes=10)
+
+            with mock.patch("parsons.google.google_bigquery.DIRECT_LOAD_NO_BUCKET_MAX_BYTES", 10):
+                self.assertRaises(
+                    ValueError,
+                    bq.copy,
+                    tbl,
+                    "dataset.table",
+                    gcs_client=gcs_client,
+                    direct_load_max_bytes=10,
+                )
+
+        self.assertEqual(gcs_client.upload_table.call_count, 1)
+        self.assertEqual(bq.client.load_table_from_file.call_count, 1)
+
+        self.assertRaises(ValueError, bq.copy, tbl, "dataset.table", load_method="stream")
+
     @mock.patch("parsons.google.google_cloud_storage.load_google_application_credentials")
     @mock.patch("parsons.google.google_bigquery.load_google_application_credentials")
     def test_copy__credentials_are_correctly_set__from_filepath(
@@ -464,6 +663,7 @@ class TestGoogleBigQuery(FakeCredentialTest):
             tmp_gcs_bucket=self.tmp_gcs_bucket,
             gcs_client=gcs_client,
             if_exists=if_exists,
+            load_method="gcs",
         )
 
         self.assertEqual(bq._load_table_from_uri.call_count, 1)
@@ -536,6 +736,57 @@ class TestGoogleBigQuery(FakeCredentialTest):
         self.assertIn("DELETE", actual_queries[0])
         self.assertIn("INSERT", actual_queries[1])
 
+    @mock.patch.object(BigQuery, "table_exists", return_value=True)
+    @mock.patch.object(BigQuery, "copy", return_value=None)
+    @mock.patch.object(BigQuery, "query")
+    def test_upsert_merge(self, query_mock, copy_mock, *_):
+        upsert_tbl = Table([["id", "day", "name"], [1, "2024-01-02", "Jane"]])
+        target_table = "my_dataset.my_target_table"
+        bq = self._build_mock_client_for_querying(results=[])
+        bq.client.get_table.return_value.schema = [
+            bigquery.SchemaField("id", "INTEGER"),
+            bigquery.SchemaField("day", "DATE"),
+            bigquery.SchemaField("name", "STRING"),
+        ]
+        cursor = bq._dbapi.connect.return_value.cursor.return_value
+        cursor.query_job.total_bytes_processed = 1024
+        cursor.query_job.num_dml_affected_rows = 1
+
+        stats = bq.upsert(upsert_tbl, target_table, "id", distinct_check=False, strategy="merge")
+
+        sql, parameters = cursor.execute.call_args[0]
+        self.assertIn(f"MERGE `{target_table}` AS target", sql)
+        self.assertIn("ON target.id = staging.id\n", sql)
+        self.assertIn("UPDATE SET day = staging.day, name = staging.name", sql)
+        self.assertIn("INSERT (id, day, name)", sql)
+        self.assertIsNone(parameters)
+        self.assertEqual(stats, {"bytes_processed": 1024, "rows_affected": 1})
+
+        # With a partition column, the target is filtered to the staged partitions
+        query_mock.return_value = Table(
+            [{"min_value": "2024-01-01", "max_value": "2024-01-03", "null_count": 1}]
+        )
+        bq.upsert(
+            upsert_tbl,
+            target_table,
+            "id",
+            distinct_check=False,
+            strategy="merge",
+            partition_column="day",
+        )
+
+        sql, parameters = cursor.execute.call_args[0]
+        self.assertIn(
+            "AND (target.day BETWEEN %(min_value)s AND %(max_value)s OR target.day IS NULL)",
+            sql,
+        )
+        self.assertEqual(parameters, {"min_value": "2024-01-01", "max_value": "2024-01-03"})
+
+        self.assertRaises(
+            ValueError, bq.upsert, upsert_tbl, target_table, "id", partition_column="day"
+        )
+        self.assertRaises(ValueError, bq.upsert, upsert_tbl, target_table, "id", strategy="x")
+
     @mock.patch.object(BigQuery, "query")
     def test_get_row_count(self, query_mock):
         # Arrange
@@ -556,6 +807,35 @@ class TestGoogleBigQuery(FakeCredentialTest):
         self.assertEqual(row_count, expected_num_rows)
         self.assertEqual(actual_query, expected_query)
 
+    def test_generate_schema_from_parsons_table(self):
+        tbl = Table(
+            [
+                ["name", "count", "seen", "seen_tz", "empty"],
+                ["a", 1, datetime.datetime(2024, 1, 1), None, None],
+                [
+                    2,
+                    None,
+                    datetime.datetime(2024, 1, 2),
+                    datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc),
+                    None,
+                ],
+            ]
+        )
+        bq = self._build_mock_client_for_querying([])
+
+        schema = bq._generate_schema_from_parsons_table(tbl)
+
+        self.assertEqual(
+            [(field.name, field.field_type) for field in schema],
+            [
+                ("name", "STRING"),
+                ("count", "INTEGER"),
+                ("seen", "DATETIME"),
+                ("seen_tz", "TIMESTAMP"),
+                ("empty", "STRING"),
+            ],
+        )
+
     def _build_mock_client_for_querying(self, results):
         # Create a mock that will play the role of the cursor
         cursor = mock.MagicMock()
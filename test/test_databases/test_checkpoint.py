@@ -0,0 +1,56 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+from parsons.databases.checkpoint import FileCheckpointStore, SQLiteCheckpointStore
+
+
+class TestCheckpointStores(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def stores(self):
+        return [
+            FileCheckpointStore(os.path.join(self.temp_dir, "checkpoints.json")),
+            SQLiteCheckpointStore(os.path.join(self.temp_dir, "checkpoints.db")),
+        ]
+
+    def test_save_get_clear(self):
+        for store in self.stores():
+            self.assertIsNone(store.get("a -> b"))
+
+            store.save("a -> b", {"position": 10, "rows_written": 10})
+            store.save("c -> d", {"position": 5, "rows_written": 5})
+            store.save("a -> b", {"position": 20, "rows_written": 20})
+
+            self.assertEqual(store.get("a -> b"), {"position": 20, "rows_written": 20})
+            self.assertEqual(store.get("c -> d"), {"position": 5, "rows_written": 5})
+
+            store.clear("a -> b")
+            store.clear("missing")
+            self.assertIsNone(store.get("a -> b"))
+            self.assertEqual(store.get("c -> d"), {"position": 5, "rows_written": 5})
+
+    def test_value_types(self):
+        state = {
+            "datetime": datetime.datetime(2023, 1, 2, 3, 4, 5),
+            "date": datetime.date(2023, 1, 2),
+            "decimal": Decimal("1.50"),
+            "partitions": [[None, 10], [10, None]],
+        }
+
+        for store in self.stores():
+            store.save("key", state)
+            self.assertEqual(store.get("key"), state)
+
+    def test_persists(self):
+        path = os.path.join(self.temp_dir, "checkpoints.db")
+        SQLiteCheckpointStore(path).save("key", {"position": 1})
+
+        self.assertEqual(SQLiteCheckpointStore(path).get("key"), {"position": 1})
@@ -0,0 +1,236 @@
+import threading
+import unittest
+from unittest import mock
+
+from parsons import Postgres
+from parsons.databases.connection_pool import ConnectionPool, ping_connection, reset_session
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = 0
+        self.rollbacks = 0
+        self.commits = 0
+        self.autocommit = False
+        self.server_alive = True
+
+    def cursor(self):
+        cursor = mock.MagicMock()
+        if not self.server_alive:
+            cursor.execute.side_effect = Exception("server closed the connection")
+        return cursor
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        if self.closed:
+            raise Exception("connection already closed")
+        self.rollbacks += 1
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        conn = FakeConnection(len(self.opened))
+        self.opened.append(conn)
+        return conn
+
+    def test_reuses_connections(self):
+        pool = ConnectionPool(self.connect, max_size=2)
+
+        with pool.connection() as conn:
+            first = conn
+
+        with pool.connection() as conn:
+            self.assertIs(conn, first)
+
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(pool.idle_count, 1)
+
+    def test_size_limit(self):
+        pool = ConnectionPool(self.connect, max_size=2, timeout=0.05)
+
+        a = pool.acquire()
+        b = pool.acquire()
+        self.assertIsNot(a, b)
+        self.assertRaises(TimeoutError, pool.acquire)
+
+        pool.release(a)
+        self.assertIs(pool.acquire(), a)
+
+    def test_waits_for_release(self):
+        pool = ConnectionPool(self.connect, max_size=1, timeout=5)
+        conn = pool.acquire()
+
+        timer = threading.Timer(0.05, pool.release, args=[conn])
+        timer.start()
+
+        self.assertIs(pool.acquire(), conn)
+        timer.join()
+
+    def test_health_check(self):
+        pool = ConnectionPool(self.connect, health_check=lambda conn: not conn.closed)
+
+        with pool.connection() as conn:
+            first = conn
+
+        # The server went away while the connection was idle
+        first.closed = 1
+
+        with pool.connection() as conn:
+            self.assertIsNot(conn, first)
+
+        self.assertEqual(pool.size, 1)
+
+    def test_idle_and_lifetime_eviction(self):
+        with mock.patch("parsons.databases.connection_pool.time.monotonic") as monotonic:
+            monotonic.return_value = 0
+            pool = ConnectionPool(self.connect, max_idle_time=10, max_lifetime=100)
+
+            with pool.connection():
+                pass
+
+            # Recently used connections are reused
+            monotonic.return_value = 5
+            with pool.connection() as conn:
+                self.assertIs(conn, self.opened[0])
+
+            # Idle for too long
+            monotonic.return_value = 20
+            with pool.connection() as conn:
+                self.assertIs(conn, self.opened[1])
+            self.assertTrue(self.opened[0].closed)
+
+            # Open for too long, even though it was just used
+            for now in range(25, 130, 5):
+                monotonic.return_value = now
+                with pool.connection():
+                    pass
+
+            self.assertTrue(self.opened[1].closed)
+            self.assertEqual(pool.size, 1)
+
+    def test_reset_on_release(self):
+        pool = ConnectionPool(self.connect, reset=lambda conn: conn.rollback())
+
+        with pool.connection() as conn:
+            pass
+        self.assertEqual(conn.rollbacks, 1)
+
+        # A connection that can't be reset is closed instead of reused
+        with pool.connection() as conn:
+            conn.close()
+        self.assertEqual(pool.size, 0)
+
+    def test_ping_connection(self):
+        pool = ConnectionPool(self.connect, health_check=ping_connection)
+
+        with pool.connection() as conn:
+            first = conn
+
+        # Reused while the server is still there
+        with pool.connection() as conn:
+            self.assertIs(conn, first)
+
+        # The server dropped the connection, but the client hasn't noticed
+        first.server_alive = False
+
+        with pool.connection() as conn:
+            self.assertIsNot(conn, first)
+        self.assertTrue(first.closed)
+
+    def test_reset_session(self):
+        pool = ConnectionPool(self.connect, reset=reset_session)
+
+        with pool.connection() as conn:
+            conn.autocommit = True
+
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertFalse(conn.autocommit)
+
+    def test_connect_failure_frees_slot(self):
+        pool = ConnectionPool(mock.MagicMock(side_effect=Exception("down")), max_size=1)
+
+        self.assertRaises(Exception, pool.acquire)
+        self.assertEqual(pool.size, 0)
+
+    def test_close(self):
+        pool = ConnectionPool(self.connect)
+
+        with pool.connection() as conn:
+            in_use = pool.acquire()
+
+        pool.close()
+        self.assertTrue(conn.closed)
+        self.assertFalse(in_use.closed)
+
+        pool.release(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertRaises(RuntimeError, pool.acquire)
+
+    def test_threads(self):
+        pool = ConnectionPool(self.connect, max_size=3)
+        in_use = set()
+        lock = threading.Lock()
+        errors = []
+
+        def work():
+            for _ in range(50):
+                with pool.connection() as conn:
+                    with lock:
+                        if conn.number in in_use:
+                            errors.append(conn.number)
+                        in_use.add(conn.number)
+                    with lock:
+                        in_use.discard(conn.number)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.opened), 3)
+
+
+class TestPooledConnector(unittest.TestCase):
+    @mock.patch("parsons.databases.postgres.postgres_core.psycopg2.connect")
+    def test_postgres_pool(self, connect_mock):
+        connect_mock.side_effect = lambda **kwargs: FakeConnection(connect_mock.call_count)
+
+        pg = Postgres(username="test", password="test", host="test", db="test", pool_size=2)
+
+        with pg.connection() as first:
+            pass
+        with pg.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(connect_mock.call_count, 1)
+        self.assertFalse(first.closed)
+        self.assertEqual(first.commits, 2)
+
+    @mock.patch("parsons.databases.postgres.postgres_core.psycopg2.connect")
+    def test_postgres_no_pool(self, connect_mock):
+        connect_mock.side_effect = lambda **kwargs: FakeConnection(connect_mock.call_count)
+
+        pg = Postgres(username="test", password="test", host="test", db="test")
+
+        with pg.connection() as conn:
+            pass
+
+        self.assertIsNone(pg.pool)
+        self.assertTrue(conn.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
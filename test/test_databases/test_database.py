@@ -5,8 +5,10 @@ from parsons.databases.database.constants import (
     BIGINT,
     BOOL,
     VARCHAR,
+    FLOAT,
 )
 
+from parsons import Table
 from parsons.databases.database.database import DatabaseCreateStatement
 
 import pytest
@@ -139,3 +141,114 @@ def test_default_format_column(dcs, col, renamed):
 )
 def test_default_format_columns(dcs, cols, cols_formatted):
     assert dcs.format_columns(cols) == cols_formatted
+
+
+@pytest.mark.parametrize(
+    "values",
+    (
+        [1, 2, 3],
+        [1, None, 40000],
+        [-3000000000, 5],
+        [1, 2.5, 3],
+        [2.5, 3],
+        [True, False, None],
+        ["a", "b"],
+        ["1", "2"],
+        ["1", 5],
+        [5, "a", 3],
+        [True, 5],
+        [5, True],
+        [None, None],
+        [],
+    ),
+)
+def test_detect_column_type(dcs, values):
+    expected = None
+    for value in values:
+        expected = dcs.detect_data_type(value, expected)
+
+    assert dcs.detect_column_type(values) == expected
+
+
+def test_detect_column_type_skip_values(dcs):
+    assert dcs.detect_column_type(["NA", 1, ""], skip_values=["NA", ""]) == SMALLINT
+    assert dcs.detect_column_type(["NA", ""], skip_values=["NA", ""]) is None
+
+
+@pytest.mark.parametrize(
+    ("type1", "type2", "wider"),
+    (
+        (None, SMALLINT, SMALLINT),
+        (BOOL, SMALLINT, SMALLINT),
+        (BIGINT, MEDIUMINT, BIGINT),
+        (INT, FLOAT, FLOAT),
+        (VARCHAR, FLOAT, VARCHAR),
+        (None, None, None),
+    ),
+)
+def test_merge_data_types(dcs, type1, type2, wider):
+    assert dcs.merge_data_types(type1, type2) == wider
+    assert dcs.merge_data_types(type2, type1) == wider
+
+
+@pytest.mark.parametrize(
+    "values",
+    (
+        [1, True, 2],
+        [True, 1, 40000, False],
+        [2.5, 1, True, 3],
+        [1, "a", True, 5],
+        [True, None, "NA", 7],
+    ),
+)
+def test_detect_column_type_in_blocks(dcs, values):
+    expected = None
+    for value in values:
+        if value != "NA":
+            expected = dcs.detect_data_type(value, expected)
+
+    # Splitting a column into blocks gives the same type as checking it value by value,
+    # whether the blocks are checked in turn or separately and then merged
+    for split in range(len(values) + 1):
+        first, second = values[:split], values[split:]
+        first_type = dcs.detect_column_type(first, skip_values=["NA"])
+
+        continued = dcs.detect_column_type(second, skip_values=["NA"], current_type=first_type)
+        assert continued == expected
+
+        merged = dcs.merge_data_types(
+            first_type,
+            dcs.detect_column_type(second, skip_values=["NA"]),
+            has_bool=any(isinstance(value, bool) for value in second),
+        )
+        assert merged == expected
+
+
+def test_infer_types_parallel_shards(dcs, monkeypatch):
+    monkeypatch.setattr("parsons.databases.database.database.TYPE_INFERENCE_SHARD_SIZE", 2)
+
+    # A bool in a later shard resets the type detected for the earlier ones
+    tbl = Table([["a", "b"], [1, True], [40000, 2], [3, 3], [True, 4], [5, 100000]])
+    expected = [dcs.detect_column_type(tbl["a"]), dcs.detect_column_type(tbl["b"])]
+    assert expected == [SMALLINT, MEDIUMINT]
+
+    assert dcs.infer_types_parallel(tbl, processes=2)[0] == expected
+    assert dcs.infer_types_parallel(tbl, processes=1)[0] == expected
+
+
+def test_infer_types(dcs):
+    tbl = Table(
+        [["id", "name", "score"]]
+        + [[i, f"name {i}", i / 2] for i in range(50)]
+        + [[100000, "a much longer name", "NA"]]
+    )
+    expected = ([MEDIUMINT, VARCHAR, FLOAT], [6, 18, 4])
+
+    assert dcs.infer_types_parallel(tbl, processes=2, skip_values=["NA"]) == expected
+
+    # A sample as large as the table sees every row
+    assert dcs.infer_types_sample(tbl, 1000, skip_values=["NA"]) == expected
+
+    types, widths = dcs.infer_types_sample(tbl, 5, skip_values=["NA"], seed=1)
+    assert len(types) == 3
+    assert all(width <= expected_width for width, expected_width in zip(widths, expected[1]))
@@ -1,8 +1,14 @@
 from parsons import Postgres, DBSync, Table, Redshift
-from test.test_databases.fakes import FakeDatabase
+from parsons.databases.checkpoint import FileCheckpointStore
+from parsons.databases.db_sync import _partition_key_range
+from test.test_databases.fakes import FakeDatabase, FakeUpsertDatabase
 from test.utils import assert_matching_tables
 import unittest
+from decimal import Decimal
+from unittest import mock
 import os
+import shutil
+import tempfile
 
 _dir = os.path.dirname(__file__)
 
@@ -340,3 +346,499 @@ class TestFakeDBSync(unittest.TestCase):
             2,
             self.fake_destination.copy_call_args,
         )
+
+    def test_table_sync_full_keyset(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2)
+        source_data = Table(
+            [
+                {"id": 3, "value": 111},
+                {"id": 1, "value": 11},
+                {"id": 5, "value": 1231},
+                {"id": 2, "value": 121142},
+                {"id": 4, "value": 12211},
+            ]
+        )
+        source = self.fake_source.setup_table("source", source_data)
+
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        self.assertEqual(destination.data["id"], [1, 2, 3, 4, 5])
+
+        # Each chunk picks up after the last key read, rather than using an offset
+        self.assertEqual(
+            [(args["cutoff_value"], args["offset"]) for args in source.get_new_rows_call_args],
+            [(None, 0), (2, 0), (4, 0), (5, 0)],
+        )
+
+    def test_table_sync_full_keyset_order_by_mismatch(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination)
+        self.fake_source.setup_table("source", Table([{"id": 1, "value": 11}]))
+
+        self.assertRaises(
+            ValueError,
+            dbsync.table_sync_full,
+            "source",
+            "destination",
+            primary_key="id",
+            order_by="value",
+        )
+
+    def test_table_sync_incremental_keyset(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2)
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 8)])
+        source = self.fake_source.setup_table("source", source_data)
+        self.fake_destination.setup_table("destination", Table([{"id": 1, "value": 10}]))
+
+        dbsync.table_sync_incremental("source", "destination", "id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+        self.assertEqual(
+            [args["cutoff_value"] for args in source.get_new_rows_call_args], [1, 3, 5, 7]
+        )
+
+    def test_table_sync_without_read_ahead(self):
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=2, read_ahead_chunks=0
+        )
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 6)])
+        self.fake_source.setup_table("source", source_data)
+
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+        self.assertEqual(len(self.fake_destination.copy_call_args), 3)
+
+    def test_table_sync_read_retry(self):
+        # Read failures on the background reader draw on the same retries as writes
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 6)])
+        source = self.fake_source.setup_table("source", source_data)
+        get_new_rows = source.get_new_rows
+        failures = [ValueError("Canned read error")]
+
+        def flaky_get_new_rows(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return get_new_rows(*args, **kwargs)
+
+        source.get_new_rows = flaky_get_new_rows
+        self.fake_destination.setup_table("destination", Table(), failures=1)
+
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2, retries=2)
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+
+        # With only one retry, the second failure is raised
+        failures.append(ValueError("Canned read error"))
+        self.fake_destination.setup_table("destination", Table(), failures=1)
+
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2, retries=1)
+        self.assertRaises(
+            ValueError, dbsync.table_sync_full, "source", "destination", primary_key="id"
+        )
+
+    def test_table_sync_full_stream(self):
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=2, stream_source=True
+        )
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 6)])
+        source = self.fake_source.setup_table("source", source_data)
+
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+
+        # One query for the whole table, instead of one per chunk
+        self.assertEqual(len(source.stream_rows_call_args), 1)
+        self.assertEqual(source.get_new_rows_call_args, [])
+
+    def test_table_sync_incremental_stream(self):
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=2, stream_source=True
+        )
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 8)])
+        source = self.fake_source.setup_table("source", source_data)
+        self.fake_destination.setup_table("destination", Table([{"id": 1, "value": 10}]))
+
+        dbsync.table_sync_incremental("source", "destination", "id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+        self.assertEqual(source.stream_rows_call_args[0]["cutoff_value"], 1)
+
+    def test_table_sync_stream_retry(self):
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 8)])
+
+        # The stream fails after two chunks, and restarts after the last key read
+        source = self.fake_source.setup_table("source", source_data)
+        source.stream_failures = [2]
+
+        dbsync = DBSync(
+            self.fake_source,
+            self.fake_destination,
+            read_chunk_size=2,
+            retries=1,
+            stream_source=True,
+        )
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+        self.assertEqual([args["cutoff_value"] for args in source.stream_rows_call_args], [None, 4])
+
+        # Without a primary key, rows already read are skipped
+        source = self.fake_source.setup_table("source", source_data)
+        source.stream_failures = [1]
+
+        dbsync.table_sync_full("source", "destination", order_by="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(source_data, destination.data)
+        self.assertEqual(len(source.stream_rows_call_args), 2)
+
+        # Out of retries
+        source = self.fake_source.setup_table("source", source_data)
+        source.stream_failures = [1, 1]
+
+        self.assertRaises(
+            ValueError, dbsync.table_sync_full, "source", "destination", primary_key="id"
+        )
+
+    def test_table_sync_full_parallel(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=3)
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 21)])
+        source = self.fake_source.setup_table("source", source_data)
+
+        dbsync.table_sync_full("source", "destination", primary_key="id", parallelism=4)
+
+        destination = self.fake_destination.table("destination")
+        self.assertEqual(sorted(destination.data["id"]), list(range(1, 21)))
+
+        # Every partition reads its own range of keys
+        upper_bounds = {args["upper_bound"] for args in source.get_new_rows_call_args}
+        self.assertEqual(upper_bounds, {5, 10, 15, None})
+
+    def test_table_sync_full_parallel_requires_primary_key(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination)
+        self.fake_source.setup_table("source", Table([{"id": 1, "value": 11}]))
+
+        self.assertRaises(
+            ValueError, dbsync.table_sync_full, "source", "destination", parallelism=2
+        )
+
+    def test_table_sync_full_parallel_partition_retry(self):
+        # Retries apply within each partition
+        dbsync = DBSync(self.fake_source, self.fake_destination, retries=1)
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 11)])
+        self.fake_source.setup_table("source", source_data)
+        self.fake_destination.setup_table("destination", Table(), failures=1)
+
+        dbsync.table_sync_full("source", "destination", primary_key="id", parallelism=2)
+
+        destination = self.fake_destination.table("destination")
+        self.assertEqual(sorted(destination.data["id"]), list(range(1, 11)))
+
+    def test_table_sync_full_parallel_creates_table(self):
+        dbsync = DBSync(self.fake_source, self.fake_destination)
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 11)])
+        self.fake_source.setup_table("source", source_data)
+
+        # The destination is created before any partition starts copying
+        copies_at_create = []
+        self.fake_destination.create_table = mock.MagicMock(
+            side_effect=lambda *args: copies_at_create.append(
+                len(self.fake_destination.copy_call_args)
+            )
+        )
+        dbsync.table_sync_full("source", "destination", primary_key="id", parallelism=2)
+        self.assertEqual(copies_at_create, [0])
+
+        # If it can't be created, nothing is copied
+        self.fake_destination.create_table.side_effect = ValueError("Canned error")
+        copies = len(self.fake_destination.copy_call_args)
+        self.assertRaises(
+            ValueError,
+            dbsync.table_sync_full,
+            "source",
+            "destination_2",
+            primary_key="id",
+            parallelism=2,
+        )
+        self.assertEqual(len(self.fake_destination.copy_call_args), copies)
+
+    def test_table_sync_full_parallel_stops_on_failure(self):
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=1, read_ahead_chunks=0
+        )
+        source_data = Table([{"id": i, "value": i * 10} for i in range(1, 11)])
+        self.fake_source.setup_table("source", source_data)
+
+        stop_events = []
+        copy_rows = dbsync.copy_rows
+
+        def record_stop_event(*args, **kwargs):
+            stop_events.append(kwargs["stop_event"])
+            return copy_rows(*args, **kwargs)
+
+        dbsync.copy_rows = record_stop_event
+        copy = self.fake_destination.copy
+
+        def failing_copy(data, table_name, **kwargs):
+            # The first partition fails, while the second waits to be told to stop
+            if data["id"][0] <= 5:
+                raise ValueError("Canned error")
+            stop_events[0].wait(5)
+            copy(data, table_name, **kwargs)
+
+        self.fake_destination.copy = failing_copy
+        self.assertRaises(
+            ValueError,
+            dbsync.table_sync_full,
+            "source",
+            "destination",
+            primary_key="id",
+            parallelism=2,
+        )
+
+        # The second partition stopped before its next write, rather than copying all of
+        # its five rows
+        destination = self.fake_destination.table("destination")
+        self.assertLessEqual(destination.data.num_rows if destination.data else 0, 1)
+
+    def test_partition_key_range(self):
+        self.assertEqual(
+            _partition_key_range(1, 100, 4), [(None, 25), (25, 50), (50, 75), (75, None)]
+        )
+        self.assertEqual(_partition_key_range(0.0, 1.0, 2), [(None, 0.5), (0.5, None)])
+        self.assertEqual(
+            _partition_key_range(Decimal("0"), 1.0, 2),
+            [(None, Decimal("0.5")), (Decimal("0.5"), None)],
+        )
+
+        # Small ranges produce fewer partitions
+        self.assertEqual(_partition_key_range(1, 2, 4), [(None, 1), (1, None)])
+
+        # Keys that can't be split produce a single partition
+        self.assertEqual(_partition_key_range("a", "z", 4), [(None, None)])
+        self.assertEqual(_partition_key_range(None, None, 4), [(None, None)])
+
+
+class TestFakeDBSyncCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.fake_source = FakeDatabase()
+        self.fake_destination = FakeDatabase()
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = FileCheckpointStore(os.path.join(self.temp_dir, "checkpoints.json"))
+        self.source_data = Table([{"id": i, "value": i * 10} for i in range(1, 8)])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def fail_copy_after(self, successful_copies):
+        copy = self.fake_destination.copy
+        calls = []
+
+        def failing_copy(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > successful_copies:
+                raise ValueError("Canned error")
+            return copy(*args, **kwargs)
+
+        self.fake_destination.copy = failing_copy
+        return copy
+
+    def test_table_sync_full_resume(self):
+        source = self.fake_source.setup_table("source", self.source_data)
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=2, checkpoint_store=self.store
+        )
+
+        # Fail after two chunks are written
+        copy = self.fail_copy_after(2)
+        self.assertRaises(
+            ValueError, dbsync.table_sync_full, "source", "destination", primary_key="id"
+        )
+        self.assertEqual(
+            self.store.get("source -> destination"),
+            {"primary_key": "id", "position": 4, "rows_written": 4},
+        )
+
+        # The next sync picks up after the last row written, without dropping the table
+        self.fake_destination.copy = copy
+        source.get_new_rows_call_args.clear()
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(self.source_data, destination.data)
+        self.assertEqual(source.get_new_rows_call_args[0]["cutoff_value"], 4)
+        self.assertIsNone(self.store.get("source -> destination"))
+
+    def test_table_sync_full_resume_offset(self):
+        self.fake_source.setup_table("source", self.source_data)
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=3, checkpoint_store=self.store
+        )
+
+        copy = self.fail_copy_after(1)
+        self.assertRaises(ValueError, dbsync.table_sync_full, "source", "destination")
+        self.assertEqual(self.store.get("source -> destination")["position"], 3)
+
+        self.fake_destination.copy = copy
+        dbsync.table_sync_full("source", "destination")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(self.source_data, destination.data)
+
+    def test_table_sync_parallel_resume(self):
+        self.fake_source.setup_table("source", self.source_data)
+        dbsync = DBSync(
+            self.fake_source,
+            self.fake_destination,
+            read_chunk_size=2,
+            read_ahead_chunks=0,
+            checkpoint_store=self.store,
+        )
+
+        copy = self.fail_copy_after(1)
+        self.assertRaises(
+            ValueError,
+            dbsync.table_sync_full,
+            "source",
+            "destination",
+            primary_key="id",
+            parallelism=2,
+        )
+        plan = self.store.get("source -> destination")
+        self.assertEqual(plan, {"primary_key": "id", "partitions": [[None, 4], [4, None]]})
+
+        self.fake_destination.copy = copy
+        dbsync.table_sync_full("source", "destination", primary_key="id", parallelism=2)
+
+        destination = self.fake_destination.table("destination")
+        self.assertEqual(sorted(destination.data["id"]), list(range(1, 8)))
+        self.assertIsNone(self.store.get("source -> destination"))
+
+    def test_table_sync_full_discards_partition_plan(self):
+        self.fake_source.setup_table("source", self.source_data)
+        dbsync = DBSync(
+            self.fake_source,
+            self.fake_destination,
+            read_chunk_size=2,
+            read_ahead_chunks=0,
+            checkpoint_store=self.store,
+        )
+
+        copy = self.fail_copy_after(1)
+        self.assertRaises(
+            ValueError,
+            dbsync.table_sync_full,
+            "source",
+            "destination",
+            primary_key="id",
+            parallelism=2,
+        )
+
+        # A serial sync can't pick up a partitioned one, so it starts over from an empty table
+        self.fake_destination.copy = copy
+        dbsync.table_sync_full("source", "destination", primary_key="id")
+
+        destination = self.fake_destination.table("destination")
+        assert_matching_tables(self.source_data, destination.data)
+        self.assertIsNone(self.store.get("source -> destination"))
+        self.assertIsNone(self.store.get("source -> destination [0]"))
+
+    def test_table_sync_parallel_discards_serial_checkpoint(self):
+        self.fake_source.setup_table("source", self.source_data)
+        dbsync = DBSync(
+            self.fake_source, self.fake_destination, read_chunk_size=2, checkpoint_store=self.store
+        )
+
+        copy = self.fail_copy_after(2)
+        self.assertRaises(ValueError, dbsync.table_sync_full, "source", "destination")
+
+        # Nor can a partitioned sync by primary key pick up a serial one paged by offset
+        self.fake_destination.copy = copy
+        dbsync.table_sync_full("source", "destination", primary_key="id", parallelism=2)
+
+        destination = self.fake_destination.table("destination")
+        self.assertEqual(sorted(destination.data["id"]), list(range(1, 8)))
+
+
+class TestFakeDBSyncWatermark(unittest.TestCase):
+    def setUp(self):
+        self.fake_source = FakeDatabase()
+        self.fake_destination = FakeUpsertDatabase()
+
+        self.source_data = Table(
+            [
+                {"id": 1, "value": "a", "updated_at": 1},
+                {"id": 2, "value": "b2", "updated_at": 5},
+                {"id": 3, "value": "c", "updated_at": 2},
+                {"id": 4, "value": "d2", "updated_at": 5},
+                {"id": 5, "value": "e", "updated_at": 6},
+                {"id": 6, "value": "f", "updated_at": None},
+            ]
+        )
+        self.destination_data = Table(
+            [
+                {"id": 1, "value": "a", "updated_at": 1},
+                {"id": 2, "value": "b", "updated_at": 3},
+                {"id": 3, "value": "c", "updated_at": 2},
+                {"id": 4, "value": "d", "updated_at": 4},
+            ]
+        )
+
+    def test_table_sync_incremental_watermark(self):
+        source = self.fake_source.setup_table("source", self.source_data)
+        self.fake_destination.setup_table("destination", self.destination_data)
+
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2)
+        dbsync._row_count_verify = mock.MagicMock()
+        dbsync.table_sync_incremental("source", "destination", "id", watermark_column="updated_at")
+
+        # Deletes aren't synced, so the row counts aren't compared by default
+        dbsync._row_count_verify.assert_not_called()
+
+        destination = self.fake_destination.table("destination")
+        rows = sorted(destination.data, key=lambda row: row["id"])
+        self.assertEqual([row["value"] for row in rows], ["a", "b2", "c", "d2", "e"])
+
+        # Only rows changed since the destination watermark are read, paged by
+        # (watermark, primary key)
+        self.assertEqual(
+            [call["last_position"] for call in source.get_changed_rows_call_args],
+            [None, [5, 4], [6, 5]],
+        )
+        self.assertEqual(source.get_changed_rows_call_args[0]["watermark"], 4)
+        self.assertEqual(self.fake_destination.copy_call_args, [])
+
+    def test_table_sync_incremental_watermark_null_in_destination(self):
+        source = self.fake_source.setup_table("source", self.source_data)
+        self.destination_data.stack(Table([{"id": 6, "value": "f", "updated_at": None}]))
+        self.fake_destination.setup_table("destination", self.destination_data)
+
+        dbsync = DBSync(self.fake_source, self.fake_destination, read_chunk_size=2)
+        dbsync.table_sync_incremental("source", "destination", "id", watermark_column="updated_at")
+
+        # A row without a watermark in the destination doesn't reset the sync to a full read
+        self.assertEqual(source.get_changed_rows_call_args[0]["watermark"], 4)
+
+    def test_table_sync_incremental_watermark_requires_upsert(self):
+        self.fake_source.setup_table("source", self.source_data)
+        destination = FakeDatabase()
+        destination.setup_table("destination", self.destination_data)
+
+        dbsync = DBSync(self.fake_source, destination)
+        self.assertRaises(
+            NotImplementedError,
+            dbsync.table_sync_incremental,
+            "source",
+            "destination",
+            "id",
+            watermark_column="updated_at",
+        )
@@ -1,7 +1,9 @@
 from parsons import MySQL, Table
 from parsons.databases.mysql.create_table import MySQLCreateTable
 from test.utils import assert_matching_tables
+import datetime
 import unittest
+from unittest import mock
 import os
 
 
@@ -43,6 +45,18 @@ class TestMySQLLive(unittest.TestCase):
 
         assert_matching_tables(Table([{"name": "me", "user_name": "myuser"}]), r)
 
+    def test_copy(self):
+
+        tbl = Table([["name", "user_name"], ["me", None], ["you", "tab\tuser"]])
+
+        self.mysql.copy(tbl, "test", if_exists="drop", engine="insert")
+        assert_matching_tables(tbl, self.mysql.query("select * from test"))
+
+        if self.mysql.query("SELECT @@local_infile").first:
+            loader = MySQL(allow_local_infile=True)
+            loader.copy(tbl, "test", if_exists="truncate", engine="load_data")
+            assert_matching_tables(tbl, self.mysql.query("select * from test"))
+
 
 # These tests interact directly with the MySQL database. To run, set env variable "LIVE_TEST=True"
 @unittest.skipIf(not os.environ.get("LIVE_TEST"), "Skipping because not running live test")
@@ -186,3 +200,154 @@ class TestMySQL(unittest.TestCase):  # noqa
 
         stmt = "CREATE TABLE test_table ( \n id smallint \n,name varchar(10) \n,score float \n);"
         self.assertEqual(self.mysql.create_statement(self.tbl, "test_table"), stmt)
+
+    def _mock_stream_connection(self, rows):
+        connection = mock.MagicMock()
+        cursor = connection.cursor.return_value
+        cursor.column_names = ("id", "name")
+        cursor.description = [("id",), ("name",)]
+        cursor.with_rows = True
+
+        batches = [rows[i : i + 2] for i in range(0, len(rows), 2)]
+        cursor.fetchmany.side_effect = lambda size: batches.pop(0) if batches else []
+
+        return connection, cursor
+
+    def test_query_stream(self):
+
+        rows = [(i, f"name_{i}") for i in range(5)]
+        connection, cursor = self._mock_stream_connection(rows)
+
+        tbl = self.mysql.query_with_connection(
+            "select * from t", connection, stream=True, itersize=2
+        )
+
+        connection.cursor.assert_called_once_with(buffered=False)
+        self.assertEqual(cursor.fetchmany.call_args_list[:4], [mock.call(2)] * 4)
+        self.assertEqual(tbl.num_rows, 5)
+        self.assertEqual(tbl[4], {"id": 4, "name": "name_4"})
+
+        # The rows are read before the commit
+        self.assertEqual([c[0] for c in connection.mock_calls][-2:], ["cursor().close", "commit"])
+
+    def test_query_stream_multiple_statements(self):
+
+        connection, cursor = self._mock_stream_connection([])
+
+        with self.assertRaises(ValueError):
+            self.mysql.query_with_connection("select 1; select 2;", connection, stream=True)
+        cursor.execute.assert_not_called()
+
+    def test_unbuffered_cursor_drain_error(self):
+
+        connection, cursor = self._mock_stream_connection([])
+        cursor.fetchmany.side_effect = Exception("Lost connection to MySQL server")
+        self.mysql.pool = mock.MagicMock()
+        self.mysql.pool.acquire.return_value = connection
+
+        # The error from the block isn't replaced by the error reading the unread rows
+        with self.assertRaises(ValueError):
+            with self.mysql.connection() as conn:
+                with self.mysql.unbuffered_cursor(conn):
+                    raise ValueError("original")
+
+        # The connection is discarded rather than returned to the pool
+        self.mysql.pool.release.assert_called_once_with(connection, discard=True)
+        self.assertEqual(self.mysql._broken_connections, set())
+
+        # Without an error in the block, the drain error is raised
+        with self.assertRaisesRegex(Exception, "Lost connection"):
+            with self.mysql.unbuffered_cursor(connection):
+                pass
+
+    def test_query_batches(self):
+
+        rows = [(i, f"name_{i}") for i in range(5)]
+        connection, cursor = self._mock_stream_connection(rows)
+
+        with mock.patch.object(self.mysql, "connection") as connection_mock:
+            connection_mock.return_value.__enter__.return_value = connection
+            batches = list(self.mysql.query_batches("select * from t", itersize=2))
+
+        self.assertEqual([b.num_rows for b in batches], [2, 2, 1])
+        self.assertEqual(batches[2][0], {"id": 4, "name": "name_4"})
+
+    def test_stream_rows(self):
+
+        with mock.patch.object(self.mysql, "query_batches") as query_batches:
+            self.mysql.table("test").stream_rows(
+                order_by="id", cutoff_value=5, upper_bound=10, chunk_size=100
+            )
+
+        query_batches.assert_called_once_with(
+            "SELECT * FROM test WHERE id > %s AND id <= %s ORDER BY id", [5, 10], itersize=100
+        )
+
+    def _mock_copy(self, tbl, **kwargs):
+        cursor = mock.MagicMock()
+
+        with mock.patch.object(self.mysql, "connection"), mock.patch.object(
+            self.mysql, "_create_table_precheck", return_value=False
+        ), mock.patch.object(self.mysql, "cursor") as cursor_mock:
+            cursor_mock.return_value.__enter__.return_value = cursor
+            self.mysql.copy(tbl, "test_table", if_exists="append", **kwargs)
+
+        return cursor
+
+    def test_copy_insert(self):
+
+        tbl = Table([["id", "day"], [1, datetime.date(2020, 1, 2)], [2, None]])
+        cursor = self._mock_copy(tbl)
+
+        # Local files aren't allowed by default, so rows are inserted with parameters
+        cursor.executemany.assert_called_once_with(
+            "INSERT INTO test_table (id,day) VALUES (%s, %s)",
+            [(1, datetime.date(2020, 1, 2)), (2, None)],
+        )
+
+        self.assertRaises(ValueError, self._mock_copy, tbl, engine="bulk")
+
+    def test_copy_batches(self):
+
+        # Each row is about 20 bytes, so batches are limited by size
+        batches = list(self.mysql._batches(self.tbl, max_rows=1000, max_bytes=50))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+        # ...or by the row limit
+        batches = list(self.mysql._batches(self.tbl, max_rows=1, max_bytes=1000))
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1])
+
+        # A row larger than the limit still gets its own batch
+        batches = list(self.mysql._batches(self.tbl, max_rows=1000, max_bytes=1))
+        self.assertEqual([len(batch) for batch in batches], [1, 1, 1])
+
+    def test_copy_load_data(self):
+
+        self.mysql.allow_local_infile = True
+        tbl = Table([["id", "name"], [1, "tab\there"], [2, None], [3, "back\\slash"], [4, True]])
+
+        written = []
+
+        def close_temp_file(path):
+            with open(path) as f:
+                written.append(f.read())
+
+        with mock.patch("parsons.databases.mysql.mysql.files.close_temp_file", close_temp_file):
+            cursor = self._mock_copy(tbl, engine="load_data")
+
+        self.assertIn("LOAD DATA LOCAL INFILE", cursor.execute.call_args[0][0])
+        self.assertEqual(written, ["1\ttab\\there\n2\t\\N\n3\tback\\\\slash\n4\t1\n"])
+
+    def test_copy_load_data_path_escaped(self):
+
+        self.mysql.allow_local_infile = True
+        path = "C:\\Temp\\O'Brien\\tmp.tsv"
+
+        with mock.patch.object(self.mysql, "_write_load_data_file", return_value=path):
+            with mock.patch("parsons.databases.mysql.mysql.files.close_temp_file"):
+                cursor = self._mock_copy(self.tbl, engine="load_data")
+
+        self.assertIn(
+            "LOAD DATA LOCAL INFILE 'C:\\\\Temp\\\\O\\'Brien\\\\tmp.tsv'",
+            cursor.execute.call_args[0][0],
+        )
@@ -1,6 +1,18 @@
 from parsons import Postgres, Table
+from parsons.databases.postgres.copy_stream import (
+    PGCOPY_HEADER,
+    PGCOPY_TRAILER,
+    binary_copy_stream,
+    csv_copy_stream,
+)
 from test.utils import assert_matching_tables
+from decimal import Decimal
+import datetime
+import struct
+import threading
+import time
 import unittest
+from unittest import mock
 import os
 
 # The name of the schema and will be temporarily created for the tests
@@ -152,6 +164,310 @@ class TestPostgresCreateStatement(unittest.TestCase):
         self.assertRaises(ValueError, self.pg.create_statement, empty_table, "tmc.test")
 
 
+class FakeCursor:
+    def __init__(self, connection, rows, name=None):
+        self.connection = connection
+        self.rows = list(rows)
+        self.name = name
+        self.description = None
+        self.fetch_sizes = []
+
+    def execute(self, sql, parameters=None):
+        # Like psycopg2, a named cursor only has a description once rows are fetched
+        if not self.name:
+            self.description = [("id",), ("name",)]
+
+    def fetchmany(self, size):
+        self.description = [("id",), ("name",)]
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.connection.events.append("close")
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.events = []
+        self.cursors = []
+
+    def cursor(self, name=None, cursor_factory=None):
+        cursor = FakeCursor(self, self.rows, name=name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.events.append("commit")
+
+
+class TestPostgresStreaming(unittest.TestCase):
+    def setUp(self):
+
+        self.pg = Postgres(username="test", password="test", host="test", db="test", port=123)
+        self.rows = [[i, f"name_{i}"] for i in range(5)]
+
+    def test_query_stream(self):
+
+        conn = FakeConnection(self.rows)
+        tbl = self.pg.query_with_connection("select * from t", conn, stream=True, itersize=2)
+
+        self.assertEqual(tbl.num_rows, 5)
+        self.assertEqual(tbl[4], {"id": 4, "name": "name_4"})
+
+        cursor = conn.cursors[0]
+        self.assertIsNotNone(cursor.name)
+        self.assertEqual(cursor.itersize, 2)
+        self.assertEqual(cursor.fetch_sizes, [2, 2, 2, 2])
+
+        # The server-side cursor is closed before committing
+        self.assertEqual(conn.events, ["close", "commit"])
+
+    def test_query_batches(self):
+
+        conn = FakeConnection(self.rows)
+
+        @mock.patch.object(self.pg, "connection")
+        def run(connection_mock):
+            connection_mock.return_value.__enter__.return_value = conn
+            return list(self.pg.query_batches("select * from t", itersize=2))
+
+        batches = run()
+        self.assertEqual([b.num_rows for b in batches], [2, 2, 1])
+        self.assertEqual(batches[2][0], {"id": 4, "name": "name_4"})
+
+
+class TestPostgresCopyStream(unittest.TestCase):
+    def setUp(self):
+
+        self.pg = Postgres(username="test", password="test", host="test", db="test", port=123)
+        self.tbl = Table([["ID", "Name"], [1, "Jim"], [2, "John, Jr."], [3, None]])
+
+    def test_csv_copy_stream(self):
+
+        with open(self.tbl.to_csv(), "r", newline="") as f:
+            expected = f.read()
+
+        self.assertEqual(csv_copy_stream(self.tbl).read(), expected)
+
+        # Reading in small pieces gives the same result
+        stream = csv_copy_stream(self.tbl)
+        pieces = []
+        while True:
+            piece = stream.read(5)
+            if not piece:
+                break
+            self.assertLessEqual(len(piece), 5)
+            pieces.append(piece)
+        self.assertEqual("".join(pieces), expected)
+
+    def test_binary_copy_stream(self):
+
+        data = binary_copy_stream(self.tbl, ["integer", "character varying(10)"]).read()
+
+        self.assertTrue(data.startswith(PGCOPY_HEADER))
+        self.assertTrue(data.endswith(PGCOPY_TRAILER))
+
+        rows = data[len(PGCOPY_HEADER) : -len(PGCOPY_TRAILER)]
+        expected = (
+            struct.pack(">h", 2)
+            + b"\x00\x00\x00\x04\x00\x00\x00\x01"
+            + b"\x00\x00\x00\x03Jim"
+            + struct.pack(">h", 2)
+            + b"\x00\x00\x00\x04\x00\x00\x00\x02"
+            + b"\x00\x00\x00\x09John, Jr."
+            + struct.pack(">h", 2)
+            + b"\x00\x00\x00\x04\x00\x00\x00\x03"
+            + b"\xff\xff\xff\xff"
+        )
+        self.assertEqual(rows, expected)
+
+        self.assertRaises(ValueError, binary_copy_stream, self.tbl, ["integer", "point"])
+
+        # Rows that don't match the number of columns fail locally
+        short_row = Table([["ID", "Name"], [1, "Jim"], [2]])
+        stream = binary_copy_stream(short_row, ["integer", "text"])
+        self.assertRaises(ValueError, stream.read)
+
+    def test_binary_values(self):
+        def encode(value, column_type):
+            data = binary_copy_stream(Table([["a"], [value]]), [column_type]).read()
+            # Strip the header, field count, value length and trailer
+            return data[len(PGCOPY_HEADER) + 6 : -len(PGCOPY_TRAILER)]
+
+        self.assertEqual(encode("t", "boolean"), b"\x01")
+        self.assertEqual(encode(2.5, "double precision"), struct.pack(">d", 2.5))
+        self.assertEqual(encode("2000-01-02", "date"), struct.pack(">i", 1))
+        self.assertEqual(
+            encode(datetime.datetime(2000, 1, 1, 0, 0, 1), "timestamp without time zone"),
+            struct.pack(">q", 1000000),
+        )
+        # As with a CSV copy, the offset of an aware datetime is dropped for a timestamp,
+        # but used for a timestamptz, and dates are promoted to midnight
+        plus_two = datetime.timezone(datetime.timedelta(hours=2))
+        aware = datetime.datetime(2000, 1, 1, 2, 0, 1, tzinfo=plus_two)
+        self.assertEqual(
+            encode(aware, "timestamp without time zone"),
+            struct.pack(">q", (2 * 3600 + 1) * 1000000),
+        )
+        self.assertEqual(encode(aware, "timestamp with time zone"), struct.pack(">q", 1000000))
+        self.assertEqual(
+            encode(datetime.date(2000, 1, 2), "timestamp with time zone"),
+            struct.pack(">q", 86400 * 1000000),
+        )
+        self.assertRaises(ValueError, encode, 5, "timestamp without time zone")
+
+        # Naive datetimes copied to a timestamptz are in the session's time zone
+        naive = datetime.datetime(2000, 1, 1, 0, 0, 1)
+        data = binary_copy_stream(
+            Table([["a"], [naive]]), ["timestamp with time zone"], "America/New_York"
+        ).read()
+        self.assertEqual(
+            data[len(PGCOPY_HEADER) + 6 : -len(PGCOPY_TRAILER)],
+            struct.pack(">q", (5 * 3600 + 1) * 1000000),
+        )
+        self.assertRaises(
+            ValueError,
+            binary_copy_stream,
+            Table([["a"], [naive]]),
+            ["timestamp with time zone"],
+            "Not/A_Zone",
+        )
+        self.assertEqual(encode({"a": 1}, "jsonb"), b'\x01{"a": 1}')
+
+        # ndigits, weight, sign, dscale, then base 10000 digits
+        self.assertEqual(
+            encode(Decimal("12345.67"), "numeric"),
+            struct.pack(">hhHh3h", 3, 1, 0, 2, 1, 2345, 6700),
+        )
+        self.assertEqual(encode(-0.05, "numeric"), struct.pack(">hhHh1h", 1, -1, 0x4000, 2, 500))
+        self.assertEqual(encode(0, "numeric"), struct.pack(">hhHh", 0, 0, 0, 0))
+
+    def test_copy_binary(self):
+
+        cursor = mock.MagicMock()
+        cursor.fetchall.return_value = [("id", "integer"), ("name", "character varying")]
+        cursor.fetchone.return_value = ("UTC",)
+
+        with mock.patch.object(self.pg, "connection"), mock.patch.object(
+            self.pg, "_create_table_precheck", return_value=False
+        ), mock.patch.object(self.pg, "cursor") as cursor_mock:
+            cursor_mock.return_value.__enter__.return_value = cursor
+            self.pg.copy(self.tbl, "schema.table", if_exists="append", copy_format="binary")
+
+        sql, stream = cursor.copy_expert.call_args[0]
+        self.assertEqual(sql, 'COPY schema.table ("id", "name") FROM STDIN WITH (FORMAT binary);')
+        self.assertTrue(stream.read().startswith(PGCOPY_HEADER))
+
+        self.assertRaises(ValueError, self.pg.copy, self.tbl, "schema.table", copy_format="tsv")
+
+
+class TestPostgresUpsert(unittest.TestCase):
+    def setUp(self):
+
+        self.pg = Postgres(username="test", password="test", host="test", db="test", port=123)
+        self.tbl = Table([["id", "name"], [1, "Jim"], [2, "John"], [3, "Sarah"]])
+
+    def _mock_upsert(self, *args, exists=True, **kwargs):
+        cursor = mock.MagicMock()
+        cursor.fetchone.return_value = (1, 1)
+
+        with mock.patch.object(self.pg, "connection"), mock.patch.object(
+            self.pg, "table_exists", return_value=exists
+        ), mock.patch.object(self.pg, "cursor") as cursor_mock, mock.patch.object(
+            self.pg, "copy"
+        ) as copy_mock:
+            cursor_mock.return_value.__enter__.return_value = cursor
+            counts = self.pg.upsert(self.tbl, "schema.target", *args, **kwargs)
+
+        return counts, cursor, copy_mock
+
+    def test_upsert(self):
+
+        counts, cursor, _ = self._mock_upsert("id")
+
+        sql = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertIn("SELECT id, name FROM schema.target WITH NO DATA", sql[0])
+        self.assertIn("ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name", sql[2])
+
+        copy_sql, stream = cursor.copy_expert.call_args[0]
+        self.assertRegex(copy_sql, r"COPY parsons_upsert_\w+ \(id, name\) FROM STDIN CSV HEADER")
+        self.assertEqual(stream.read().splitlines()[1], "1,Jim")
+
+        self.assertEqual(counts, {"inserted": 1, "updated": 1})
+
+    def test_upsert_batches(self):
+
+        counts, cursor, _ = self._mock_upsert(["id", "name"], batch_size=2)
+
+        # Every column is part of the key, so there is nothing to update
+        self.assertIn("ON CONFLICT (id, name) DO NOTHING", cursor.execute.call_args[0][0])
+        self.assertEqual(cursor.copy_expert.call_count, 2)
+        self.assertEqual(counts, {"inserted": 2, "updated": 2})
+
+    def test_upsert_new_table(self):
+
+        counts, cursor, copy_mock = self._mock_upsert("id", exists=False)
+
+        copy_mock.assert_called_once_with(self.tbl, "schema.target")
+        cursor.execute.assert_not_called()
+        self.assertEqual(counts, {"inserted": 3, "updated": 0})
+
+
+class TestPostgresQueryMany(unittest.TestCase):
+    def setUp(self):
+
+        self.pg = Postgres(username="test", password="test", host="test", db="test", port=123)
+
+    def test_query_many(self):
+
+        running = []
+        most_running = []
+        lock = threading.Lock()
+
+        def query(sql, parameters=None):
+            with lock:
+                running.append(sql)
+                most_running.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(sql)
+            return Table([{"sql": sql, "parameters": parameters}])
+
+        with mock.patch.object(self.pg, "query", side_effect=query):
+            results = self.pg.query_many(
+                [f"select {i}" for i in range(6)],
+                parameters=[[i] for i in range(6)],
+                max_workers=3,
+            )
+
+        # Results are in the same order as the queries
+        self.assertEqual([r.first for r in results], [f"select {i}" for i in range(6)])
+        self.assertEqual(results[5][0]["parameters"], [5])
+        self.assertEqual(max(most_running), 3)
+
+        self.assertRaises(ValueError, self.pg.query_many, ["select 1"], parameters=[])
+
+    def test_query_many_errors(self):
+
+        def query(sql, parameters=None):
+            if sql == "bad":
+                raise ValueError("bad query")
+            return Table([{"sql": sql}])
+
+        with mock.patch.object(self.pg, "query", side_effect=query) as query_mock:
+            self.assertRaises(ValueError, self.pg.query_many, ["bad", "select 1"])
+
+            # The other queries still ran
+            self.assertEqual(query_mock.call_count, 2)
+
+            results = self.pg.query_many(["bad", "select 1"], return_errors=True)
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1].first, "select 1")
+
+
 # These tests interact directly with the Postgres database
 
 
@@ -207,6 +523,17 @@ class TestPostgresDB(unittest.TestCase):
         r = self.pg.query(sql, parameters=names)
         self.assertEqual(r.num_rows, 2)
 
+    def test_query_stream(self):
+        self.pg.copy(self.tbl, f"{self.temp_schema}.test", if_exists="append")
+
+        sql = f"select * from {self.temp_schema}.test order by id"
+        r = self.pg.query(sql, stream=True, itersize=2)
+        self.assertEqual(r.num_rows, 3)
+        self.assertEqual(r[2]["name"], "Sarah")
+
+        batches = list(self.pg.query_batches(sql, itersize=2))
+        self.assertEqual([b.num_rows for b in batches], [2, 1])
+
     def test_copy(self):
 
         # Copy a table and ensure table exists
@@ -241,6 +568,45 @@ class TestPostgresDB(unittest.TestCase):
             if_exists="fail",
         )
 
+    def test_copy_binary(self):
+
+        tbl = Table([["id", "name"], [1, "Jim"], [2, None]])
+        self.pg.copy(tbl, f"{self.temp_schema}.test", if_exists="append", copy_format="binary")
+
+        r = self.pg.query(f"select * from {self.temp_schema}.test order by id")
+        self.assertEqual(r[0], {"id": 1, "name": "Jim"})
+        self.assertIsNone(r[1]["name"])
+
+    def test_copy_binary_timestamps_match_csv(self):
+
+        # Naive and aware values, for columns with and without a time zone
+        naive = datetime.datetime(2000, 1, 1, 2, 0, 1)
+        aware = naive.replace(tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        tbl = Table([["id", "ts", "tstz"], [1, naive, naive], [2, aware, aware]])
+
+        for copy_format in ("csv", "binary"):
+            table_name = f"{self.temp_schema}.test_{copy_format}"
+            self.pg.query(f"create table {table_name} (id int, ts timestamp, tstz timestamptz)")
+            self.pg.copy(tbl, table_name, if_exists="append", copy_format=copy_format)
+
+        csv_rows = self.pg.query(f"select * from {self.temp_schema}.test_csv order by id")
+        binary_rows = self.pg.query(f"select * from {self.temp_schema}.test_binary order by id")
+        assert_matching_tables(csv_rows, binary_rows)
+
+    def test_upsert(self):
+
+        table_name = f"{self.temp_schema}.test_upsert"
+        self.pg.query(f"create table {table_name} (id int primary key, name varchar(10))")
+        self.pg.copy(self.tbl, table_name, if_exists="append")
+
+        upsert_tbl = Table([["id", "name"], [1, "Jimmy"], [4, "Ann"], [5, "Bo"]])
+        counts = self.pg.upsert(upsert_tbl, table_name, "id", batch_size=2)
+        self.assertEqual(counts, {"inserted": 2, "updated": 1})
+
+        r = self.pg.query(f"select * from {table_name} order by id")
+        self.assertEqual(r.num_rows, 5)
+        self.assertEqual(r[0]["name"], "Jimmy")
+
     def test_to_postgres(self):
 
         self.tbl.to_postgres(f"{self.temp_schema}.test_copy")
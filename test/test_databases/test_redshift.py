@@ -1,10 +1,15 @@
 from parsons import Redshift, S3, Table
 from test.utils import assert_matching_tables
+import gzip
+import json
+import tempfile
 import unittest
+from unittest import mock
 import os
 import re
 from test.utils import validate_list
 from testfixtures import LogCapture
+import psycopg2
 
 # The name of the schema and will be temporarily created for the tests
 TEMP_SCHEMA = "parsons_test2"
@@ -16,6 +21,8 @@ class TestRedshift(unittest.TestCase):
     def setUp(self):
 
         self.rs = Redshift(username="test", password="test", host="test", db="test", port=123)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
 
         self.tbl = Table([["ID", "Name"], [1, "Jim"], [2, "John"], [3, "Sarah"]])
 
@@ -370,6 +377,269 @@ class TestRedshift(unittest.TestCase):
         # Check that all of the expected options are there:
         [self.assertNotEqual(sql.find(o), -1) for o in expected_options]
 
+    def test_generate_data_types_inference(self):
+
+        mapping = self.rs.generate_data_types(self.tbl2, type_inference="parallel")
+        self.assertEqual(mapping["type_list"], self.mapping2["type_list"])
+        self.assertEqual(mapping["longest"], self.mapping2["longest"])
+
+        # Ints detected from a sample are widened
+        mapping = self.rs.generate_data_types(self.tbl2, type_inference="sample")
+        self.assertEqual(
+            mapping["type_list"],
+            ["varchar", "varchar", "float", "varchar", "float", "bigint", "varchar"],
+        )
+        self.assertEqual(mapping["longest"], self.mapping2["longest"])
+
+        self.assertRaises(ValueError, self.rs.generate_data_types, self.tbl, type_inference="guess")
+
+    def test_copy_sampled_types_retry(self):
+
+        self.rs.connection = mock.MagicMock()
+        self.rs._create_table_precheck = mock.MagicMock(return_value=True)
+        self.rs.temp_s3_copy = mock.MagicMock(return_value="single.csv.gz")
+        self.rs.temp_s3_delete = mock.MagicMock()
+        self.rs.s3_temp_bucket = "buck"
+        creds = {"aws_access_key_id": "abc123", "aws_secret_access_key": "abc123"}
+
+        def query_with_connection(sql, connection, commit=True):
+            if sql.startswith("copy") and sql_statements[-1] in failing_types:
+                raise psycopg2.errors.InternalError_("Load into table failed")
+            sql_statements.append(sql)
+
+        def create_statement(tbl, table_name, type_inference="exact", **kwargs):
+            return type_inference
+
+        sql_statements = []
+        failing_types = ["sample"]
+        self.rs.create_statement = mock.MagicMock(side_effect=create_statement)
+        self.rs.query_with_connection = mock.MagicMock(side_effect=query_with_connection)
+
+        self.rs.copy(self.tbl, "test_schema.test", type_inference="sample", **creds)
+
+        # The sampled types failed to load, so the copy was rolled back and retried
+        self.assertEqual([sql for sql in sql_statements if "copy" not in sql], ["sample", "exact"])
+        self.rs.connection.return_value.__enter__.return_value.rollback.assert_called_once()
+
+        # Failures with exactly inferred types are raised
+        failing_types = ["exact"]
+        self.assertRaises(psycopg2.Error, self.rs.copy, self.tbl, "test_schema.test", **creds)
+
+    def _mock_upsert(self, duplicates=0):
+
+        self.rs.table_exists = mock.MagicMock(return_value=True)
+        self.rs.copy = mock.MagicMock()
+        self.rs.query = mock.MagicMock()
+        self.rs.connection = mock.MagicMock()
+        self.rs.get_columns_list = mock.MagicMock(return_value=["id", "name"])
+        self.rs.query_with_connection = mock.MagicMock(
+            return_value=Table([["total_count"], [duplicates]])
+        )
+
+        return lambda: [c[0][0] for c in self.rs.query_with_connection.call_args_list]
+
+    def test_upsert_merge(self):
+
+        queries = self._mock_upsert()
+
+        self.rs.upsert(
+            self.tbl,
+            "test_schema.test",
+            "id",
+            vacuum=False,
+            alter_table=False,
+            distinct_check="staged",
+            strategy="merge",
+        )
+
+        # The whole target table isn't counted
+        self.rs.query.assert_not_called()
+
+        distinct_sql, merge_sql, drop_sql = queries()
+        self.assertIn("having count(*) > 1", distinct_sql)
+        self.assertIn("join (select distinct id from test_schema.test_stg_", distinct_sql)
+
+        merge_sql = " ".join(merge_sql.split())
+        self.assertIn("MERGE INTO test_schema.test USING test_schema.test_stg_", merge_sql)
+        self.assertRegex(merge_sql, r"ON test_stg_\w+\.id = test\.id")
+        self.assertRegex(merge_sql, r"UPDATE SET name = test_stg_\w+\.name WHEN NOT MATCHED")
+        self.assertRegex(merge_sql, r"INSERT \(id, name\) VALUES \(test_stg_\w+\.id, ")
+        self.assertNotIn("DELETE", merge_sql)
+        self.assertIn("DROP TABLE IF EXISTS", drop_sql)
+
+    def test_upsert_staged_distinct_check(self):
+
+        queries = self._mock_upsert(duplicates=1)
+
+        self.assertRaises(
+            ValueError,
+            self.rs.upsert,
+            self.tbl,
+            "test_schema.test",
+            "id",
+            vacuum=False,
+            alter_table=False,
+            distinct_check="staged",
+        )
+
+        # Nothing was written, and the staging table was cleaned up
+        distinct_sql, drop_sql = queries()
+        self.assertIn("DROP TABLE IF EXISTS", drop_sql)
+
+        self.assertRaises(
+            ValueError, self.rs.upsert, self.tbl, "test_schema.test", "id", strategy="upsert"
+        )
+
+    def test_alter_varchar_column_widths(self):
+
+        self.rs.get_columns = mock.MagicMock(
+            return_value={
+                "id": {"data_type": "int", "max_length": None},
+                "name": {"data_type": "character varying", "max_length": 4},
+            }
+        )
+        self.rs.alter_table_column_type = mock.MagicMock()
+
+        # Creating the table profiles it, and the alter check reuses the profile
+        self.rs.create_statement(self.tbl, "test_schema.test")
+        with mock.patch("parsons.etl.etl.ColumnProfile.from_petl") as from_petl:
+            self.rs.alter_varchar_column_widths(self.tbl, "test_schema.test")
+            from_petl.assert_not_called()
+
+        self.rs.alter_table_column_type.assert_called_once_with(
+            "test_schema.test", "name", "varchar", varchar_width=5
+        )
+
+    @mock.patch("parsons.databases.redshift.redshift.S3")
+    def test_query_to_table_unload(self, s3_mock):
+
+        # Part files as written by UNLOAD ... HEADER DELIMITER '|' GZIP ADDQUOTES ESCAPE
+        parts = {
+            "part_0000.gz": '"id"|"name"\n"1"|"Jim"\n"2"|"pipe \\| and \\"quote\\""\n',
+            "part_0001.gz": '"id"|"name"\n',
+            "part_0002.gz": '"id"|"name"\n"3"|"line\\\nbreak"\n',
+        }
+        paths = {}
+        for key, content in parts.items():
+            paths[key] = os.path.join(self.temp_dir.name, key)
+            with gzip.open(paths[key], "wt", newline="") as f:
+                f.write(content)
+
+        manifest_path = os.path.join(self.temp_dir.name, "manifest")
+        with open(manifest_path, "w") as f:
+            json.dump({"entries": [{"url": f"s3://buck/prefix/{key}"} for key in parts]}, f)
+
+        s3_mock.return_value.get_file.return_value = manifest_path
+        s3_mock.return_value.get_files.side_effect = lambda bucket, keys, **kwargs: [
+            paths[key.split("/")[-1]] for key in keys
+        ]
+        s3_mock.return_value.list_keys.return_value = {"prefix/manifest": {}}
+        self.rs.s3_temp_bucket = "buck"
+        self.rs.unload = mock.MagicMock()
+
+        tbl = self.rs.query_to_table("select * from test", via="unload")
+
+        self.assertEqual(self.rs.unload.call_args[0][:2], ("select * from test", "buck"))
+        self.assertEqual(
+            tbl.to_petl().tuple(),
+            (
+                ("id", "name"),
+                ("1", "Jim"),
+                ("2", 'pipe | and "quote"'),
+                ("3", "line\nbreak"),
+            ),
+        )
+
+        # The parts are downloaded together
+        s3_mock.return_value.get_files.assert_called_once_with(
+            "buck", [f"prefix/{key}" for key in parts], max_workers=8
+        )
+
+        # The unloaded files are removed
+        s3_mock.return_value.remove_file.assert_called_once_with("buck", "prefix/manifest")
+
+        self.assertRaises(ValueError, self.rs.query_to_table, "select 1", via="select")
+
+    @mock.patch("parsons.databases.redshift.rs_copy_table.S3")
+    def test_temp_s3_copy_sliced(self, s3_mock):
+
+        uploaded = {}
+        local_paths = []
+
+        def put_file(bucket, key, local_path):
+            uploaded[key] = Table.from_csv(local_path).to_petl().tuple()[1:]
+            local_paths.append(local_path)
+
+        s3_mock.return_value.put_file.side_effect = put_file
+        self.rs.s3_temp_bucket = "buck"
+        self.rs.generate_manifest = mock.MagicMock()
+
+        tbl = Table([["ID", "Name"]] + [[i, f"name {i}"] for i in range(10)])
+        manifest_key, keys = self.rs.temp_s3_copy_sliced(tbl, 4)
+
+        # 10 rows split 4 ways is 3 rows per file
+        part_keys = sorted(uploaded)
+        self.assertEqual(len(part_keys), 4)
+        self.assertEqual([len(uploaded[k]) for k in part_keys], [3, 3, 3, 1])
+        self.assertEqual(
+            [int(row[0]) for k in part_keys for row in uploaded[k]],
+            list(range(10)),
+        )
+
+        # Each part is written compressed and removed once it has been uploaded
+        self.assertTrue(all(path.endswith(".csv.gz") for path in local_paths))
+        self.assertFalse(any(os.path.exists(path) for path in local_paths))
+
+        self.assertTrue(manifest_key.endswith(".manifest"))
+        self.assertEqual(sorted(keys), sorted(part_keys + [manifest_key]))
+
+        prefix = manifest_key[: -len(".manifest")] + "/"
+        self.assertTrue(all(k.startswith(prefix) for k in part_keys))
+        self.rs.generate_manifest.assert_called_once()
+        self.assertEqual(self.rs.generate_manifest.call_args.kwargs["prefix"], prefix)
+        self.assertEqual(self.rs.generate_manifest.call_args.kwargs["manifest_key"], manifest_key)
+
+    @mock.patch("parsons.databases.redshift.rs_copy_table.S3")
+    def test_temp_s3_copy_sliced_cleanup(self, s3_mock):
+
+        s3_mock.return_value.put_file.side_effect = [None, Exception("upload failed")]
+        self.rs.s3_temp_bucket = "buck"
+        self.rs.generate_manifest = mock.MagicMock()
+
+        self.assertRaises(Exception, self.rs.temp_s3_copy_sliced, self.tbl, 2)
+
+        # Both part keys are removed, whether or not they were written
+        self.assertEqual(s3_mock.return_value.remove_file.call_count, 2)
+        self.rs.generate_manifest.assert_not_called()
+
+    def test_copy_num_files(self):
+
+        self.rs.connection = mock.MagicMock()
+        self.rs._create_table_precheck = mock.MagicMock(return_value=False)
+        self.rs.query_with_connection = mock.MagicMock(return_value=Table([["slices"], [32]]))
+        self.rs.temp_s3_copy = mock.MagicMock(return_value="single.csv.gz")
+        self.rs.temp_s3_copy_sliced = mock.MagicMock(
+            return_value=("parts.manifest", ["parts/part_0000.csv.gz", "parts.manifest"])
+        )
+        self.rs.temp_s3_delete = mock.MagicMock()
+        self.rs.s3_temp_bucket = "buck"
+        creds = {"aws_access_key_id": "abc123", "aws_secret_access_key": "abc123"}
+
+        # A single file by default
+        self.rs.copy(self.tbl, "test_schema.test", if_exists="append", **creds)
+        sql = self.rs.query_with_connection.call_args[0][0]
+        self.assertIn("from 's3://buck/single.csv.gz'", sql)
+        self.assertNotIn("manifest", sql)
+        self.rs.temp_s3_delete.assert_called_with("single.csv.gz")
+
+        # One file per slice
+        self.rs.copy(self.tbl, "test_schema.test", if_exists="append", num_files="auto", **creds)
+        self.assertEqual(self.rs.temp_s3_copy_sliced.call_args[0][1], 32)
+        sql = self.rs.query_with_connection.call_args[0][0]
+        self.assertIn("from 's3://buck/parts.manifest'", sql)
+        self.assertIn("manifest \n", sql)
+        self.rs.temp_s3_delete.assert_called_with(["parts/part_0000.csv.gz", "parts.manifest"])
+
 
 # These tests interact directly with the Redshift database
 
@@ -438,6 +708,25 @@ class TestRedshiftDB(unittest.TestCase):
         r = self.rs.query(sql, parameters=names)
         self.assertEqual(r.num_rows, 2)
 
+    def test_query_stream(self):
+        table_name = f"{self.temp_schema}.test"
+        self.tbl.to_redshift(table_name, if_exists="append")
+
+        sql = f"select * from {table_name} order by id"
+        r = self.rs.query(sql, stream=True, itersize=2)
+        self.assertEqual(r.num_rows, 3)
+
+        batches = list(self.rs.query_batches(sql, itersize=2))
+        self.assertEqual([b.num_rows for b in batches], [2, 1])
+
+    def test_query_to_table_unload(self):
+        table_name = f"{self.temp_schema}.test"
+        self.tbl.to_redshift(table_name, if_exists="append")
+
+        r = self.rs.query_to_table(f"select * from {table_name}", via="unload")
+        self.assertEqual(r.num_rows, 3)
+        self.assertEqual(sorted(r["id"]), ["1", "2", "3"])
+
     def test_schema_exists(self):
         self.assertTrue(self.rs.schema_exists(self.temp_schema))
         self.assertFalse(self.rs.schema_exists("nonsense"))
@@ -506,6 +795,18 @@ class TestRedshiftDB(unittest.TestCase):
             self.assertTrue("DIST" in desired_log.msg)
             self.assertFalse("SORT" in desired_log.msg)
 
+    def test_copy_num_files(self):
+
+        # Copy a table split into several files
+        self.rs.copy(self.tbl, f"{self.temp_schema}.test_copy", if_exists="drop", num_files=2)
+        rows = self.rs.query(f"select count(*) from {self.temp_schema}.test_copy")
+        self.assertEqual(rows[0]["count"], 3)
+
+        # One file per slice
+        self.rs.copy(self.tbl, f"{self.temp_schema}.test_copy", if_exists="drop", num_files="auto")
+        rows = self.rs.query(f"select count(*) from {self.temp_schema}.test_copy")
+        self.assertEqual(rows[0]["count"], 3)
+
     def test_upsert(self):
 
         # Create a target table when no target table exists
@@ -580,6 +881,23 @@ class TestRedshiftDB(unittest.TestCase):
         updated_tbl = self.rs.query(f"select * from {self.temp_schema}.test_copy order by id;")
         assert_matching_tables(expected_tbl, updated_tbl)
 
+    def test_upsert_merge(self):
+
+        self.rs.copy(self.tbl, f"{self.temp_schema}.test_merge", if_exists="drop")
+
+        upsert_tbl = Table([["id", "name"], [1, "Jane"], [5, "Bob"]])
+        self.rs.upsert(
+            upsert_tbl,
+            f"{self.temp_schema}.test_merge",
+            "ID",
+            strategy="merge",
+            distinct_check="staged",
+        )
+
+        expected_tbl = Table([["id", "name"], [1, "Jane"], [2, "John"], [3, "Sarah"], [5, "Bob"]])
+        updated_tbl = self.rs.query(f"select * from {self.temp_schema}.test_merge order by id;")
+        assert_matching_tables(expected_tbl, updated_tbl)
+
     def test_unload(self):
 
         # Copy a table to Redshift
@@ -1,12 +1,15 @@
+import datetime
 import os
 import shutil
 import unittest
+from unittest import mock
 from test.utils import assert_matching_tables
 
 import petl
 
 from parsons import Table
-from parsons.utilities import zip_archive
+from parsons.etl.spill import SpillView, SpillWriter
+from parsons.utilities import files, zip_archive
 
 # Notes :
 # - The `Table.to_postgres()` test is housed in the Postgres tests
@@ -87,10 +90,125 @@ class TestParsonsTable(unittest.TestCase):
     def test_materialize_to_file(self):
         # Simple test that materializing doesn't change the table
         tbl_materialized = Table(self.lst_dicts)
-        _ = tbl_materialized.materialize_to_file()
+        file_path = tbl_materialized.materialize_to_file()
 
         assert_matching_tables(self.tbl, tbl_materialized)
 
+        # The temp file that now holds the table is returned
+        self.assertTrue(os.path.isfile(file_path))
+        self.assertEqual(file_path, tbl_materialized.table.file_path)
+
+    def test_materialize_to_file_path(self):
+        # A file written to a given path can still be read back with petl
+        tbl_materialized = Table(self.lst_dicts)
+        file_path = files.create_temp_file()
+        self.assertEqual(tbl_materialized.materialize_to_file(file_path), file_path)
+
+        assert_matching_tables(self.tbl, tbl_materialized)
+        assert_matching_tables(self.tbl, Table(petl.frompickle(file_path)))
+
+    def test_materialize_to_file_empty(self):
+        tbl = Table()
+        tbl.materialize_to_file()
+
+        self.assertEqual(tbl.num_rows, 0)
+        self.assertEqual(tbl.columns, [])
+
+    def test_spill_file(self):
+        # Rows are written in blocks and keep their types
+        header = ["id", "value", "when"]
+        rows = [(i, None if i % 2 else f"v{i}", datetime.date(2020, 1, 1)) for i in range(25)]
+
+        for compression in [None, "gzip"]:
+            with SpillWriter(header, compression=compression, block_size=10) as writer:
+                writer.write_rows(rows[:5])
+                writer.write_rows(rows[5:])
+
+            view = writer.view()
+            self.assertEqual(view.nrows(), 25)
+            self.assertEqual(list(view), [tuple(header)] + rows)
+
+            # The row count can also be recovered from the file itself
+            self.assertEqual(SpillView(writer.file_path, memory_map=False).nrows(), 25)
+
+            tbl = Table(view)
+            with mock.patch("parsons.etl.table.petl.nrows") as nrows:
+                self.assertEqual(tbl.num_rows, 25)
+                nrows.assert_not_called()
+
+    def test_spill_file_bad_compression(self):
+        self.assertRaises(ValueError, SpillWriter, ["a"], compression="lz4")
+
+    def test_to_columnar(self):
+        # Converting to columnar storage doesn't change the table
+        tbl = Table(self.lst)
+        tbl.convert_column("a", lambda x: x * 2)
+        tbl.to_columnar()
+
+        self.assertTrue(tbl.is_columnar)
+        self.assertEqual(tbl.num_rows, 5)
+        self.assertEqual(tbl.columns, ["a", "b", "c"])
+        self.assertEqual(tbl.column_data("a"), [2, 8, 14, 20, 26])
+        self.assertEqual(tbl[1], {"a": 8, "b": 5, "c": 6})
+
+    def test_to_columnar_transformations(self):
+        # Transformations on a columnar table match the lazy petl equivalents
+        columnar = Table(self.lst).to_columnar()
+        lazy = Table(self.lst)
+
+        for tbl in (columnar, lazy):
+            tbl.convert_column(["a", "b"], lambda x: x + 1)
+            tbl.convert_column("c", {3: "three"})
+            tbl.add_column("d", lambda row: row["a"] + row["b"])
+            tbl.add_column("e", "x", index=0)
+            tbl.rename_column("c", "c2")
+            tbl.fill_column("e", lambda row: row["d"] * 2)
+            tbl.move_column("d", 1)
+            tbl.remove_column("b")
+            tbl.head(4)
+            tbl.tail(3)
+
+        self.assertTrue(columnar.is_columnar)
+        assert_matching_tables(lazy, columnar)
+        assert_matching_tables(lazy.cut("c2", "a"), columnar.cut("c2", "a"))
+
+        # A transformation without a columnar implementation still works
+        columnar.sort("a", reverse=True)
+        lazy.sort("a", reverse=True)
+        self.assertFalse(columnar.is_columnar)
+        assert_matching_tables(lazy, columnar)
+
+    def test_to_columnar_field_indexes(self):
+        # Columnar transformations accept field indexes like petl does
+        columnar = Table(self.lst).to_columnar()
+        lazy = Table(self.lst)
+
+        for tbl in (columnar, lazy):
+            tbl.convert_column(0, lambda x: x * 2)
+            tbl.convert_column([1, "c"], str)
+            tbl.remove_column(2)
+
+        self.assertTrue(columnar.is_columnar)
+        assert_matching_tables(lazy, columnar)
+
+    def test_to_columnar_missing_field(self):
+        # Columnar transformations raise on missing fields like petl does
+        for columnar in (True, False):
+            tbl = Table(self.lst).to_columnar() if columnar else Table(self.lst)
+            with self.assertRaises(petl.errors.FieldSelectionError):
+                tbl.remove_column("a", "missing")
+                tbl.to_petl().nrows()
+
+            tbl = Table(self.lst).to_columnar() if columnar else Table(self.lst)
+            with self.assertRaises(petl.errors.FieldSelectionError):
+                tbl.convert_column("missing", str)
+                tbl.to_petl().nrows()
+
+    def test_to_columnar_empty(self):
+        tbl = Table().to_columnar()
+        self.assertEqual(tbl.num_rows, 0)
+        self.assertFalse(tbl)
+
     def test_empty_column(self):
         # Test that returns True on an empty column and False on a populated one.
 
@@ -658,6 +776,39 @@ class TestParsonsTable(unittest.TestCase):
         # Assert last table is 99
         self.assertEqual(99, chunks[4].num_rows)
 
+        # The source table is only read once
+        reads = []
+
+        class CountingTable(petl.Table):
+            def __iter__(self):
+                reads.append(1)
+                return iter(petl.randomtable(3, 499, seed=42))
+
+        counted_table = Table(CountingTable())
+        reads.clear()
+        chunks = counted_table.chunk(100)
+        self.assertEqual(len(reads), 1)
+        self.assertEqual([c.num_rows for c in chunks], [100, 100, 100, 100, 99])
+        self.assertEqual(chunks[4][98], test_table[498])
+
+    def test_iter_chunks(self):
+
+        test_table = Table(petl.randomtable(3, 499, seed=42))
+
+        with mock.patch("parsons.etl.etl.petl.rowslice") as rowslice:
+            chunks = list(test_table.iter_chunks(100))
+            rowslice.assert_not_called()
+
+        self.assertEqual([c.num_rows for c in chunks], [100, 100, 100, 100, 99])
+        self.assertEqual(chunks[0].columns, test_table.columns)
+
+        # Chunks line up with the source rows
+        self.assertEqual(chunks[1][0], test_table[100])
+        self.assertEqual(chunks[4][98], test_table[498])
+
+        # Empty tables have no chunks
+        self.assertEqual(list(Table().iter_chunks(10)), [])
+
     def test_match_columns(self):
         raw = [
             {"first name": "Mary", "LASTNAME": "Nichols", "Middle__Name": "D"},
@@ -857,6 +1008,63 @@ class TestParsonsTable(unittest.TestCase):
         # Evaluates based on byte length rather than char length
         self.assertEqual(tbl.get_column_max_width("c"), 33)
 
+    def test_get_column_profile(self):
+        reads = []
+
+        class CountingTable(petl.Table):
+            def __iter__(self):
+                reads.append(1)
+                yield ("a", "b", "c")
+                yield ("text", 1, None)
+                yield ("wider text", 2.5, "✊🏽")
+                yield ("x", None, None)
+
+        tbl = Table(CountingTable())
+        reads.clear()
+        profile = tbl.get_column_profile()
+
+        self.assertEqual(profile.columns, ["a", "b", "c"])
+        self.assertEqual(profile.num_rows, 3)
+        self.assertEqual(profile.max_widths, [10, 4, 7])
+        self.assertEqual(profile.null_counts, [0, 1, 2])
+        self.assertEqual(
+            profile.python_types, [["str"], ["int", "float", "NoneType"], ["NoneType", "str"]]
+        )
+        self.assertEqual(profile.column("b")["null_count"], 1)
+        self.assertRaises(KeyError, profile.column, "d")
+
+        # Every column is answered from the same read
+        self.assertEqual(tbl.get_column_max_width("a"), 10)
+        self.assertEqual(tbl.get_column_max_width("c"), 7)
+        self.assertEqual(len(reads), 1)
+
+        # Renaming the columns keeps the profile
+        tbl.set_header(["x", "y", "z"])
+        self.assertEqual(tbl.get_column_max_width("z"), 7)
+        self.assertEqual(len(reads), 1)
+
+        # Folds not in the cached profile cause a new read
+        profile = tbl.get_column_profile(folds={"count": lambda value, n: (n or 0) + 1})
+        self.assertEqual(profile.folds["count"], [3, 3, 3])
+        self.assertEqual(profile.columns, ["x", "y", "z"])
+        self.assertEqual(len(reads), 2)
+
+        tbl.get_column_profile(folds={"count": None})
+        self.assertEqual(len(reads), 2)
+
+        # Block folds are called with consecutive values of each column
+        with mock.patch("parsons.etl.profile.PROFILE_BLOCK_SIZE", 2):
+            profile = tbl.get_column_profile(
+                block_folds={"blocks": lambda values, blocks: (blocks or []) + [values]}
+            )
+        self.assertEqual(profile.folds["blocks"][1], [[1, 2.5], [None]])
+        self.assertEqual(len(reads), 3)
+
+        # Transformations drop the cached profile
+        tbl.fillna_column("z", "")
+        self.assertEqual(tbl.get_column_profile().null_counts, [0, 1, 0])
+        self.assertEqual(len(reads), 4)
+
     def test_sort(self):
 
         # Test basic sort
@@ -895,6 +1103,26 @@ class TestParsonsTable(unittest.TestCase):
         self.assertEqual(not empty, True)
         self.assertEqual(not not_empty, False)
 
+    def test_cached_counts(self):
+        tbl = Table(self.lst)
+
+        with mock.patch("parsons.etl.table.petl.nrows", wraps=petl.nrows) as nrows:
+            self.assertEqual(tbl.num_rows, 5)
+            self.assertEqual(len(tbl), 5)
+            self.assertTrue(tbl)
+            self.assertEqual(nrows.call_count, 1)
+
+            # Transforming the table invalidates the cached values
+            tbl.remove_null_rows("a", null_value=1)
+            tbl.rename_column("a", "x")
+            self.assertEqual(tbl.columns, ["x", "b", "c"])
+            self.assertEqual(tbl.num_rows, 4)
+            self.assertEqual(nrows.call_count, 2)
+
+        # The returned columns list can't be used to modify the cached header
+        tbl.columns.append("y")
+        self.assertEqual(tbl.columns, ["x", "b", "c"])
+
     def test_use_petl(self):
         # confirm that this method doesn't exist for parsons.Table
         self.assertRaises(AttributeError, getattr, Table, "skipcomments")
@@ -1,4 +1,6 @@
+import gzip
 import unittest
+from unittest import mock
 from parsons import GoogleCloudStorage, Table
 from test.utils import assert_matching_tables
 from parsons.utilities import files
@@ -116,3 +118,75 @@ class TestGoogleStorageBuckets(unittest.TestCase):
         url = self.cloud.get_url(TEMP_BUCKET_NAME, file_name)
         download_tbl = Table.from_csv(url)
         assert_matching_tables(input_tbl, download_tbl)
+
+
+class TestGoogleStorageSplitBlob(unittest.TestCase):
+    @mock.patch("google.cloud.storage.Client")
+    @mock.patch("parsons.google.google_cloud_storage.load_google_application_credentials")
+    def setUp(self, *_):
+
+        self.cloud = GoogleCloudStorage(app_creds='{"key": "value"}')
+        self.cloud.get_bucket = mock.MagicMock()
+
+        self.uploads = {}
+
+        def blob(name, bucket):
+            blob_mock = mock.MagicMock()
+
+            def upload(path, **kwargs):
+                with open(path, "rb") as f:
+                    self.uploads[name] = f.read()
+
+            blob_mock.upload_from_filename.side_effect = upload
+            return blob_mock
+
+        patcher = mock.patch("parsons.google.google_cloud_storage.storage.Blob", side_effect=blob)
+        self.blob_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _split(self, content, **kwargs):
+        path = files.create_temp_file(suffix=".csv.gz")
+        with gzip.open(path, "wb") as f:
+            f.write(content)
+        self.cloud.download_blob = mock.MagicMock(return_value=path)
+
+        return self.cloud.split_blob("bucket", "file.csv.gz", "file_parts", **kwargs)
+
+    def test_split_blob(self):
+
+        content = b'id,note\n1,a\n2,"two\nlines"\n3,"say ""hi"""\n4,d\n'
+        part_names = self._split(content, part_size_bytes=20)
+
+        self.assertEqual(
+            part_names,
+            ["file_parts/part_00000.csv", "file_parts/part_00001.csv", "file_parts/part_00002.csv"],
+        )
+        # Parts are only cut between records, and all start with the header
+        self.assertEqual(
+            self.uploads["file_parts/part_00000.csv"], b'id,note\n1,a\n2,"two\nlines"\n'
+        )
+        self.assertEqual(self.uploads["file_parts/part_00001.csv"], b'id,note\n3,"say ""hi"""\n')
+        self.assertEqual(self.uploads["file_parts/part_00002.csv"], b"id,note\n4,d\n")
+
+    def test_split_blob_no_header_or_quotes(self):
+
+        part_names = self._split(b'{"a": "\n1"}\n', header_lines=0, quote=None)
+
+        self.assertEqual(part_names, ["file_parts/part_00000.csv"])
+        self.assertEqual(self.uploads["file_parts/part_00000.csv"], b'{"a": "\n1"}\n')
+
+    def test_split_blob_header_only(self):
+
+        self.assertEqual(self._split(b"id,note\n"), [])
+        self.assertEqual(self.uploads, {})
+
+    def test_split_blob_upload_failure(self):
+
+        self.blob_mock.side_effect = None
+        self.blob_mock.return_value.upload_from_filename.side_effect = [None, ValueError("boom")]
+
+        with self.assertRaises(ValueError):
+            self._split(b"id\n1\n2\n", part_size_bytes=1)
+
+        # The part that was uploaded is deleted
+        self.blob_mock.return_value.delete.assert_called_once_with()
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import os
 from datetime import datetime
 import pytz
@@ -6,6 +7,7 @@ from parsons import S3, Table
 import urllib
 import time
 from test.utils import assert_matching_tables
+from parsons.utilities import files
 
 # Requires a s3 credentials stored in aws config or env variable
 # to run properly.
@@ -195,3 +197,83 @@ class TestS3(unittest.TestCase):
 
         buckets_with_subname_false = self.s3.get_buckets_type("bucketsubnamedoesnotexist")
         self.assertFalse(self.test_bucket in buckets_with_subname_false)
+
+
+class TestS3Transfers(unittest.TestCase):
+    def setUp(self):
+
+        self.s3 = S3(
+            aws_access_key_id="AAAAAA",
+            aws_secret_access_key="BBBBB",
+            multipart_threshold=64 * 1024 * 1024,
+            max_concurrency=4,
+        )
+        self.s3.client = mock.MagicMock()
+        self.s3.s3 = mock.MagicMock()
+
+    def test_transfer_config(self):
+
+        self.assertEqual(self.s3.transfer_config.multipart_threshold, 64 * 1024 * 1024)
+        self.assertEqual(self.s3.transfer_config.max_request_concurrency, 4)
+        # Unset options keep boto3's defaults
+        self.assertEqual(self.s3.transfer_config.multipart_chunksize, 8 * 1024 * 1024)
+
+    def test_put_files(self):
+
+        paths = {
+            "a.csv": files.string_to_temp_file("a", suffix=".csv"),
+            "b.csv": files.string_to_temp_file("bb", suffix=".csv"),
+        }
+
+        with self.assertLogs("parsons.aws.s3", level="INFO") as logs:
+            self.s3.put_files("bucket", paths, ContentType="text/csv")
+
+        self.s3.client.upload_file.assert_has_calls(
+            [
+                mock.call(
+                    paths[key],
+                    "bucket",
+                    key,
+                    ExtraArgs={"ACL": "bucket-owner-full-control", "ContentType": "text/csv"},
+                    Config=self.s3.transfer_config,
+                )
+                for key in paths
+            ],
+            any_order=True,
+        )
+        self.assertEqual(len(logs.output), 3)
+        self.assertIn("Uploaded 2 objects", logs.output[-1])
+
+    def test_get_files(self):
+
+        def download_file(bucket, key, local_path, **kwargs):
+            with open(local_path, "w") as f:
+                f.write("data")
+
+        self.s3.client.download_file.side_effect = download_file
+
+        keys = ["prefix/a.csv", "prefix/b.csv", "prefix/c.csv"]
+        paths = self.s3.get_files("bucket", keys, max_workers=2)
+
+        self.assertEqual(len(set(paths)), 3)
+        for path in paths:
+            with open(path) as f:
+                self.assertEqual(f.read(), "data")
+        self.s3.client.download_file.assert_has_calls(
+            [
+                mock.call("bucket", key, mock.ANY, ExtraArgs={}, Config=self.s3.transfer_config)
+                for key in keys
+            ],
+            any_order=True,
+        )
+        # Downloads only go through the thread-safe client
+        self.s3.s3.Object.assert_not_called()
+
+        self.assertEqual(self.s3.get_files("bucket", []), [])
+
+    def test_get_files_error(self):
+
+        self.s3.client.download_file.side_effect = ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.s3.get_files("bucket", ["a.csv", "b.csv"])